@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from codificacion import TablaCodificada, particionar, tipo_entero
+
+# Entropía de cada fila de una matriz de cuentas por clase (0 log 0 cuenta como 0)
+def entropias(cuentas):
+    totales = cuentas.sum(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = cuentas / totales
+        terminos = np.where(cuentas > 0, p * np.log2(p), 0.0)
+    return -terminos.sum(axis=-1)
+
+# Ganancia de información de un atributo codificado con n_valores valores sobre clases codificadas
+def ganancia(valores, clases, n_valores, n_clases):
+    pares = valores.astype(tipo_entero(n_valores * n_clases))
+    pares *= n_clases
+    pares += clases
+    cuentas = np.bincount(pares, minlength=n_valores * n_clases).reshape(n_valores, n_clases)
+    por_valor = cuentas.sum(axis=1)
+    return entropias(cuentas.sum(axis=0)) - por_valor @ entropias(cuentas) / len(clases)
+
+class ArbolID3:
+    """ Árbol ID3 para cualquier objetivo y número de clases, con atributos categóricos.
+
+    El árbol se guarda como una tabla de nodos (atributo, clase mayoritaria y primer hijo)
+    y un array de hijos por valor, así que predict() lleva todas las filas a la vez de un
+    nivel al siguiente. Un valor que el nodo no vio al entrenar, o desconocido, se queda
+    con la clase mayoritaria de ese nodo.
+    """
+
+    def __init__(self, profundidad=None):
+        self.profundidad = profundidad  # Niveles de preguntas como máximo (None: sin límite)
+
+    def fit(self, X, y):
+        """ Entrena con los atributos de X (DataFrame) y los valores del objetivo y; devuelve el propio árbol.
+
+        y no puede tener valores nulos (ValueError).
+        """
+        X = pd.DataFrame(X)
+        tabla = TablaCodificada(X, X.columns, y)
+        if not len(tabla):
+            raise ValueError("No hay ejemplos con los que entrenar")
+        if any(pd.isna(etiqueta) for etiqueta in tabla.etiquetas):
+            # Un nulo no es una clase: predict() acabaría devolviéndolo como predicción
+            raise ValueError("El objetivo y tiene valores nulos; hay que quitar esas filas antes de entrenar")
+        self.atributos_ = tabla.atributos
+        self.valores_ = tabla.valores
+        self.clases_ = np.array(tabla.etiquetas, dtype=object)
+
+        n_clases = len(tabla.etiquetas)
+        atributo, clase, primero, hijos = [], [], [], []
+
+        def construir(filas, columnas, profundidad):
+            nodo = len(atributo)
+            clases = tabla.clases[filas]
+            cuentas = np.bincount(clases, minlength=n_clases)
+            atributo.append(-1)
+            clase.append(int(cuentas.argmax()))  # En un empate, la clase que apareció antes
+            primero.append(0)
+            if np.count_nonzero(cuentas) == 1 or not columnas or profundidad == 0:
+                return nodo
+
+            mejor_columna, mejor_ganancia = None, -1
+            for columna in columnas:
+                g = ganancia(tabla.columnas[columna][filas], clases, len(tabla.valores[columna]), n_clases)
+                if g > mejor_ganancia:
+                    mejor_columna, mejor_ganancia = columna, g
+
+            atributo[nodo] = mejor_columna
+            primero[nodo] = len(hijos)
+            hijos.extend([-1] * len(tabla.valores[mejor_columna]))
+            restantes = [c for c in columnas if c != mejor_columna]
+            for valor, grupo in particionar(tabla.columnas[mejor_columna][filas], filas):
+                hijos[primero[nodo] + valor] = construir(grupo, restantes, None if profundidad is None else profundidad - 1)
+            return nodo
+
+        construir(tabla.filas(), list(range(len(self.atributos_))), self.profundidad)
+        self._atributo = np.array(atributo, dtype=np.intp)
+        self._clase = np.array(clase, dtype=np.intp)
+        self._primero = np.array(primero, dtype=np.intp)
+        self._hijos = np.array(hijos, dtype=np.intp)
+        return self
+
+    def _codificar(self, X):
+        """ Códigos de los atributos que usa el árbol con el vocabulario del entrenamiento (-1 si es nuevo)."""
+        X = pd.DataFrame(X)
+        codigos = np.full((len(X), len(self.atributos_)), -1, dtype=np.int32)
+        for a in np.unique(self._atributo[self._atributo >= 0]).tolist():
+            codigos[:, a] = pd.Index(self.valores_[a]).get_indexer(X[self.atributos_[a]])
+        return codigos
+
+    def nodos_hoja(self, X):
+        """ Nodo en el que termina cada fila de X."""
+        codigos = self._codificar(X)
+        nodo = np.zeros(len(codigos), dtype=np.intp)
+        activas = np.arange(len(codigos))
+        # En cada vuelta todas las filas que siguen bajando avanzan un nivel
+        while len(activas):
+            actual = nodo[activas]
+            internas = self._atributo[actual] >= 0
+            activas, actual = activas[internas], actual[internas]
+            valor = codigos[activas, self._atributo[actual]]
+            hijo = np.where(valor >= 0, self._hijos[self._primero[actual] + np.maximum(valor, 0)], -1)
+            sigue = hijo >= 0
+            nodo[activas[sigue]] = hijo[sigue]
+            activas = activas[sigue]
+        return nodo
+
+    def predict(self, X):
+        """ Clase de cada fila de X (array de objetos con las etiquetas de y)."""
+        return self.clases_[self._clase[self.nodos_hoja(X)]]
+
+    def arbol(self, nodo=0):
+        """ El árbol como diccionarios anidados {atributo: {valor: subárbol o clase}}, como id3()."""
+        if self._atributo[nodo] < 0:
+            return self.clases_[self._clase[nodo]]
+        a = self._atributo[nodo]
+        ramas = {}
+        for valor, hijo in zip(self.valores_[a], self._hijos[self._primero[nodo]:self._primero[nodo] + len(self.valores_[a])]):
+            if hijo >= 0:
+                ramas[valor] = self.arbol(hijo)
+        return {self.atributos_[a]: ramas}
\ No newline at end of file
@@ -0,0 +1,48 @@
+import argparse
+
+import numpy as np
+
+from arbol_id3 import ArbolID3
+from bench_id3 import generar_ejemplos, medir
+
+# Predicción fila a fila bajando por el árbol de diccionarios, como se haría con el de id3()
+def predecir_recorriendo(arbol, ejemplos, por_defecto):
+    predicciones = []
+    for fila in ejemplos.to_dict('records'):
+        nodo = arbol
+        while isinstance(nodo, dict):
+            (atributo, ramas), = nodo.items()
+            nodo = ramas.get(fila[atributo], por_defecto)
+        predicciones.append(nodo)
+    return np.array(predicciones, dtype=object)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrenamiento de ArbolID3 y filas por segundo de predict().")
+    parser.add_argument("--entrenamiento", type=int, default=100000, help="ejemplos con los que se entrena")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1000000, 2000000, 5000000])
+    parser.add_argument("--extra", type=int, default=4, help="atributos de ruido añadidos a los de Juego.txt")
+    parser.add_argument("--profundidad", type=int, default=6)
+    parser.add_argument("--recorrido", type=int, default=100000,
+                        help="filas con las que se mide la predicción fila a fila")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    entrenamiento = generar_ejemplos(args.entrenamiento, args.semilla, args.extra)
+    X, y = entrenamiento.drop(columns='Jugar'), entrenamiento['Jugar']
+    modelo, t_fit = medir(ArbolID3(args.profundidad).fit, X, y)
+    print(f"fit con {args.entrenamiento} ejemplos: {t_fit:.2f} s, {len(modelo._atributo)} nodos")
+
+    print(f"\n{'filas':>9} {'predict (s)':>12} {'filas/s':>12} {'fila a fila (filas/s)':>22} "
+          f"{'aceleración':>12} {'iguales':>8} {'acierto':>8}")
+    arbol = modelo.arbol()
+    for n in args.tamanos:
+        ejemplos = generar_ejemplos(n, args.semilla + 1, args.extra)
+        predicciones, t_predict = medir(modelo.predict, ejemplos)
+        # El recorrido fila a fila solo sobre las primeras filas: es el mismo árbol
+        muestra = ejemplos.iloc[:args.recorrido]
+        recorridas, t_recorrido = medir(predecir_recorriendo, arbol, muestra, None)
+        iguales = (recorridas == predicciones[:len(muestra)]).all()
+        acierto = (predicciones == ejemplos['Jugar'].to_numpy()).mean()
+        rapidez, rapidez_recorrido = n / t_predict, len(muestra) / t_recorrido
+        print(f"{n:>9} {t_predict:>12.2f} {rapidez:>12.0f} {rapidez_recorrido:>22.0f} "
+              f"{rapidez / rapidez_recorrido:>11.1f}x {'sí' if iguales else 'NO':>8} {acierto:>8.3f}")
\ No newline at end of file
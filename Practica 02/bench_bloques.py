@@ -0,0 +1,46 @@
+import argparse
+import os
+import tempfile
+import time
+
+from bench_id3 import generar_ejemplos, pico_memoria
+from id3 import id3, leer_archivos
+from id3_bloques import id3_por_bloques
+
+# Árbol en memoria, contando también la lectura del archivo entero
+def id3_leyendo(atributos_file, ejemplos_file, nivel, max_nivel):
+    atributos, ejemplos = leer_archivos(atributos_file, ejemplos_file)
+    return id3(ejemplos, atributos, nivel, max_nivel)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ID3 leyendo el archivo de ejemplos entero o por bloques.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--extra", type=int, default=4, help="atributos de ruido añadidos a los de Juego.txt")
+    parser.add_argument("--niveles", type=int, default=4)
+    parser.add_argument("--filas-por-bloque", type=int, default=1 << 16)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'ejemplos':>9} {'archivo (MB)':>13} {'entero (s)':>11} {'pico (MB)':>10} "
+          f"{'bloques (s)':>12} {'pico (MB)':>10} {'iguales':>8}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in args.tamanos:
+            # Los mismos archivos que AtributosJuego.txt y Juego.txt, con la coma al final de los atributos
+            ejemplos = generar_ejemplos(n, args.semilla, args.extra)
+            atributos_file = os.path.join(carpeta, 'Atributos.txt')
+            ejemplos_file = os.path.join(carpeta, 'Ejemplos.txt')
+            with open(atributos_file, 'w') as f:
+                f.write(',\n'.join(ejemplos.columns[:-1]) + '\n')
+            ejemplos.to_csv(ejemplos_file, header=False, index=False)
+            del ejemplos
+
+            t0 = time.perf_counter()
+            entero, pico_entero = pico_memoria(id3_leyendo, atributos_file, ejemplos_file, 1, args.niveles)
+            t_entero = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            bloques, pico_bloques = pico_memoria(id3_por_bloques, atributos_file, ejemplos_file, 1, args.niveles,
+                                                 args.filas_por_bloque)
+            t_bloques = time.perf_counter() - t0
+            print(f"{n:>9} {os.path.getsize(ejemplos_file) / 2**20:>13.1f} {t_entero:>11.2f} "
+                  f"{pico_entero / 2**20:>10.1f} {t_bloques:>12.2f} {pico_bloques / 2**20:>10.1f} "
+                  f"{'sí' if repr(entero) == repr(bloques) else 'NO':>8}")
\ No newline at end of file
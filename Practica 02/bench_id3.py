@@ -0,0 +1,121 @@
+import argparse
+import math
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from id3 import id3, seleccionar_mejor_atributo
+
+# Valores de cada atributo en Juego.txt
+DOMINIOS = {
+    'TiempoExterior': ['soleado', 'nublado', 'lluvioso'],
+    'Temperatura': ['caluroso', 'templado', 'frio'],
+    'Humedad': ['alta', 'normal'],
+    'Viento': ['falso', 'verdad'],
+}
+
+# Generar una tabla de ejemplos con la misma forma que Juego.txt y, si se piden, atributos
+# extra de ruido (con 2 a 4 valores) para que el árbol pueda crecer más
+def generar_ejemplos(n, semilla=0, extra=0):
+    azar = np.random.default_rng(semilla)
+    dominios = dict(DOMINIOS)
+    for k in range(extra):
+        dominios[f'Ruido{k + 1}'] = [f'r{v}' for v in range(2 + k % 3)]
+    columnas = {atributo: np.array(valores, dtype=object)[azar.integers(len(valores), size=n)]
+                for atributo, valores in dominios.items()}
+    # Se juega con tiempo nublado o con humedad normal, con un 10 % de ruido
+    jugar = (columnas['TiempoExterior'] == 'nublado') | (columnas['Humedad'] == 'normal')
+    jugar ^= azar.random(n) < 0.1
+    columnas['Jugar'] = np.where(jugar, 'si', 'no').astype(object)
+    return pd.DataFrame(columnas)
+
+# Versión anterior: un DataFrame filtrado por cada valor y dos más para contar las clases
+def calcular_entropia_filtrando(ejemplos):
+    total = len(ejemplos)
+    positivos = len(ejemplos[ejemplos['Jugar'] == 'si'])
+    negativos = len(ejemplos[ejemplos['Jugar'] == 'no'])
+    if positivos == 0 or negativos == 0:
+        return 0
+    p_pos = positivos / total
+    p_neg = negativos / total
+    return -p_pos * math.log2(p_pos) - p_neg * math.log2(p_neg)
+
+def seleccionar_filtrando(ejemplos, atributos):
+    mejor_atributo, mejor_ganancia = None, -1
+    for atributo in atributos:
+        suma_entropias = 0
+        for valor in ejemplos[atributo].unique():
+            subset = ejemplos[ejemplos[atributo] == valor]
+            suma_entropias += (len(subset) / len(ejemplos)) * calcular_entropia_filtrando(subset)
+        ganancia = calcular_entropia_filtrando(ejemplos) - suma_entropias
+        if ganancia > mejor_ganancia:
+            mejor_ganancia, mejor_atributo = ganancia, atributo
+    return mejor_atributo
+
+# Versión anterior de id3(): un subconjunto copiado por cada rama de cada nivel
+def id3_filtrando(ejemplos, atributos, nivel=1, max_nivel=2):
+    if len(atributos) == 0 or nivel > max_nivel:
+        return None
+    mejor_atributo = seleccionar_filtrando(ejemplos, atributos)
+    arbol = {mejor_atributo: {}}
+    for valor in ejemplos[mejor_atributo].unique():
+        subset = ejemplos[ejemplos[mejor_atributo] == valor]
+        if len(subset['Jugar'].unique()) == 1:
+            arbol[mejor_atributo][valor] = subset['Jugar'].iloc[0]
+        else:
+            nuevos_atributos = [a for a in atributos if a != mejor_atributo]
+            arbol[mejor_atributo][valor] = id3_filtrando(subset, nuevos_atributos, nivel + 1, max_nivel)
+    return arbol
+
+# Pico de memoria (con tracemalloc, que también sigue a numpy) y resultado de una llamada
+def pico_memoria(funcion, *argumentos):
+    tracemalloc.start()
+    try:
+        resultado = funcion(*argumentos)
+        return resultado, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def medir(funcion, *argumentos):
+    t0 = time.perf_counter()
+    resultado = funcion(*argumentos)
+    return resultado, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo y memoria de ID3 en tablas generadas con la forma de Juego.txt.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--extra", type=int, default=4, help="atributos de ruido añadidos a los de Juego.txt")
+    parser.add_argument("--niveles", type=int, default=6, help="max_nivel del árbol en la comparación de memoria")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print("Elección del atributo de la raíz")
+    print(f"{'ejemplos':>9} {'filtrando (s)':>14} {'contingencia (s)':>17} {'aceleración':>12}")
+    for n in args.tamanos:
+        ejemplos = generar_ejemplos(n, args.semilla)
+        atributos = list(DOMINIOS)
+        antes, t_antes = medir(seleccionar_filtrando, ejemplos, atributos)
+        ahora, t_ahora = medir(seleccionar_mejor_atributo, ejemplos, atributos)
+        if antes != ahora:
+            raise AssertionError(f"Atributo distinto: {antes} frente a {ahora}")
+        print(f"{n:>9} {t_antes:>14.3f} {t_ahora:>17.3f} {t_antes / t_ahora:>11.1f}x")
+
+    # La memoria de más es la que se reserva durante la construcción, sin contar los ejemplos
+    print(f"\nÁrbol completo hasta {args.niveles} niveles con {args.extra} atributos de ruido")
+    print(f"{'ejemplos':>9} {'entrada (MB)':>13} {'filtrando (s)':>14} {'pico (MB)':>10} "
+          f"{'índices (s)':>12} {'pico (MB)':>10} {'iguales':>8}")
+    for n in args.tamanos:
+        ejemplos = generar_ejemplos(n, args.semilla, args.extra)
+        atributos = [columna for columna in ejemplos.columns if columna != 'Jugar']
+        # Los textos generados son objetos compartidos: la tabla ocupa lo que sus columnas de punteros
+        entrada = ejemplos.memory_usage().sum() / 2**20
+        t0 = time.perf_counter()
+        antes, pico_antes = pico_memoria(id3_filtrando, ejemplos, atributos, 1, args.niveles)
+        t_antes = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ahora, pico_ahora = pico_memoria(id3, ejemplos, atributos, 1, args.niveles)
+        t_ahora = time.perf_counter() - t0
+        print(f"{n:>9} {entrada:>13.1f} {t_antes:>14.2f} {pico_antes / 2**20:>10.1f} "
+              f"{t_ahora:>12.2f} {pico_ahora / 2**20:>10.1f} {'sí' if repr(antes) == repr(ahora) else 'NO':>8}")
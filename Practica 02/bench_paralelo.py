@@ -0,0 +1,29 @@
+import argparse
+import os
+
+from bench_id3 import generar_ejemplos, medir
+from id3 import id3
+from paralelo import id3_paralelo
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ID3 en serie y en paralelo sobre tablas anchas generadas.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--extra", type=int, default=200, help="atributos de ruido añadidos a los de Juego.txt")
+    parser.add_argument("--niveles", type=int, default=3)
+    parser.add_argument("--procesos", type=int, nargs="+", default=sorted({2, os.cpu_count()}))
+    parser.add_argument("--filas-por-nodo", type=int, default=100000,
+                        help="los subárboles con menos filas se construyen enteros en un proceso")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'ejemplos':>9} {'atributos':>10} {'procesos':>9} {'tiempo (s)':>11} {'aceleración':>12} {'iguales':>8}")
+    for n in args.tamanos:
+        ejemplos = generar_ejemplos(n, args.semilla, args.extra)
+        atributos = [columna for columna in ejemplos.columns if columna != 'Jugar']
+        serie, t_serie = medir(id3, ejemplos, atributos, 1, args.niveles)
+        print(f"{n:>9} {len(atributos):>10} {'serie':>9} {t_serie:>11.2f} {1:>11.1f}x {'-':>8}")
+        for procesos in args.procesos:
+            paralelo, t_paralelo = medir(id3_paralelo, ejemplos, atributos, 1, args.niveles, procesos,
+                                         args.filas_por_nodo)
+            print(f"{n:>9} {len(atributos):>10} {procesos:>9} {t_paralelo:>11.2f} {t_serie / t_paralelo:>11.1f}x "
+                  f"{'sí' if repr(paralelo) == repr(serie) else 'NO':>8}")
\ No newline at end of file
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Tipo entero más pequeño que guarda los números de 0 a n - 1
+def tipo_entero(n):
+    for tipo in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(tipo).max + 1:
+            return tipo
+    return np.int64
+
+# Clave del valor nulo al numerar los valores (NaN no es igual a sí mismo)
+NULO = object()
+
+# Tabla de ejemplos codificada una sola vez: una columna de enteros por atributo y otra
+# para el objetivo (el nombre de una columna de ejemplos o directamente sus valores). Los
+# árboles se construyen pasando índices de filas sobre ella, sin copiar los ejemplos en cada nodo.
+class TablaCodificada:
+    def __init__(self, ejemplos, atributos, objetivo):
+        self.atributos = list(atributos)
+        self.columnas = []  # Códigos de cada atributo: el valor i es valores[a][i]
+        self.valores = []   # Valores de cada atributo en el orden de unique()
+        self.nulos = []     # Código del valor nulo de cada atributo, o None
+        for atributo in self.atributos:
+            codigos, valores = self._codificar(ejemplos[atributo])
+            self.columnas.append(codigos)
+            self.valores.append(valores)
+            self.nulos.append(next((i for i, valor in enumerate(valores) if pd.isna(valor)), None))
+        columna = pd.Series(objetivo) if pd.api.types.is_list_like(objetivo) else ejemplos[objetivo]
+        if len(columna) != len(ejemplos):
+            raise ValueError(f"Hay {len(ejemplos)} ejemplos y {len(columna)} valores del objetivo")
+        self.clases, self.etiquetas = self._codificar(columna)
+
+    @staticmethod
+    def _codificar(columna, filas_por_bloque=1 << 16):
+        # Por bloques de filas, para no reservar más que un bloque de enteros de 64 bits a la vez.
+        # factorize numera los valores en orden de primera aparición, como unique(); el nulo es uno más
+        codigos = np.empty(len(columna), dtype=np.int32)
+        numeros, valores = {}, []
+        for inicio in range(0, len(columna), filas_por_bloque):
+            bloque = columna.iloc[inicio:inicio + filas_por_bloque]
+            locales, _ = pd.factorize(bloque, use_na_sentinel=False)
+            globales = []
+            for valor in bloque.unique():  # Los mismos valores, con los tipos de unique()
+                clave = NULO if pd.isna(valor) else valor
+                if clave not in numeros:
+                    numeros[clave] = len(valores)
+                    valores.append(valor)
+                globales.append(numeros[clave])
+            codigos[inicio:inicio + filas_por_bloque] = np.array(globales, dtype=np.int32)[locales]
+        return codigos.astype(tipo_entero(len(valores))), valores
+
+    def __len__(self):
+        return len(self.clases)
+
+    # Índices de todas las filas, para empezar la recursión
+    def filas(self):
+        return np.arange(len(self), dtype=tipo_entero(len(self)))
+
+# Recuentos por valor y clase de unas filas: {valor: [(clase, cuenta), ...]}, con los valores
+# y, dentro de cada valor, las clases en orden de primera aparición. Es una sola pasada:
+# factorize sobre el par valor-clase y bincount.
+def grupos(valores, clases, n_clases):
+    # El par se calcula en el tipo más pequeño que lo admite, sin copias intermedias de 64 bits
+    pares = valores.astype(tipo_entero(2 * (int(valores.max(initial=0)) + 1) * n_clases))
+    pares *= n_clases
+    pares += clases
+    pares, unicos = pd.factorize(pares)
+    cuentas = np.bincount(pares, minlength=len(unicos))
+    resultado = {}
+    for par, cuenta in zip(unicos.tolist(), cuentas.tolist()):
+        valor, clase = divmod(par, n_clases)
+        resultado.setdefault(valor, []).append((clase, cuenta))
+    return resultado
+
+# Reordena filas en su sitio agrupándolas por valores (los de cada fila), con los grupos
+# en orden de primera aparición y cada grupo en el orden original. Devuelve
+# [(valor, filas del grupo)], donde cada grupo es una vista de filas, no una copia.
+def particionar(valores, filas):
+    locales, unicos = pd.factorize(valores)
+    orden = np.argsort(locales, kind='stable')
+    filas[:] = filas[orden]
+    fines = np.cumsum(np.bincount(locales, minlength=len(unicos))).tolist()
+    return [(valor, filas[inicio:fin]) for valor, inicio, fin in zip(unicos.tolist(), [0] + fines, fines)]
\ No newline at end of file
@@ -1,20 +1,29 @@
 import math
+import numpy as np
 import pandas as pd
 
+from codificacion import TablaCodificada, grupos, particionar
+
+# Leer los nombres de los atributos, uno por línea (en AtributosJuego.txt llevan una coma al final)
+def leer_atributos(atributos_file):
+    with open(atributos_file, 'r') as f:
+        return [linea.strip().rstrip(',').strip() for linea in f if linea.strip()]
+
 # Leer los archivos
 def leer_archivos(atributos_file, ejemplos_file):
-    with open(atributos_file, 'r') as f:
-        atributos = f.read().splitlines()
+    atributos = leer_atributos(atributos_file)
     
     ejemplos = pd.read_csv(ejemplos_file, header=None, names=atributos + ['Jugar'])
     return atributos, ejemplos
 
-# Calcular la entropía
-def calcular_entropia(ejemplos):
-    total = len(ejemplos)
-    positivos = len(ejemplos[ejemplos['Jugar'] == 'si'])
-    negativos = len(ejemplos[ejemplos['Jugar'] == 'no'])
-    
+# Código de clase de cada ejemplo: 0 'si', 1 'no', 2 cualquier otro valor
+SI, NO, OTRA = 0, 1, 2
+
+def codificar_clases(objetivo):
+    return np.where(objetivo == 'si', SI, np.where(objetivo == 'no', NO, OTRA))
+
+# Entropía a partir de los recuentos de un conjunto de ejemplos
+def entropia_conteo(total, positivos, negativos):
     if positivos == 0 or negativos == 0:
         return 0
     
@@ -23,26 +32,48 @@ def calcular_entropia(ejemplos):
     
     return -p_pos * math.log2(p_pos) - p_neg * math.log2(p_neg)
 
-# Calcular la ganancia de información
-def ganancia_informacion(ejemplos, atributo):
-    total_entropia = calcular_entropia(ejemplos)
-    valores = ejemplos[atributo].unique()
+# Calcular la entropía
+def calcular_entropia(ejemplos):
+    conteo = np.bincount(codificar_clases(ejemplos['Jugar'].to_numpy()), minlength=3)
+    return entropia_conteo(len(ejemplos), int(conteo[SI]), int(conteo[NO]))
+
+# Ganancia de información de un atributo codificado (valores) sobre unas clases codificadas
+def ganancia_codigos(valores, clases, nulo=None):
+    return ganancia_grupos(len(clases), np.bincount(clases, minlength=3), grupos(valores, clases, 3), nulo)
+
+# Ganancia a partir de los recuentos: total de ejemplos, cuántos hay de cada clase y
+# {valor: [(clase, cuenta), ...]} con los valores en orden de primera aparición
+def ganancia_grupos(total, totales, grupos_valores, nulo=None):
+    total_entropia = entropia_conteo(total, int(totales[SI]), int(totales[NO]))
     
+    # Se suma en el orden de unique() y con las mismas operaciones que filtrando el
+    # DataFrame, para que las ganancias (y los empates) sean idénticos. El valor nulo no
+    # coincide con ningún ejemplo (NaN != NaN), así que no suma nada.
     suma_entropias = 0
-    for valor in valores:
-        subset = ejemplos[ejemplos[atributo] == valor]
-        entropia_subset = calcular_entropia(subset)
-        suma_entropias += (len(subset) / len(ejemplos)) * entropia_subset
+    for valor, cuentas in grupos_valores.items():
+        if valor == nulo:
+            continue
+        cuentas = dict(cuentas)
+        tamano = sum(cuentas.values())
+        suma_entropias += (tamano / total) * entropia_conteo(tamano, cuentas.get(SI, 0), cuentas.get(NO, 0))
     
     return total_entropia - suma_entropias
 
+# Calcular la ganancia de información
+def ganancia_informacion(ejemplos, atributo, clases=None):
+    if clases is None:
+        clases = codificar_clases(ejemplos['Jugar'].to_numpy())
+    valores, _ = pd.factorize(ejemplos[atributo])  # Los nulos quedan con el código -1
+    return ganancia_codigos(valores, clases, nulo=-1)
+
 # Seleccionar el mejor atributo
 def seleccionar_mejor_atributo(ejemplos, atributos):
     mejor_atributo = None
     mejor_ganancia = -1
+    clases = codificar_clases(ejemplos['Jugar'].to_numpy())
     
     for atributo in atributos:
-        ganancia = ganancia_informacion(ejemplos, atributo)
+        ganancia = ganancia_informacion(ejemplos, atributo, clases)
         if ganancia > mejor_ganancia:
             mejor_ganancia = ganancia
             mejor_atributo = atributo
@@ -51,28 +82,59 @@ def seleccionar_mejor_atributo(ejemplos, atributos):
 
 # Implementar el algoritmo ID3
 def id3(ejemplos, atributos, nivel=1, max_nivel=2):
-    if len(atributos) == 0 or nivel > max_nivel:
+    # Los ejemplos se codifican una vez y la recursión solo se pasa índices de filas
+    tabla = TablaCodificada(ejemplos, atributos, 'Jugar')
+    clases = codificar_clases(np.array(tabla.etiquetas, dtype=object))[tabla.clases].astype(np.int8)
+    return id3_filas(tabla, clases, tabla.filas(), list(range(len(atributos))), nivel, max_nivel)
+
+# ID3 sobre las filas indicadas de una tabla codificada; columnas son los atributos que quedan
+def id3_filas(tabla, clases, filas, columnas, nivel, max_nivel):
+    if len(columnas) == 0 or nivel > max_nivel:
         return None
     
-    mejor_atributo = seleccionar_mejor_atributo(ejemplos, atributos)
-    if mejor_atributo is None:
+    clases_filas = clases[filas]
+    ganancias = [ganancia_codigos(tabla.columnas[c][filas], clases_filas, tabla.nulos[c]) for c in columnas]
+    mejor_columna = elegir_columna(columnas, ganancias)
+    if mejor_columna is None:
         return None
     
-    arbol = {mejor_atributo: {}}
-    
-    for valor in ejemplos[mejor_atributo].unique():
-        subset = ejemplos[ejemplos[mejor_atributo] == valor]
-        if len(subset['Jugar'].unique()) == 1:
-            arbol[mejor_atributo][valor] = subset['Jugar'].iloc[0]
-        else:
-            nuevos_atributos = [a for a in atributos if a != mejor_atributo]
-            arbol[mejor_atributo][valor] = id3(subset, nuevos_atributos, nivel + 1, max_nivel)
+    arbol = {tabla.atributos[mejor_columna]: {}}
+    for valor, grupo in ramas(tabla, mejor_columna, filas):
+        arbol[tabla.atributos[mejor_columna]][valor] = hoja_o_subarbol(
+            tabla, grupo, lambda: id3_filas(tabla, clases, grupo, [c for c in columnas if c != mejor_columna],
+                                            nivel + 1, max_nivel))
     
     return arbol
 
-# Leer los datos
-atributos, ejemplos = leer_archivos('AtributosJuego.txt', 'Juego.txt')
+# La primera columna con la mayor ganancia (las ganancias van en el orden de columnas)
+def elegir_columna(columnas, ganancias):
+    mejor_columna = None
+    mejor_ganancia = -1
+    for columna, ganancia in zip(columnas, ganancias):
+        if ganancia > mejor_ganancia:
+            mejor_ganancia = ganancia
+            mejor_columna = columna
+    return mejor_columna
+
+# Valor y filas de cada rama de un nodo que pregunta por una columna. Las filas de cada
+# valor son un tramo de filas: se reordenan en su sitio, sin copias
+def ramas(tabla, columna, filas):
+    for valor, grupo in particionar(tabla.columnas[columna][filas], filas):
+        if valor == tabla.nulos[columna]:
+            grupo = grupo[:0]  # Como al filtrar con == NaN, la rama del valor nulo no tiene ejemplos
+        yield tabla.valores[columna][valor], grupo
+
+# La etiqueta si todas las filas de la rama son de la misma clase; si no, el subárbol
+def hoja_o_subarbol(tabla, grupo, subarbol):
+    objetivo = tabla.clases[grupo]
+    if len(objetivo) and (objetivo == objetivo[0]).all():
+        return tabla.etiquetas[objetivo[0]]
+    return subarbol()
+
+if __name__ == "__main__":
+    # Leer los datos
+    atributos, ejemplos = leer_archivos('AtributosJuego.txt', 'Juego.txt')
 
-# Generar el árbol de decisión
-arbol_decision = id3(ejemplos, atributos)
-print(arbol_decision)
\ No newline at end of file
+    # Generar el árbol de decisión
+    arbol_decision = id3(ejemplos, atributos)
+    print(arbol_decision)
\ No newline at end of file
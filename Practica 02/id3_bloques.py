@@ -0,0 +1,199 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+from codificacion import NULO, TablaCodificada
+from id3 import codificar_clases, elegir_columna, ganancia_grupos, leer_atributos
+
+# Entrenamiento de id3() sin cargar el archivo de ejemplos: se lee por bloques de filas,
+# una pasada por nivel del árbol. En cada pasada cada fila baja por el árbol construido
+# hasta entonces y se suma a los recuentos (valor, clase) de su nodo de la frontera para
+# cada atributo, junto con la posición de la primera fila de cada valor. Con eso se
+# repiten las cuentas de id3_filas en el mismo orden, así que el árbol es el mismo que el
+# de id3() sobre leer_archivos(). En memoria solo hay un bloque y los recuentos.
+
+# Números de los textos leídos de una columna, en orden de primera aparición en el archivo
+class _Vocabulario:
+    def __init__(self):
+        self.numeros = {}
+        self.textos = []
+
+    def codificar(self, columna):
+        locales, unicos = pd.factorize(columna, use_na_sentinel=False)
+        globales = []
+        for texto in unicos:
+            clave = NULO if pd.isna(texto) else texto
+            if clave not in self.numeros:
+                self.numeros[clave] = len(self.textos)
+                self.textos.append(texto)
+            globales.append(self.numeros[clave])
+        return np.array(globales, dtype=np.int64)[locales]
+
+    # Valores que tendría la columna leída entera con read_csv (el tipo se deduce de todos los
+    # textos a la vez) y, para cada texto, el código del valor como en TablaCodificada
+    def valores(self):
+        salida = io.StringIO()
+        escritor = csv.writer(salida)
+        for k, texto in enumerate(self.textos):
+            escritor.writerow([k, '' if pd.isna(texto) else texto])
+        columna = pd.read_csv(io.StringIO(salida.getvalue()), header=None, names=['k', 'valor'])['valor']
+        codigos, valores = TablaCodificada._codificar(columna)
+        return codigos.astype(np.int64), valores
+
+# Árbol a medio construir: por nodo, la columna por la que pregunta (-1 si aún no se sabe)
+# y el principio de sus hijos en un array con uno por valor de la columna (-1 si la rama
+# ya no sigue: es una hoja o no tiene filas)
+class _Nodos:
+    def __init__(self):
+        self.columna, self.primero, self.hijos = [], [], []
+
+    def nuevo(self):
+        self.columna.append(-1)
+        self.primero.append(0)
+        return len(self.columna) - 1
+
+    def preguntar(self, nodo, columna, n_valores):
+        self.columna[nodo] = columna
+        self.primero[nodo] = len(self.hijos)
+        self.hijos.extend([-1] * n_valores)
+
+    # Nodo al que llega cada fila (-1 si se queda en una rama que ya no sigue); codigos tiene
+    # una fila de códigos de valores por atributo
+    def bajar(self, codigos, n_filas):
+        columna = np.array(self.columna, dtype=np.int64)
+        primero = np.array(self.primero, dtype=np.int64)
+        hijos = np.array(self.hijos, dtype=np.int64)
+        nodo = np.zeros(n_filas, dtype=np.int64)
+        activas = np.arange(n_filas)
+        # En cada vuelta todas las filas que siguen bajando avanzan un nivel
+        while len(activas):
+            actual = nodo[activas]
+            internas = columna[actual] >= 0
+            activas, actual = activas[internas], actual[internas]
+            hijo = hijos[primero[actual] + codigos[columna[actual], activas]]
+            nodo[activas] = hijo
+            activas = activas[hijo >= 0]
+        return nodo
+
+# Recuentos de una pasada para cada nodo de la frontera: filas por (atributo, texto, texto
+# del objetivo) y posición en el archivo de la primera fila de cada (atributo, texto)
+class _Recuentos:
+    def __init__(self, n_frontera):
+        self.cuentas = [{} for _ in range(n_frontera)]
+        self.primeras = [{} for _ in range(n_frontera)]
+
+    def sumar(self, frontera, atributo, textos, objetivo, n_textos, n_objetivo, posiciones):
+        clave = (frontera * n_textos + textos) * n_objetivo + objetivo
+        unicas, indices, cuentas = np.unique(clave, return_index=True, return_counts=True)
+        for clave, indice, cuenta in zip(unicas.tolist(), posiciones[indices].tolist(), cuentas.tolist()):
+            resto, clase = divmod(clave, n_objetivo)
+            f, texto = divmod(resto, n_textos)
+            self.cuentas[f][atributo, texto, clase] = self.cuentas[f].get((atributo, texto, clase), 0) + cuenta
+            if indice < self.primeras[f].get((atributo, texto), indice + 1):
+                self.primeras[f][atributo, texto] = indice
+
+    # {valor: {clase: cuenta}} de un atributo en un nodo de la frontera, con los valores en
+    # orden de primera aparición; textos y clases pasan a valores con los códigos de canon
+    def por_valor(self, f, atributo, canon, canon_objetivo):
+        primeras, cuentas = {}, {}
+        for (a, texto), indice in self.primeras[f].items():
+            if a == atributo:
+                valor = int(canon[texto])
+                primeras[valor] = min(indice, primeras.get(valor, indice))
+        for (a, texto, clase), cuenta in self.cuentas[f].items():
+            if a == atributo:
+                por_clase = cuentas.setdefault(int(canon[texto]), {})
+                clase = int(canon_objetivo[clase])
+                por_clase[clase] = por_clase.get(clase, 0) + cuenta
+        return {valor: cuentas[valor] for valor in sorted(primeras, key=primeras.get)}
+
+# ganancia_grupos con los recuentos {valor: {clase: cuenta}} de un nodo, con las clases
+# pasadas a SI, NO u OTRA: las mismas cuentas que ganancia_codigos sobre las filas del nodo
+def _ganancia(por_valor, clases, nulo):
+    grupos_valores, totales = {}, np.zeros(3, dtype=np.int64)
+    for valor, cuentas in por_valor.items():
+        agrupadas = {}
+        for clase, cuenta in cuentas.items():
+            codigo = int(clases[clase])
+            agrupadas[codigo] = agrupadas.get(codigo, 0) + cuenta
+            totales[codigo] += cuenta
+        grupos_valores[valor] = list(agrupadas.items())
+    return ganancia_grupos(int(totales.sum()), totales, grupos_valores, nulo)
+
+# Como id3(ejemplos, atributos, nivel, max_nivel) con los ejemplos de leer_archivos(), pero
+# leyendo ejemplos_file por bloques de filas_por_bloque filas, una vez por nivel
+def id3_por_bloques(atributos_file, ejemplos_file, nivel=1, max_nivel=2, filas_por_bloque=1 << 16):
+    atributos = leer_atributos(atributos_file)
+    if len(atributos) == 0 or nivel > max_nivel:
+        return None
+    
+    vocabularios = [_Vocabulario() for _ in atributos]
+    vocabulario_objetivo = _Vocabulario()
+    canon = canon_objetivo = None  # Código del valor de cada texto, tras la primera pasada
+    nodos = _Nodos()
+    # Nodos por expandir en la siguiente pasada: (nodo, columnas que quedan, nivel, ramas del padre, valor)
+    frontera = [(nodos.nuevo(), list(range(len(atributos))), nivel, None, None)]
+    raiz = {}
+    
+    while frontera:
+        posicion = np.full(len(nodos.columna), -1, dtype=np.int64)
+        posicion[[nodo for nodo, *_ in frontera]] = np.arange(len(frontera))
+        recuentos = _Recuentos(len(frontera))
+        filas_leidas = 0
+        for bloque in pd.read_csv(ejemplos_file, header=None, names=atributos + ['Jugar'], dtype=str,
+                                  chunksize=filas_por_bloque):
+            textos = np.array([v.codificar(bloque[a]) for v, a in zip(vocabularios, atributos)])
+            objetivo = vocabulario_objetivo.codificar(bloque['Jugar'])
+            valores = textos if canon is None else np.array([c[t] for c, t in zip(canon, textos)])
+            destino = nodos.bajar(valores, len(bloque))
+            f = np.where(destino >= 0, posicion[np.maximum(destino, 0)], -1)
+            en_frontera = np.flatnonzero(f >= 0)
+            for a, textos_a in enumerate(textos):
+                recuentos.sumar(f[en_frontera], a, textos_a[en_frontera], objetivo[en_frontera],
+                                len(vocabularios[a].textos), len(vocabulario_objetivo.textos),
+                                filas_leidas + en_frontera)
+            filas_leidas += len(bloque)
+        
+        if canon is None:
+            # Tras la primera pasada ya se han visto todos los textos: se fijan los valores
+            canon, tabla_valores = zip(*(v.valores() for v in vocabularios))
+            canon_objetivo, etiquetas = vocabulario_objetivo.valores()
+            nulos = [next((i for i, valor in enumerate(valores_columna) if pd.isna(valor)), None)
+                     for valores_columna in tabla_valores]
+            clases = codificar_clases(np.array(etiquetas, dtype=object))
+        
+        siguiente = []
+        for f, (nodo, columnas, nivel_nodo, ramas_padre, valor_padre) in enumerate(frontera):
+            por_columna = {c: recuentos.por_valor(f, c, canon[c], canon_objetivo) for c in columnas}
+            ganancias = [_ganancia(por_columna[c], clases, nulos[c]) for c in columnas]
+            mejor_columna = elegir_columna(columnas, ganancias)
+            
+            resto = [c for c in columnas if c != mejor_columna]
+            ramas = {}
+            nodos.preguntar(nodo, mejor_columna, len(tabla_valores[mejor_columna]))
+            for valor, cuentas in por_columna[mejor_columna].items():
+                etiqueta = tabla_valores[mejor_columna][valor]
+                if valor == nulos[mejor_columna]:
+                    # La rama del valor nulo no tiene filas: id3_filas elige la primera columna que queda
+                    vacio = len(resto) == 0 or nivel_nodo + 1 > max_nivel
+                    ramas[etiqueta] = None if vacio else {atributos[resto[0]]: {}}
+                elif len(cuentas) == 1:
+                    (clase,) = cuentas
+                    ramas[etiqueta] = etiquetas[clase]
+                elif len(resto) == 0 or nivel_nodo + 1 > max_nivel:
+                    ramas[etiqueta] = None
+                else:
+                    ramas[etiqueta] = None  # Se rellena en la siguiente pasada
+                    hijo = nodos.nuevo()
+                    nodos.hijos[nodos.primero[nodo] + valor] = hijo
+                    siguiente.append((hijo, resto, nivel_nodo + 1, ramas, etiqueta))
+            arbol = {atributos[mejor_columna]: ramas}
+            if ramas_padre is None:
+                raiz = arbol
+            else:
+                ramas_padre[valor_padre] = arbol
+        frontera = siguiente
+    
+    return raiz
\ No newline at end of file
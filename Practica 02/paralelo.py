@@ -0,0 +1,161 @@
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from codificacion import TablaCodificada
+from id3 import codificar_clases, elegir_columna, ganancia_codigos, hoja_o_subarbol, id3_filas, ramas
+
+# Modo de entrenamiento en paralelo de id3.py. La tabla codificada, las clases y los índices
+# de filas se copian una vez a memoria compartida; los procesos del pool la leen sin copias.
+# Como las filas de cada nodo son un tramo del array de filas (particionar las reordena en
+# su sitio), a un proceso le basta con el principio y el fin del tramo. Los nodos grandes se
+# expanden aquí, con las ganancias de los atributos repartidas por trozos de columnas; los
+# subárboles de menos de filas_por_nodo filas se construyen enteros en un proceso. Las
+# ganancias se calculan con las mismas funciones y se eligen en el mismo orden, así que el
+# árbol es idéntico al de id3().
+
+# Tabla del proceso: la del padre en el padre y, en cada proceso del pool, las vistas de la
+# memoria compartida que prepara _iniciar
+_TABLA = _CLASES = _FILAS = None
+_MEMORIA = None
+
+# Vista de la tabla codificada sobre la memoria compartida, con los mismos atributos que
+# usa id3_filas. metadatos son (atributos, valores, nulos, etiquetas), lo único que se copia
+# a cada proceso: las columnas codificadas solo están en la memoria compartida
+class _TablaCompartida:
+    def __init__(self, metadatos, columnas, clases):
+        self.atributos, self.valores, self.nulos, self.etiquetas = metadatos
+        self.columnas = columnas
+        self.clases = clases
+
+# Sitio de cada array en el bloque compartido: (desplazamiento, tipo, longitud), alineado a 8 bytes
+def _disposicion(arrays):
+    disposicion, desplazamiento = [], 0
+    for array in arrays:
+        disposicion.append((desplazamiento, array.dtype.str, len(array)))
+        desplazamiento += -(-array.nbytes // 8) * 8
+    return disposicion, max(desplazamiento, 1)
+
+def _vistas(memoria, disposicion):
+    return [np.ndarray(longitud, dtype=tipo, buffer=memoria.buf, offset=desplazamiento)
+            for desplazamiento, tipo, longitud in disposicion]
+
+def _iniciar(nombre, disposicion, metadatos):
+    global _TABLA, _CLASES, _FILAS, _MEMORIA
+    _MEMORIA = shared_memory.SharedMemory(name=nombre)
+    filas, clases, objetivo, *columnas = _vistas(_MEMORIA, disposicion)
+    _TABLA, _CLASES, _FILAS = _TablaCompartida(metadatos, columnas, objetivo), clases, filas
+
+# Ganancias de unas columnas sobre el tramo de filas [inicio, fin)
+def _puntuar(inicio, fin, columnas):
+    filas = _FILAS[inicio:fin]
+    clases = _CLASES[filas]
+    return [ganancia_codigos(_TABLA.columnas[c][filas], clases, _TABLA.nulos[c]) for c in columnas]
+
+# Subárbol entero del tramo de filas [inicio, fin)
+def _subarbol(inicio, fin, columnas, nivel, max_nivel):
+    return id3_filas(_TABLA, _CLASES, _FILAS[inicio:fin], columnas, nivel, max_nivel)
+
+# Tabla codificada en memoria compartida y pool de procesos que la ven. Solo puede haber
+# uno abierto a la vez en cada proceso
+class EntrenamientoParalelo:
+    def __init__(self, ejemplos, atributos, procesos=None, filas_por_nodo=100000):
+        self.procesos = procesos or os.cpu_count()
+        self.filas_por_nodo = filas_por_nodo
+        tabla = TablaCodificada(ejemplos, atributos, 'Jugar')
+        clases = codificar_clases(np.array(tabla.etiquetas, dtype=object))[tabla.clases].astype(np.int8)
+        arrays = [tabla.filas(), clases, tabla.clases] + tabla.columnas
+        disposicion, tamano = _disposicion(arrays)
+        metadatos = (tabla.atributos, tabla.valores, tabla.nulos, tabla.etiquetas)
+
+        self.memoria = shared_memory.SharedMemory(create=True, size=tamano)
+        try:
+            for vista, array in zip(_vistas(self.memoria, disposicion), arrays):
+                vista[:] = array
+            del arrays, clases, tabla
+            # El proceso principal usa las mismas vistas, para reordenar las filas donde las leen los demás
+            _iniciar(self.memoria.name, disposicion, metadatos)
+            self.pool = Pool(self.procesos, _iniciar, (self.memoria.name, disposicion, metadatos))
+        except BaseException:
+            self.cerrar()
+            raise
+
+    def cerrar(self):
+        global _TABLA, _CLASES, _FILAS, _MEMORIA
+        if getattr(self, 'pool', None) is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        _TABLA = _CLASES = _FILAS = None
+        if _MEMORIA is not None and _MEMORIA is not self.memoria:
+            _MEMORIA.close()
+        _MEMORIA = None
+        self.memoria.close()
+        self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # Columnas repartidas en trozos consecutivos, unos pocos por proceso
+    def _trozos(self, columnas):
+        tamano = max(1, -(-len(columnas) // (4 * self.procesos)))
+        return [columnas[k:k + tamano] for k in range(0, len(columnas), tamano)]
+
+    # Ganancias de las columnas sobre el tramo [inicio, fin), en el orden de columnas
+    def ganancias(self, inicio, fin, columnas):
+        trozos = self.pool.starmap(_puntuar, [(inicio, fin, trozo) for trozo in self._trozos(columnas)])
+        return [ganancia for trozo in trozos for ganancia in trozo]
+
+    def seleccionar_mejor_atributo(self):
+        columnas = list(range(len(_TABLA.atributos)))
+        mejor_columna = elegir_columna(columnas, self.ganancias(0, len(_FILAS), columnas))
+        return _TABLA.atributos[mejor_columna]
+
+    def id3(self, nivel=1, max_nivel=2):
+        # Los subárboles enviados se dejan pendientes y se colocan al final, cada uno en su rama
+        pendientes = []
+        arbol = self._nodo(0, len(_FILAS), list(range(len(_TABLA.atributos))), nivel, max_nivel, pendientes)
+        for ramas_nodo, valor, resultado in pendientes:
+            ramas_nodo[valor] = resultado.get()
+        return arbol
+
+    # Como id3_filas sobre el tramo [inicio, fin), con las ganancias calculadas en el pool
+    def _nodo(self, inicio, fin, columnas, nivel, max_nivel, pendientes):
+        if len(columnas) == 0 or nivel > max_nivel:
+            return None
+        mejor_columna = elegir_columna(columnas, self.ganancias(inicio, fin, columnas))
+        if mejor_columna is None:
+            return None
+
+        resto = [c for c in columnas if c != mejor_columna]
+        ramas_nodo = {}
+        for valor, grupo in ramas(_TABLA, mejor_columna, _FILAS[inicio:fin]):
+            # Cada rama es un tramo de _FILAS: su principio sale de la posición de la vista
+            principio = (grupo.ctypes.data - _FILAS.ctypes.data) // _FILAS.itemsize
+            ramas_nodo[valor] = hoja_o_subarbol(_TABLA, grupo, lambda: self._rama(
+                principio, principio + len(grupo), resto, nivel + 1, max_nivel, pendientes, ramas_nodo, valor))
+        return {_TABLA.atributos[mejor_columna]: ramas_nodo}
+
+    # Subárbol de una rama: se sigue expandiendo aquí si es grande y se envía a un proceso si no
+    def _rama(self, inicio, fin, columnas, nivel, max_nivel, pendientes, ramas_nodo, valor):
+        if fin - inicio >= self.filas_por_nodo:
+            return self._nodo(inicio, fin, columnas, nivel, max_nivel, pendientes)
+        if fin == inicio:
+            return id3_filas(_TABLA, _CLASES, _FILAS[inicio:fin], columnas, nivel, max_nivel)
+        pendientes.append((ramas_nodo, valor, self.pool.apply_async(_subarbol, (inicio, fin, columnas, nivel,
+                                                                                 max_nivel))))
+        return None
+
+# Como seleccionar_mejor_atributo(), con las ganancias calculadas en procesos paralelos
+def seleccionar_mejor_atributo_paralelo(ejemplos, atributos, procesos=None):
+    with EntrenamientoParalelo(ejemplos, atributos, procesos) as entrenamiento:
+        return entrenamiento.seleccionar_mejor_atributo()
+
+# Como id3(), en procesos paralelos; da el mismo árbol
+def id3_paralelo(ejemplos, atributos, nivel=1, max_nivel=2, procesos=None, filas_por_nodo=100000):
+    with EntrenamientoParalelo(ejemplos, atributos, procesos, filas_por_nodo) as entrenamiento:
+        return entrenamiento.id3(nivel, max_nivel)
\ No newline at end of file
@@ -1,8 +1,11 @@
 import pygame
+import numpy as np
 import pandas as pd
 import math
 from collections import Counter
 
+from codificacion import TablaCodificada, grupos, particionar
+
 def calcular_entropia(columna):
     """ Calcula la entropía de un conjunto de datos."""
     conteo = Counter(columna)
@@ -20,21 +23,57 @@ def ganancia_de_informacion(df, atributo, objetivo):
     )
     return entropia_total - entropia_condicional
 
+def entropia_cuentas(cuentas):
+    """ Entropía a partir de las cuentas de cada clase, en orden de primera aparición como Counter."""
+    total = sum(cuentas)
+    return -sum((freq/total) * math.log2(freq/total) for freq in cuentas)
+
+def ganancia_codigos(valores, clases, n_clases, nulo=None):
+    """ Ganancia de información de un atributo codificado, con las mismas operaciones que ganancia_de_informacion."""
+    codigos_clase, _ = pd.factorize(clases)
+    entropia_total = entropia_cuentas(np.bincount(codigos_clase).tolist())
+    # El valor nulo no coincide con ninguna fila (NaN != NaN) y no suma nada
+    entropia_condicional = sum(
+        (sum(cuenta for _, cuenta in cuentas) / len(clases)) * entropia_cuentas([cuenta for _, cuenta in cuentas])
+        for valor, cuentas in grupos(valores, clases, n_clases).items() if valor != nulo
+    )
+    return entropia_total - entropia_condicional
+
+def clase_mayoritaria(tabla, clases):
+    """ La clase más frecuente de las filas, como mode()[0]: en un empate, la menor."""
+    cuentas = np.bincount(clases, minlength=len(tabla.etiquetas)).tolist()
+    maximo = max(cuenta for etiqueta, cuenta in zip(tabla.etiquetas, cuentas) if not pd.isna(etiqueta))
+    return sorted(etiqueta for etiqueta, cuenta in zip(tabla.etiquetas, cuentas)
+                  if cuenta == maximo and not pd.isna(etiqueta))[0]
+
 def id3(df, atributos, objetivo, profundidad=2):
     """ Implementa el algoritmo ID3 con un límite de profundidad."""
-    if len(df[objetivo].unique()) == 1:
-        return df[objetivo].iloc[0]  # Si todos los valores son iguales, devolver ese valor
+    # Los ejemplos se codifican una vez y la recursión solo se pasa índices de filas
+    tabla = TablaCodificada(df, atributos, objetivo)
+    return id3_filas(tabla, tabla.filas(), list(range(len(atributos))), profundidad)
+
+def id3_filas(tabla, filas, columnas, profundidad):
+    """ ID3 sobre las filas indicadas de la tabla codificada; columnas son los atributos que quedan."""
+    clases = tabla.clases[filas]
+    if len(clases) and (clases == clases[0]).all():
+        return tabla.etiquetas[clases[0]]  # Si todos los valores son iguales, devolver ese valor
     
-    if not atributos or profundidad == 0:
-        return df[objetivo].mode()[0]  # Devolver la clase más frecuente
+    if not columnas or profundidad == 0:
+        return clase_mayoritaria(tabla, clases)  # Devolver la clase más frecuente
     
-    mejor_atributo = max(atributos, key=lambda attr: ganancia_de_informacion(df, attr, objetivo))
+    n_clases = len(tabla.etiquetas)
+    mejor_columna = max(columnas, key=lambda c: ganancia_codigos(tabla.columnas[c][filas], clases, n_clases,
+                                                                 tabla.nulos[c]))
+    mejor_atributo = tabla.atributos[mejor_columna]
     arbol = {mejor_atributo: {}}
     
-    for valor in df[mejor_atributo].unique():
-        subconjunto = df[df[mejor_atributo] == valor]
-        nuevos_atributos = [attr for attr in atributos if attr != mejor_atributo]
-        arbol[mejor_atributo][valor] = id3(subconjunto, nuevos_atributos, objetivo, profundidad-1)
+    # Las filas de cada valor son un tramo de filas: se reordenan en su sitio, sin copias
+    for valor, grupo in particionar(tabla.columnas[mejor_columna][filas], filas):
+        if valor == tabla.nulos[mejor_columna]:
+            grupo = grupo[:0]  # Como al filtrar con == NaN, la rama del valor nulo no tiene filas
+        nuevas_columnas = [c for c in columnas if c != mejor_columna]
+        arbol[mejor_atributo][tabla.valores[mejor_columna][valor]] = id3_filas(tabla, grupo, nuevas_columnas,
+                                                                              profundidad-1)
     
     return arbol
 
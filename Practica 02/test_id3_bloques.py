@@ -0,0 +1,70 @@
+import csv
+import random
+
+import pytest
+
+from id3 import id3, leer_archivos
+from id3_bloques import id3_por_bloques
+
+# Valores posibles de cada columna: textos, enteros, decimales mezclados con enteros,
+# booleanos, vacíos (NaN) y textos entre comillas con comas
+DOMINIOS = [
+    ['soleado', 'nublado', 'lluvioso'],
+    ['1', '2', '3'],
+    ['1', '2.5', '1.0'],
+    ['True', 'False'],
+    ['x', '', 'a,b'],
+    ['7', ''],
+]
+CLASES = ['si', 'no', 'quizas']
+
+
+def escribir_archivos(carpeta, filas, semilla):
+    azar = random.Random(semilla)
+    columnas = azar.sample(range(len(DOMINIOS)), 4)
+    atributos = carpeta / 'Atributos.txt'
+    ejemplos = carpeta / 'Ejemplos.txt'
+    # Como en AtributosJuego.txt, todos los nombres menos el último llevan una coma al final
+    atributos.write_text(',\n'.join(f'A{c}' for c in columnas) + '\n')
+    with open(ejemplos, 'w', newline='') as f:
+        escritor = csv.writer(f)
+        for _ in range(filas):
+            escritor.writerow([azar.choice(DOMINIOS[c]) for c in columnas] + [azar.choice(CLASES)])
+    return atributos, ejemplos
+
+
+def en_memoria(atributos_file, ejemplos_file, nivel, max_nivel):
+    atributos, ejemplos = leer_archivos(atributos_file, ejemplos_file)
+    return id3(ejemplos, atributos, nivel, max_nivel)
+
+
+@pytest.mark.parametrize('filas_por_bloque', [1, 2, 3, 1000])
+@pytest.mark.parametrize('semilla', range(6))
+def test_mismo_arbol_que_en_memoria(tmp_path, semilla, filas_por_bloque):
+    atributos, ejemplos = escribir_archivos(tmp_path, 40 + 10 * semilla, semilla)
+    for max_nivel in (1, 2, 4):
+        esperado = en_memoria(atributos, ejemplos, 1, max_nivel)
+        assert repr(id3_por_bloques(atributos, ejemplos, 1, max_nivel, filas_por_bloque)) == repr(esperado)
+
+
+def test_tipos_de_toda_la_columna(tmp_path):
+    # El tipo de una columna depende de todos sus valores, aunque lleguen en bloques distintos
+    atributos = tmp_path / 'Atributos.txt'
+    ejemplos = tmp_path / 'Ejemplos.txt'
+    atributos.write_text('Enteros,\nDecimales,\nLogicos\n')
+    ejemplos.write_text('1,1,True,si\n2,1.0,False,no\n1,,True,si\n3,2.5,False,no\n')
+    esperado = en_memoria(atributos, ejemplos, 1, 3)
+    for filas_por_bloque in (1, 2, 3):
+        assert repr(id3_por_bloques(atributos, ejemplos, 1, 3, filas_por_bloque)) == repr(esperado)
+
+
+def test_rama_del_valor_nulo(tmp_path):
+    # La rama del valor nulo no tiene ejemplos: su subárbol pregunta por el primer atributo que queda
+    atributos = tmp_path / 'Atributos.txt'
+    ejemplos = tmp_path / 'Ejemplos.txt'
+    atributos.write_text('A,\nB,\nC\n')
+    ejemplos.write_text(',x,p,si\n,y,q,no\n,x,q,si\n,y,p,no\nz,x,p,si\nz,y,q,si\n')
+    for max_nivel in (1, 2, 3):
+        esperado = en_memoria(atributos, ejemplos, 1, max_nivel)
+        assert 'nan' in repr(esperado)
+        assert repr(id3_por_bloques(atributos, ejemplos, 1, max_nivel, 1)) == repr(esperado)
\ No newline at end of file
@@ -0,0 +1,53 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from id3 import id3
+from paralelo import EntrenamientoParalelo, id3_paralelo
+
+
+def ejemplos_aleatorios(n, semilla):
+    azar = np.random.default_rng(semilla)
+    ejemplos = pd.DataFrame({f'A{k}': azar.choice(['x', 'y', 'z'][:2 + k % 2], n).astype(object) for k in range(4)})
+    ejemplos.loc[ejemplos.index[::7], 'A0'] = np.nan  # Una columna con nulos
+    ejemplos['A3'] = azar.integers(0, 3, n)
+    ejemplos['Jugar'] = azar.choice(['si', 'no', 'quizas'], n).astype(object)
+    return ejemplos
+
+
+@pytest.mark.parametrize('filas_por_nodo', [1, 20, 10 ** 6])
+@pytest.mark.parametrize('semilla', range(3))
+def test_mismo_arbol_que_id3(semilla, filas_por_nodo):
+    ejemplos = ejemplos_aleatorios(300, semilla)
+    atributos = [columna for columna in ejemplos.columns if columna != 'Jugar']
+    serie = id3(ejemplos, atributos, 1, 4)
+    paralelo = id3_paralelo(ejemplos, atributos, 1, 4, procesos=2, filas_por_nodo=filas_por_nodo)
+    assert repr(paralelo) == repr(serie)
+
+
+def test_mismo_arbol_con_spawn():
+    ejemplos = ejemplos_aleatorios(200, 0)
+    atributos = [columna for columna in ejemplos.columns if columna != 'Jugar']
+    original = multiprocessing.get_start_method()
+    multiprocessing.set_start_method('spawn', force=True)
+    try:
+        paralelo = id3_paralelo(ejemplos, atributos, 1, 4, procesos=2, filas_por_nodo=10)
+    finally:
+        multiprocessing.set_start_method(original, force=True)
+    assert repr(paralelo) == repr(id3(ejemplos, atributos, 1, 4))
+
+
+def test_los_procesos_no_reciben_las_columnas(monkeypatch):
+    # Lo que se envía a cada proceso al arrancar no crece con el número de filas
+    argumentos = []
+    monkeypatch.setattr('paralelo.Pool', lambda procesos, iniciar, args: argumentos.append(args))
+    for n in (100, 100000):
+        ejemplos = ejemplos_aleatorios(n, 0)
+        entrenamiento = EntrenamientoParalelo(ejemplos, list(ejemplos.columns[:-1]), procesos=1)
+        entrenamiento.pool = None
+        entrenamiento.cerrar()
+    pequeno, grande = (len(pickle.dumps(args)) for args in argumentos)
+    assert grande < pequeno + 1000
\ No newline at end of file
@@ -1,7 +1,5 @@
 import heapq
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 
 def leer_matriz_fichero(nombre_fichero):
     matriz = []
@@ -92,27 +90,17 @@ def reconstruir_camino(padres, nodo):
     camino.reverse()
     return camino
 
-def mostrar_matriz(matriz, camino=None):
-    filas, columnas = len(matriz), len(matriz[0])
-    imagen = np.zeros((filas, columnas, 3))  # Imagen en RGB
-
-    colores = {
-        0: (1, 1, 1),  # Blanco para caminos libres
-        -1: (0, 0, 0), # Negro para obstáculos
-        2: (0, 1, 0),  # Verde para inicio
-        3: (1, 0, 0)   # Rojo para final
-    }
+def mostrar_matriz(matriz, camino=None, puntos=None):
+    # Solo hace falta para dibujar: importarlo aquí evita su carga al resolver sin pantalla
+    import matplotlib.pyplot as plt
 
-    # Pintar la matriz
-    for i in range(filas):
-        for j in range(columnas):
-            imagen[i, j] = colores.get(matriz[i][j], (1, 1, 1))
+    from dibujo import PRIO_FINAL, PRIORIDAD, codigos_matriz, imagen as dibujar
 
-    # Si hay un camino, dibujarlo en azul
-    if camino:
-        for nodo in camino:
-            if matriz[nodo[0]][nodo[1]] not in [2, 3]:  # No sobrescribir inicio y final
-                imagen[nodo[0], nodo[1]] = (0, 0, 1)  # Azul para el camino
+    # En este mapa el 2 es el inicio (verde) y el 3 el final (rojo). El camino se pinta en
+    # azul sin sobrescribir las celdas de puntos (por defecto, el inicio y el final)
+    prioridades = PRIORIDAD.copy()
+    prioridades[3] = PRIO_FINAL
+    imagen = dibujar(codigos_matriz(matriz), camino, None if puntos is None else puntos.values(), prioridades)
 
     # Mostrar la imagen con Matplotlib
     plt.figure(figsize=(5, 5))
@@ -123,23 +111,24 @@ def mostrar_matriz(matriz, camino=None):
     plt.title("Mapa con el camino encontrado")
     plt.show()
 
-# Prueba del algoritmo
-nombre_fichero = "matriz.txt" 
-matriz, inicio, final = leer_matriz_fichero(nombre_fichero)
+if __name__ == "__main__":
+    # Prueba del algoritmo
+    nombre_fichero = "matriz.txt" 
+    matriz, inicio, final = leer_matriz_fichero(nombre_fichero)
 
-print("Matriz cargada:")
-for fila in matriz:
-    print(fila)
+    print("Matriz cargada:")
+    for fila in matriz:
+        print(fila)
 
-print(f"Inicio: {inicio}, Final: {final}")
+    print(f"Inicio: {inicio}, Final: {final}")
 
-camino = astar(matriz, inicio, final)
-""" if camino:
-    print("Camino encontrado:")
-    for paso in camino:
-        print(paso)
-else:
-    print("No se encontró un camino.") """
+    camino = astar(matriz, inicio, final)
+    """ if camino:
+        print("Camino encontrado:")
+        for paso in camino:
+            print(paso)
+    else:
+        print("No se encontró un camino.") """
 
-# Mostrar la matriz con el camino encontrado
-mostrar_matriz(matriz, camino)
+    # Mostrar la matriz con el camino encontrado
+    mostrar_matriz(matriz, camino, {2: inicio, 3: final})
@@ -1,7 +1,5 @@
 import heapq
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 
 def leer_matriz_fichero(nombre_fichero):
     matriz = []
@@ -93,31 +91,14 @@ def reconstruir_camino(padres, nodo):
     camino.reverse()
     return camino
 
-def mostrar_matriz(matriz, camino=None):
-    filas, columnas = len(matriz), len(matriz[0])
-    imagen = np.zeros((filas, columnas, 3))  # Imagen en RGB
-
-    colores = {
-        0: (1, 1, 1),  # Blanco para caminos libres
-        -1: (0, 0, 0), # Negro para obstáculos
-        1: (0, 1, 0),  # Verde para puntos
-        2: (0, 1, 0),  # Verde para puntos
-        3: (0, 1, 0),  # Verde para puntos
-        4: (0, 1, 0),  # Verde para puntos
-        5: (0, 1, 0),  # Verde para puntos
-        6: (1, 0, 0),  # Rojo para el final
-    }
+def mostrar_matriz(matriz, camino=None, puntos=None):
+    # Solo hace falta para dibujar: importarlo aquí evita su carga al resolver sin pantalla
+    import matplotlib.pyplot as plt
 
-    # Pintar la matriz
-    for i in range(filas):
-        for j in range(columnas):
-            imagen[i, j] = colores.get(matriz[i][j], (1, 1, 1))
+    from dibujo import codigos_matriz, imagen as dibujar
 
-    # Si hay un camino, dibujarlo en azul
-    if camino:
-        for nodo in camino:
-            if nodo not in puntos.values():  # No sobrescribir puntos
-                imagen[nodo[0], nodo[1]] = (0, 0, 1)  # Azul para el camino
+    # El camino se pinta en azul sin sobrescribir los puntos (por defecto, las celdas 1..6)
+    imagen = dibujar(codigos_matriz(matriz), camino, None if puntos is None else puntos.values())
 
     # Mostrar la imagen con Matplotlib
     plt.figure(figsize=(5, 5))
@@ -128,39 +109,40 @@ def mostrar_matriz(matriz, camino=None):
     plt.title("Mapa con el camino encontrado")
     plt.show()
 
-# Prueba del algoritmo
-nombre_fichero = "matriz2.txt" 
-matriz, puntos = leer_matriz_fichero(nombre_fichero)
-
-print("Matriz cargada:")
-for fila in matriz:
-    print(fila)
-
-print(f"Puntos: {puntos}")
-
-# Ordenar los puntos por su valor
-puntos_ordenados = sorted(puntos.items())
-
-camino_total = []
-for i in range(len(puntos_ordenados) - 1):
-    inicio = puntos_ordenados[i][1]
-    final = puntos_ordenados[i + 1][1]
-    camino = astar(matriz, inicio, final)
-    if camino:
-        camino_total.extend(camino[:-1])  # Evitar duplicar el nodo final
+if __name__ == "__main__":
+    # Prueba del algoritmo
+    nombre_fichero = "matriz2.txt" 
+    matriz, puntos = leer_matriz_fichero(nombre_fichero)
+
+    print("Matriz cargada:")
+    for fila in matriz:
+        print(fila)
+
+    print(f"Puntos: {puntos}")
+
+    # Ordenar los puntos por su valor
+    puntos_ordenados = sorted(puntos.items())
+
+    camino_total = []
+    for i in range(len(puntos_ordenados) - 1):
+        inicio = puntos_ordenados[i][1]
+        final = puntos_ordenados[i + 1][1]
+        camino = astar(matriz, inicio, final)
+        if camino:
+            camino_total.extend(camino[:-1])  # Evitar duplicar el nodo final
+        else:
+            print(f"No se encontró un camino de {inicio} a {final}")
+            break
+
+    # Agregar el último nodo final
+    camino_total.append(puntos_ordenados[-1][1])
+
+    if camino_total:
+        print("Camino encontrado:")
+        for paso in camino_total:
+            print(paso)
     else:
-        print(f"No se encontró un camino de {inicio} a {final}")
-        break
-
-# Agregar el último nodo final
-camino_total.append(puntos_ordenados[-1][1])
-
-if camino_total:
-    print("Camino encontrado:")
-    for paso in camino_total:
-        print(paso)
-else:
-    print("No se encontró un camino.")
+        print("No se encontró un camino.")
 
-# Mostrar la matriz con el camino encontrado
-mostrar_matriz(matriz, camino_total)
+    # Mostrar la matriz con el camino encontrado
+    mostrar_matriz(matriz, camino_total, puntos)
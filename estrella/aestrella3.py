@@ -1,7 +1,6 @@
-import heapq
 import math
-import matplotlib.pyplot as plt
-import numpy as np
+
+from lista_abierta import ListaAbierta
 
 def leer_matriz_fichero(nombre_fichero):
     matriz = []
@@ -37,9 +36,9 @@ def leer_matriz_fichero(nombre_fichero):
 def distancia_euclidiana(nodo1, nodo2):
     return math.sqrt((nodo1[0] - nodo2[0])**2 + (nodo1[1] - nodo2[1])**2)
 
-def astar(matriz, inicio, final):
+def astar(matriz, inicio, final, estadisticas=None):
     filas, columnas = len(matriz), len(matriz[0])
-    lista_abierta = []
+    lista_abierta = ListaAbierta()
     lista_cerrada = set()
 
     # Colocar los obstáculos directamente en la lista cerrada
@@ -53,18 +52,23 @@ def astar(matriz, inicio, final):
     f_coste = {inicio: distancia_euclidiana(inicio, final)}
     padres = {inicio: None}
 
-    # Agregar el nodo inicial a la lista abierta
-    heapq.heappush(lista_abierta, (f_coste[inicio], inicio))
+    # Agregar el nodo inicial a la lista abierta (en el inicio g = 0, así que f = h)
+    lista_abierta.insertar(inicio, f_coste[inicio], f_coste[inicio])
 
     # Direcciones de movimiento: vertical, horizontal y diagonal
     direcciones = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
 
+    camino = None
     while lista_abierta:
-        _, nodo_actual = heapq.heappop(lista_abierta)
+        # Las entradas de nodos ya cerrados se descartan dentro de extraer()
+        nodo_actual = lista_abierta.extraer(lista_cerrada)
+        if nodo_actual is None:
+            break
 
         # Si hemos llegado al objetivo, reconstruir el camino
         if nodo_actual == final:
-            return reconstruir_camino(padres, nodo_actual)
+            camino = reconstruir_camino(padres, nodo_actual)
+            break
 
         lista_cerrada.add(nodo_actual)
 
@@ -79,13 +83,17 @@ def astar(matriz, inicio, final):
 
                 # Si no está en lista_abierta o encontramos un camino más corto, actualizamos
                 if vecino not in g_coste or g_nuevo < g_coste[vecino]:
+                    h = distancia_euclidiana(vecino, final)
                     g_coste[vecino] = g_nuevo
-                    f_coste[vecino] = g_nuevo + distancia_euclidiana(vecino, final)
+                    f_coste[vecino] = g_nuevo + h
                     padres[vecino] = nodo_actual
-                    heapq.heappush(lista_abierta, (f_coste[vecino], vecino))
+                    lista_abierta.insertar(vecino, f_coste[vecino], h)
+
+    if estadisticas is not None:
+        estadisticas.update(lista_abierta.contadores())
 
-    # No se encontró un camino
-    return None
+    # None si no se encontró un camino
+    return camino
 
 def reconstruir_camino(padres, nodo):
     camino = []
@@ -95,32 +103,14 @@ def reconstruir_camino(padres, nodo):
     camino.reverse()
     return camino
 
-def mostrar_matriz(matriz, camino=None):
-    filas, columnas = len(matriz), len(matriz[0])
-    imagen = np.zeros((filas, columnas, 3))  # Imagen en RGB
-
-    colores = {
-        0: (1, 1, 1),  # Blanco para caminos libres
-        -1: (0, 0, 0), # Negro para obstáculos
-        0.5: (1, 1, 0), # Amarillo para celdas peligrosas
-        1: (0, 1, 0),  # Verde para puntos
-        2: (0, 1, 0),  # Verde para puntos
-        3: (0, 1, 0),  # Verde para puntos
-        4: (0, 1, 0),  # Verde para puntos
-        5: (0, 1, 0),  # Verde para puntos
-        6: (1, 0, 0),  # Rojo para el final
-    }
+def mostrar_matriz(matriz, camino=None, puntos=None):
+    # Solo hace falta para dibujar: importarlo aquí evita su carga al resolver sin pantalla
+    import matplotlib.pyplot as plt
 
-    # Pintar la matriz
-    for i in range(filas):
-        for j in range(columnas):
-            imagen[i, j] = colores.get(matriz[i][j], (1, 1, 1))
+    from dibujo import codigos_matriz, imagen as dibujar
 
-    # Si hay un camino, dibujarlo en azul
-    if camino:
-        for nodo in camino:
-            if nodo not in puntos.values():  # No sobrescribir puntos
-                imagen[nodo[0], nodo[1]] = (0, 0, 1)  # Azul para el camino
+    # El camino se pinta en azul sin sobrescribir los puntos (por defecto, las celdas 1..6)
+    imagen = dibujar(codigos_matriz(matriz), camino, None if puntos is None else puntos.values())
 
     # Mostrar la imagen con Matplotlib
     plt.figure(figsize=(5, 5))
@@ -131,39 +121,40 @@ def mostrar_matriz(matriz, camino=None):
     plt.title("Mapa con el camino encontrado")
     plt.show()
 
-# Prueba del algoritmo
-nombre_fichero = "matriz3.txt" 
-matriz, puntos = leer_matriz_fichero(nombre_fichero)
-
-print("Matriz cargada:")
-for fila in matriz:
-    print(fila)
-
-print(f"Puntos: {puntos}")
-
-# Ordenar los puntos por su valor
-puntos_ordenados = sorted(puntos.items())
-
-camino_total = []
-for i in range(len(puntos_ordenados) - 1):
-    inicio = puntos_ordenados[i][1]
-    final = puntos_ordenados[i + 1][1]
-    camino = astar(matriz, inicio, final)
-    if camino:
-        camino_total.extend(camino[:-1])  # Evitar duplicar el nodo final
+if __name__ == "__main__":
+    # Prueba del algoritmo
+    nombre_fichero = "matriz3.txt" 
+    matriz, puntos = leer_matriz_fichero(nombre_fichero)
+
+    print("Matriz cargada:")
+    for fila in matriz:
+        print(fila)
+
+    print(f"Puntos: {puntos}")
+
+    # Ordenar los puntos por su valor
+    puntos_ordenados = sorted(puntos.items())
+
+    camino_total = []
+    for i in range(len(puntos_ordenados) - 1):
+        inicio = puntos_ordenados[i][1]
+        final = puntos_ordenados[i + 1][1]
+        camino = astar(matriz, inicio, final)
+        if camino:
+            camino_total.extend(camino[:-1])  # Evitar duplicar el nodo final
+        else:
+            print(f"No se encontró un camino de {inicio} a {final}")
+            break
+
+    # Agregar el último nodo final
+    camino_total.append(puntos_ordenados[-1][1])
+
+    if camino_total:
+        print("Camino encontrado:")
+        for paso in camino_total:
+            print(paso)
     else:
-        print(f"No se encontró un camino de {inicio} a {final}")
-        break
-
-# Agregar el último nodo final
-camino_total.append(puntos_ordenados[-1][1])
-
-if camino_total:
-    print("Camino encontrado:")
-    for paso in camino_total:
-        print(paso)
-else:
-    print("No se encontró un camino.")
+        print("No se encontró un camino.")
 
-# Mostrar la matriz con el camino encontrado
-mostrar_matriz(matriz, camino_total)
+    # Mostrar la matriz con el camino encontrado
+    mostrar_matriz(matriz, camino_total, puntos)
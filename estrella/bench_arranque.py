@@ -0,0 +1,34 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Cada caso es un proceso nuevo de Python, para medir el arranque en frío completo
+CASOS = [
+    ("importar aestrella3 (antes: con matplotlib)", ["-c", "import matplotlib.pyplot, numpy, aestrella3"]),
+    ("importar aestrella3 (ahora)", ["-c", "import aestrella3"]),
+    ("resolver.py, formato texto", ["resolver.py", "matriz3.txt"]),
+    ("resolver.py, formato json", ["resolver.py", "matriz3.txt", "--formato", "json"]),
+    ("resolver.py, formato png", ["resolver.py", "matriz3.txt", "--formato", "png", "--salida", "{png}"]),
+]
+
+
+def medir(orden, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable] + orden, check=True, stdout=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - t0)
+    return statistics.median(tiempos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de los scripts de A*.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--png", default="/tmp/bench_arranque.png", help="fichero donde escribir la imagen de prueba")
+    args = parser.parse_args()
+
+    for nombre, orden in CASOS:
+        orden = [parte.format(png=args.png) for parte in orden]
+        print(f"{nombre:45} {medir(orden, args.repeticiones) * 1000:8.0f} ms (mediana de {args.repeticiones})")
@@ -0,0 +1,215 @@
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+
+from generador import GENERADORES, consultas_fijas, generar_codigos
+from mapa import Mapa
+
+MOTORES = ('astar', 'jps', 'bidireccional', 'hitos', 'jerarquico')
+
+# Qué se exige a cada motor frente a astar, la implementación de referencia:
+# 'igual': el mismo coste; 'optimo': el coste óptimo, que es el de astar si no hay celdas 'P'
+# (con ellas la heurística euclídea deja de ser admisible); 'aproximado': solo se anota
+GARANTIAS = {'astar': 'igual', 'jps': 'igual', 'bidireccional': 'optimo', 'hitos': 'optimo',
+             'jerarquico': 'aproximado'}
+TOLERANCIA = 1e-9
+
+
+def preparar(motor, mapa, args):
+    """ Función (inicio, final, estadisticas) -> camino del motor sobre mapa, o None si no se le puede aplicar."""
+    if motor == 'astar':
+        return lambda inicio, final, estadisticas: mapa.astar(inicio, final, 'astar', estadisticas)
+    if motor == 'jps':
+        if not mapa.admite_jps:
+            return None
+        return lambda inicio, final, estadisticas: mapa.astar(inicio, final, 'jps', estadisticas)
+    if motor == 'bidireccional':
+        return lambda inicio, final, estadisticas: mapa.astar(inicio, final, 'bidireccional', estadisticas)
+    if motor == 'hitos':
+        from hitos import Hitos
+
+        hitos = Hitos.calcular(mapa, args.hitos, args.semilla)
+        return lambda inicio, final, estadisticas: mapa.astar(inicio, final, 'astar', estadisticas, hitos)
+    if motor == 'jerarquico':
+        from jerarquico import Jerarquia
+
+        jerarquia = Jerarquia(mapa, args.bloque)
+        return jerarquia.camino
+    raise ValueError(f"Motor desconocido: {motor}")
+
+
+def costes_camino(mapa, pares, caminos):
+    """ Coste de cada camino (None si no hay), comprobando que une los extremos de su consulta."""
+    costes = []
+    for (inicio, final), camino in zip(pares, caminos):
+        if camino is None:
+            costes.append(None)
+            continue
+        if tuple(camino[0]) != tuple(inicio) or tuple(camino[-1]) != tuple(final):
+            raise AssertionError(f"El camino de {inicio} a {final} no une sus extremos")
+        costes.append(mapa.coste(camino))
+    return costes
+
+
+def comparar_costes(garantia, costes, referencia, con_peligro):
+    """ Mayor diferencia de coste con astar y si se cumple la garantía del motor (None si no la hay)."""
+    diferencia, cumple = 0.0, True
+    for coste, coste_ref in zip(costes, referencia):
+        if (coste is None) != (coste_ref is None):
+            # Todos los motores son completos: o ambos encuentran camino o ninguno
+            cumple = False
+            continue
+        if coste is None:
+            continue
+        diferencia = max(diferencia, abs(coste - coste_ref))
+        margen = TOLERANCIA * max(1.0, coste_ref)
+        if garantia == 'igual' or (garantia == 'optimo' and not con_peligro):
+            cumple &= abs(coste - coste_ref) <= margen
+        elif garantia == 'optimo':
+            cumple &= coste <= coste_ref + margen
+    return diferencia, (None if garantia == 'aproximado' else cumple)
+
+
+def medir(consultar, pares, repeticiones):
+    """ Caminos, mejor tiempo total de las consultas y nodos expandidos (si el motor los cuenta)."""
+    mejor = math.inf
+    for _ in range(repeticiones):
+        caminos, expandidos = [], 0
+        t0 = time.perf_counter()
+        for inicio, final in pares:
+            estadisticas = {}
+            caminos.append(consultar(inicio, final, estadisticas))
+            expandidos += estadisticas.get('expandidos', 0)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return caminos, mejor, expandidos
+
+
+def entorno():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'plataforma': platform.platform(),
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def ejecutar(args):
+    resultados = []
+    print(f"{'mapa':>10} {'tamaño':>7} {'P':>5} {'motor':>14} {'prep. (s)':>10} {'ms/consulta':>12} "
+          f"{'expandidos':>11} {'sin camino':>11} {'dif. coste':>11} {'garantía':>9}")
+    for tamano in args.tamanos:
+        for tipo in args.tipos:
+            for peligro in args.peligro:
+                t0 = time.perf_counter()
+                codigos = generar_codigos(tipo, tamano, tamano, peligro, args.semilla)
+                mapa = Mapa(codigos, {})
+                generacion = time.perf_counter() - t0
+                pares = consultas_fijas(codigos, args.consultas, args.semilla, args.alcance)
+                con_peligro = not mapa.admite_jps
+                referencia = None
+
+                # astar va siempre primero: es la referencia de los costes
+                for motor in ['astar'] + [m for m in args.motores if m != 'astar']:
+                    t0 = time.perf_counter()
+                    consultar = preparar(motor, mapa, args)
+                    if consultar is None:
+                        continue
+                    consultar(pares[0][0], pares[0][0], {})  # Reserva los buffers fuera de la medida
+                    preproceso = time.perf_counter() - t0
+
+                    caminos, segundos, expandidos = medir(consultar, pares, args.repeticiones)
+                    costes = costes_camino(mapa, pares, caminos)
+                    if referencia is None:
+                        referencia = costes
+                    diferencia, cumple = comparar_costes(GARANTIAS[motor], costes, referencia, con_peligro)
+                    if motor not in args.motores:
+                        continue
+
+                    resultado = {
+                        'mapa': tipo, 'tamano': tamano, 'peligro': peligro, 'semilla': args.semilla,
+                        'huella': mapa.huella(), 'generacion_s': generacion, 'motor': motor,
+                        'consultas': len(pares), 'alcance': args.alcance, 'preproceso_s': preproceso,
+                        'tiempo_s': segundos, 'ms_por_consulta': 1000 * segundos / len(pares), 'expandidos': expandidos,
+                        'sin_camino': costes.count(None), 'coste_total': sum(c for c in costes if c is not None),
+                        'garantia': GARANTIAS[motor], 'diferencia_coste': diferencia, 'cumple': cumple,
+                    }
+                    resultados.append(resultado)
+                    print(f"{tipo:>10} {tamano:>7} {peligro:>5} {motor:>14} {preproceso:>10.3f} "
+                          f"{resultado['ms_por_consulta']:>12.2f} {expandidos:>11} {resultado['sin_camino']:>11} "
+                          f"{diferencia:>11.3g} {'-' if cumple is None else 'sí' if cumple else 'NO':>9}")
+    return resultados
+
+
+def clave(resultado):
+    """ Mismo mapa, mismas consultas y mismo motor."""
+    campos = ('mapa', 'tamano', 'peligro', 'semilla', 'consultas', 'alcance', 'motor')
+    return tuple(resultado[campo] for campo in campos)
+
+
+def comparar(anteriores, resultados, umbral):
+    """ Compara con una ejecución anterior; devuelve cuántas regresiones hay."""
+    previos = {clave(r): r for r in anteriores}
+    regresiones = 0
+    print(f"\n{'mapa':>10} {'tamaño':>7} {'P':>5} {'motor':>14} {'antes (ms)':>11} {'ahora (ms)':>11} {'razón':>7}")
+    for resultado in resultados:
+        previo = previos.get(clave(resultado))
+        if previo is None:
+            continue
+        razon = resultado['ms_por_consulta'] / previo['ms_por_consulta']
+        avisos = []
+        if razon > 1 + umbral:
+            avisos.append('más lento')
+        if previo['huella'] != resultado['huella']:
+            avisos.append('el mapa generado ha cambiado')
+        elif not math.isclose(previo['coste_total'], resultado['coste_total'], rel_tol=TOLERANCIA):
+            avisos.append('coste distinto')
+        if previo['cumple'] and not resultado['cumple']:
+            avisos.append('ya no cumple su garantía')
+        regresiones += bool(avisos)
+        print(f"{resultado['mapa']:>10} {resultado['tamano']:>7} {resultado['peligro']:>5} {resultado['motor']:>14} "
+              f"{previo['ms_por_consulta']:>11.2f} {resultado['ms_por_consulta']:>11.2f} {razon:>7.2f}"
+              f"  {', '.join(avisos)}")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Batería reproducible de mapas generados: tiempo de cada motor y equivalencia con astar.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100, 300, 1000],
+                        help="lado de los mapas (hasta 10000; A* reserva unos 16 bytes por celda)")
+    parser.add_argument("--tipos", nargs="+", default=list(GENERADORES), choices=list(GENERADORES))
+    parser.add_argument("--peligro", type=float, nargs="+", default=[0.0, 0.1],
+                        help="fracción de las celdas libres en regiones 'P'")
+    parser.add_argument("--motores", nargs="+", default=['astar', 'jps', 'bidireccional'], choices=MOTORES,
+                        help="hitos y jerarquico preprocesan el mapa entero: lentos en mapas grandes")
+    parser.add_argument("--consultas", type=int, default=20)
+    parser.add_argument("--alcance", type=int, default=250,
+                        help="distancia máxima en filas y columnas entre inicio y final de una consulta")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--hitos", type=int, default=8)
+    parser.add_argument("--bloque", type=int, default=32, help="tamaño de bloque del motor jerarquico")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="fichero JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="fichero JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--umbral", type=float, default=0.1,
+                        help="aumento relativo del tiempo por consulta que se considera regresión")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args)
+    if args.salida:
+        with open(args.salida, 'w') as fichero:
+            json.dump({'entorno': entorno(), 'parametros': vars(args), 'resultados': resultados}, fichero, indent=1)
+
+    fallos = sum(r['cumple'] is False for r in resultados)
+    if fallos:
+        print(f"\n{fallos} motores no dan el coste que garantizan", file=sys.stderr)
+    if args.comparar:
+        with open(args.comparar) as fichero:
+            regresiones = comparar(json.load(fichero)['resultados'], resultados, args.umbral)
+        print(f"\n{regresiones} regresiones frente a {args.comparar}")
+    sys.exit(1 if fallos else 0)
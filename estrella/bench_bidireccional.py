@@ -0,0 +1,38 @@
+import argparse
+import math
+import time
+
+from generador import generar_aleatorio, generar_laberinto
+from mapa import Mapa
+
+
+def escenarios(tamanos, semilla):
+    for tamano in tamanos:
+        yield 'aleatorio', tamano, generar_aleatorio(tamano, tamano, 0.3, peligro=0, semilla=semilla)
+        yield 'laberinto', tamano, generar_laberinto(tamano, tamano, semilla)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nodos expandidos de A* frente a A* bidireccional.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[201, 501, 1001])
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mapa':>10} {'tamaño':>7} {'modo':>14} {'tiempo (s)':>11} {'expandidos':>11} {'coste':>12}")
+    for nombre, tamano, matriz in escenarios(args.tamanos, args.semilla):
+        mapa = Mapa.desde_matriz(matriz, {})
+        inicio, final = (0, 0), (tamano - 1, tamano - 1)
+
+        costes = []
+        for modo in ('astar', 'bidireccional'):
+            estadisticas = {}
+            t0 = time.perf_counter()
+            camino = mapa.astar(inicio, final, modo, estadisticas)
+            segundos = time.perf_counter() - t0
+            costes.append(mapa.coste(camino) if camino else None)
+            print(f"{nombre:>10} {tamano:>7} {modo:>14} {segundos:>11.3f} {estadisticas['expandidos']:>11} "
+                  f"{costes[-1] if camino else '-':>12}")
+
+        # Sin celdas 'P' la heurística de astar es admisible y los dos costes deben coincidir
+        if (costes[0] is None) != (costes[1] is None) or (costes[0] and not math.isclose(*costes, rel_tol=1e-12)):
+            raise AssertionError(f"Los costes difieren: {costes}")
@@ -0,0 +1,37 @@
+import argparse
+import time
+
+from bench_hitos import consultas
+from generador import generar_aleatorio, generar_laberinto
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Muchos agentes hacia un mismo objetivo: A* por agente frente a un campo de costes.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[151, 301])
+    parser.add_argument("--agentes", type=int, default=50)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    for tamano in args.tamanos:
+        for nombre, matriz in (('aleatorio', generar_aleatorio(tamano, tamano, 0.3, 0.05, args.semilla)),
+                               ('laberinto', generar_laberinto(tamano, tamano, args.semilla))):
+            mapa = Mapa.desde_matriz(matriz, {})
+            objetivo = (0, 0)
+            agentes = [inicio for inicio, _ in consultas(mapa, args.agentes, args.semilla)]
+
+            t0 = time.perf_counter()
+            caminos_astar = [mapa.astar(inicio, objetivo, modo='bidireccional') for inicio in agentes]
+            t_astar = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            campo = mapa.campo(objetivo)
+            t_campo = time.perf_counter() - t0
+            caminos_campo = [campo.camino(inicio) for inicio in agentes]
+            t_bajada = time.perf_counter() - t0 - t_campo
+
+            iguales = all((a is None) == (b is None) and (a is None or abs(mapa.coste(a) - mapa.coste(b)) < 1e-9)
+                          for a, b in zip(caminos_astar, caminos_campo))
+            print(f"{nombre} {tamano}x{tamano}, {len(agentes)} agentes: A* por agente {t_astar:.2f} s, "
+                  f"campo {t_campo:.2f} s + bajada {t_bajada:.3f} s "
+                  f"({t_astar / (t_campo + t_bajada):.1f}x), mismo coste: {'sí' if iguales else 'NO'}")
@@ -0,0 +1,59 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from dibujo import codigos_matriz, guardar_png, imagen
+from generador import generar_aleatorio
+
+
+def imagen_bucle(matriz, camino, puntos):
+    """ Referencia: el relleno celda a celda de mostrar_matriz antes de vectorizarlo."""
+    filas, columnas = len(matriz), len(matriz[0])
+    resultado = np.zeros((filas, columnas, 3))
+    colores = {0: (1, 1, 1), -1: (0, 0, 0), 0.5: (1, 1, 0), 1: (0, 1, 0), 2: (0, 1, 0), 3: (0, 1, 0),
+               4: (0, 1, 0), 5: (0, 1, 0), 6: (1, 0, 0)}
+    for i in range(filas):
+        for j in range(columnas):
+            resultado[i, j] = colores.get(matriz[i][j], (1, 1, 1))
+    for nodo in camino:
+        if nodo not in puntos.values():
+            resultado[nodo[0], nodo[1]] = (0, 0, 1)
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dibujo del mapa: bucle por celda frente a paleta vectorizada y PNG directo.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 1000, 2000])
+    parser.add_argument("--escala", type=int, default=4)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    for tamano in args.tamanos:
+        matriz = generar_aleatorio(tamano, tamano, 0.25, 0.05, args.semilla)
+        puntos = {1: (0, 0), 6: (tamano - 1, tamano - 1)}
+        camino = [(k, k) for k in range(tamano)]
+        codigos = codigos_matriz(matriz)
+
+        t0 = time.perf_counter()
+        referencia = imagen_bucle(matriz, camino, puntos)
+        t_bucle = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        vectorizada = imagen(codigos, camino, puntos.values())
+        t_vector = time.perf_counter() - t0
+        iguales = np.array_equal((referencia * 255).astype(np.uint8), vectorizada)
+
+        nombre = os.path.join(directorio, f"mapa_{tamano}.png")
+        t0 = time.perf_counter()
+        guardar_png(nombre, codigos, camino)
+        t_png = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        guardar_png(nombre, codigos, camino, escala=args.escala)
+        t_reducido = time.perf_counter() - t0
+
+        print(f"{tamano}x{tamano}: bucle {t_bucle * 1000:8.1f} ms, paleta {t_vector * 1000:6.1f} ms "
+              f"({t_bucle / t_vector:.0f}x, {'misma imagen' if iguales else 'IMAGEN DISTINTA'}); "
+              f"PNG {t_png * 1000:.1f} ms, PNG 1/{args.escala} {t_reducido * 1000:.1f} ms")
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from dstar import DStarLite
+from generador import generar_aleatorio
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replanificación tras pequeños cambios: D* Lite frente a buscar de cero.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[201, 401])
+    parser.add_argument("--cambios", type=int, default=20)
+    parser.add_argument("--celdas", type=int, default=1, help="celdas modificadas en cada cambio")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    for tamano in args.tamanos:
+        azar = random.Random(args.semilla)
+        matriz = generar_aleatorio(tamano, tamano, 0.25, 0.0, args.semilla)
+        mapa, copia = Mapa.desde_matriz(matriz, {}), Mapa.desde_matriz(matriz, {})
+        inicio, final = (0, 0), (tamano - 1, tamano - 1)
+
+        t0 = time.perf_counter()
+        planificador = DStarLite(mapa, inicio, final)
+        camino = planificador.camino()
+        t_inicial = time.perf_counter() - t0
+
+        t_incremental = t_cero = 0.0
+        expandidos = iguales = 0
+        for _ in range(args.cambios):
+            # Se bloquean celdas del camino actual, lo que obliga a replanificar
+            for _ in range(args.celdas):
+                if camino and len(camino) > 2:
+                    i, j = azar.choice(camino[1:-1])
+                else:
+                    i, j = azar.randrange(tamano), azar.randrange(tamano)
+                planificador.update_cell(i, j, 'X')
+                copia.modificar_celda(i, j, 'X')
+
+            t0 = time.perf_counter()
+            camino = planificador.camino()
+            t_incremental += time.perf_counter() - t0
+            expandidos += planificador.expandidos
+
+            t0 = time.perf_counter()
+            referencia = copia.astar(inicio, final, modo='astar')
+            t_cero += time.perf_counter() - t0
+            iguales += (camino is None) == (referencia is None) and (
+                camino is None or abs(mapa.coste(camino) - copia.coste(referencia)) < 1e-9)
+
+        print(f"{tamano}x{tamano}: plan inicial {t_inicial:.2f} s; por cambio de {args.celdas} celda(s): "
+              f"D* Lite {t_incremental / args.cambios * 1000:.1f} ms ({expandidos // args.cambios} expandidos), "
+              f"A* de cero {t_cero / args.cambios * 1000:.1f} ms "
+              f"({t_cero / t_incremental:.1f}x); mismo coste en {iguales}/{args.cambios}")
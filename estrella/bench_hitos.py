@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+
+from generador import generar_aleatorio, generar_laberinto
+from hitos import Hitos
+from mapa import Mapa
+
+
+def consultas(mapa, n, semilla):
+    """ n pares (inicio, final) de celdas libres elegidas al azar."""
+    azar = random.Random(semilla)
+    libres = [divmod(int(k), mapa.columnas) for k in (mapa.codigos.ravel() >= 0).nonzero()[0]]
+    return [(azar.choice(libres), azar.choice(libres)) for _ in range(n)]
+
+
+def medir(mapa, pares, **opciones):
+    segundos, expandidos, coste = 0.0, 0, 0.0
+    for inicio, final in pares:
+        estadisticas = {}
+        t0 = time.perf_counter()
+        camino = mapa.astar(inicio, final, estadisticas=estadisticas, **opciones)
+        segundos += time.perf_counter() - t0
+        expandidos += estadisticas['expandidos']
+        coste += mapa.coste(camino) if camino else 0.0
+    return segundos, expandidos, coste
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preproceso y aceleración por consulta de la heurística ALT.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[151, 301])
+    parser.add_argument("--hitos", type=int, default=8)
+    parser.add_argument("--consultas", type=int, default=20)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    for tamano in args.tamanos:
+        for nombre, matriz in (('aleatorio', generar_aleatorio(tamano, tamano, 0.35, 0.1, args.semilla)),
+                               ('laberinto', generar_laberinto(tamano, tamano, args.semilla))):
+            mapa = Mapa.desde_matriz(matriz, {})
+            t0 = time.perf_counter()
+            hitos = Hitos.calcular(mapa, args.hitos, args.semilla)
+            preproceso = time.perf_counter() - t0
+
+            pares = consultas(mapa, args.consultas, args.semilla)
+            t_euclidea, e_euclidea, c_euclidea = medir(mapa, pares, modo='astar')
+            # Referencia admisible: sin hitos la heurística es la euclídea por el coste mínimo
+            t_admisible, e_admisible, c_admisible = medir(mapa, pares, hitos=Hitos([], [], []))
+            t_alt, e_alt, c_alt = medir(mapa, pares, hitos=hitos)
+
+            print(f"{nombre} {tamano}x{tamano}: {len(hitos.indices)} hitos en {preproceso:.2f} s, "
+                  f"{hitos.bytes / 2**20:.1f} MB")
+            print(f"  euclídea: {t_euclidea / len(pares) * 1000:8.2f} ms/consulta, {e_euclidea:>9} expandidos, "
+                  f"coste total {c_euclidea:.2f}")
+            print(f"  admisible:{t_admisible / len(pares) * 1000:8.2f} ms/consulta, {e_admisible:>9} expandidos, "
+                  f"coste total {c_admisible:.2f}")
+            print(f"  ALT:      {t_alt / len(pares) * 1000:8.2f} ms/consulta, {e_alt:>9} expandidos, "
+                  f"coste total {c_alt:.2f}  ({t_admisible / t_alt:.1f}x frente a la admisible)")
@@ -0,0 +1,46 @@
+import argparse
+import time
+
+from bench_hitos import consultas
+from generador import generar_aleatorio
+from mapa import Mapa
+
+
+def medir(mapa, pares, repeticiones, estadisticas=False, observador=None, memoria=False):
+    """ Mejor tiempo de repeticiones pasadas por las consultas con A* y la instrumentación pedida."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for inicio, final in pares:
+            mapa.astar(inicio, final, 'astar', {} if estadisticas or memoria else None, observador=observador,
+                       memoria=memoria)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coste de la instrumentación de A* y contadores de una consulta.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 500])
+    parser.add_argument("--peligro", type=float, default=0.1)
+    parser.add_argument("--consultas", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tamaño':>8} {'modo':>14} {'tiempo (s)':>11} {'sobrecoste':>11}")
+    for tamano in args.tamanos:
+        mapa = Mapa.desde_matriz(generar_aleatorio(tamano, tamano, peligro=args.peligro, semilla=args.semilla), {})
+        pares = consultas(mapa, args.consultas, args.semilla)
+        frontera = []
+        base = medir(mapa, pares, args.repeticiones)
+        for nombre, opciones in (('apagada', {}),
+                                 ('estadisticas', {'estadisticas': True}),
+                                 ('observador', {'observador': lambda celda, g, abierta: frontera.append(abierta)}),
+                                 ('memoria', {'memoria': True})):
+            segundos = base if nombre == 'apagada' else medir(mapa, pares, args.repeticiones, **opciones)
+            print(f"{tamano:>8} {nombre:>14} {segundos:>11.3f} {100 * (segundos / base - 1):>10.1f}%")
+
+        estadisticas = {}
+        mapa.astar((0, 0), (tamano - 1, tamano - 1), 'astar', estadisticas, memoria=True)
+        print("  esquina a esquina:", ", ".join(f"{clave}={valor:.4g}" if isinstance(valor, float) else f"{clave}={valor}"
+                                               for clave, valor in sorted(estadisticas.items())))
@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+
+from bench_hitos import consultas
+from generador import generar_aleatorio
+from jerarquico import Jerarquia
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HPA*: preproceso, consultas y reparación frente a A* plano.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[301, 601])
+    parser.add_argument("--bloque", type=int, default=32)
+    parser.add_argument("--consultas", type=int, default=10)
+    parser.add_argument("--cambios", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    for tamano in args.tamanos:
+        mapa = Mapa.desde_matriz(generar_aleatorio(tamano, tamano, 0.25, 0.05, args.semilla), {})
+        t0 = time.perf_counter()
+        jerarquia = Jerarquia(mapa, args.bloque)
+        preproceso = time.perf_counter() - t0
+
+        pares = consultas(mapa, args.consultas, args.semilla)
+        t_plano = t_jerarquico = coste_plano = coste_jerarquico = 0.0
+        for inicio, final in pares:
+            t0 = time.perf_counter()
+            plano = mapa.astar(inicio, final, modo='bidireccional')
+            t1 = time.perf_counter()
+            jerarquico = jerarquia.camino(inicio, final)
+            t2 = time.perf_counter()
+            t_plano += t1 - t0
+            t_jerarquico += t2 - t1
+            if plano:
+                coste_plano += mapa.coste(plano)
+                coste_jerarquico += mapa.coste(jerarquico)
+
+        azar = random.Random(args.semilla)
+        t_reparar = recalculados = 0
+        for _ in range(args.cambios):
+            jerarquia.modificar_celda(azar.randrange(tamano), azar.randrange(tamano), azar.choice('OXP'))
+            t0 = time.perf_counter()
+            jerarquia._reparar()
+            t_reparar += time.perf_counter() - t0
+            recalculados += jerarquia.bloques_recalculados
+
+        print(f"{tamano}x{tamano}, bloques de {args.bloque}: preproceso {preproceso:.2f} s; "
+              f"consulta plana {t_plano / len(pares) * 1000:.1f} ms, jerárquica {t_jerarquico / len(pares) * 1000:.1f} ms "
+              f"({t_plano / t_jerarquico:.1f}x), coste {coste_jerarquico / coste_plano:.3f} del óptimo; "
+              f"reparar un cambio {t_reparar / args.cambios * 1000:.1f} ms ({recalculados / args.cambios:.1f} bloques)")
@@ -0,0 +1,34 @@
+import argparse
+import math
+import time
+
+from generador import generar_aleatorio
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nodos expandidos e inserciones de A* frente a JPS en mapas sin 'P'.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.02, 0.1, 0.25])
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tamaño':>8} {'densidad':>9} {'modo':>6} {'tiempo (s)':>11} {'expandidos':>11} {'insertados':>11} {'coste':>12}")
+    for tamano in args.tamanos:
+        for densidad in args.densidades:
+            mapa = Mapa.desde_matriz(generar_aleatorio(tamano, tamano, densidad, peligro=0, semilla=args.semilla), {})
+            inicio, final = (0, 0), (tamano - 1, tamano - 1)
+            mapa.astar(inicio, inicio, 'jps')  # La rejilla de JPS se prepara fuera de la medida
+
+            costes = []
+            for modo in ('astar', 'jps'):
+                estadisticas = {}
+                t0 = time.perf_counter()
+                camino = mapa.astar(inicio, final, modo, estadisticas)
+                segundos = time.perf_counter() - t0
+                costes.append(mapa.coste(camino) if camino else None)
+                print(f"{tamano:>8} {densidad:>9.2f} {modo:>6} {segundos:>11.3f} {estadisticas['expandidos']:>11} "
+                      f"{estadisticas['insertados']:>11} {costes[-1] if camino else '-':>12}")
+
+            if (costes[0] is None) != (costes[1] is None) or (costes[0] and not math.isclose(*costes, rel_tol=1e-12)):
+                raise AssertionError(f"Los costes de A* y JPS difieren: {costes}")
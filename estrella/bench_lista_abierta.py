@@ -0,0 +1,26 @@
+import argparse
+import time
+
+from generador import generar_aleatorio
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tráfico de la lista abierta de A* en mapas generados.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--peligro", type=float, default=0.1)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    # Cada entrada descartada es un nodo que la versión anterior de astar() volvía a expandir
+    print(f"{'tamaño':>8} {'tiempo (s)':>11} {'insertados':>11} {'extraidos':>10} {'descartados':>12} {'% evitado':>10}")
+    for tamano in args.tamanos:
+        mapa = Mapa.desde_matriz(generar_aleatorio(tamano, tamano, peligro=args.peligro, semilla=args.semilla), {})
+        estadisticas = {}
+        t0 = time.perf_counter()
+        mapa.astar((0, 0), (tamano - 1, tamano - 1), 'astar', estadisticas)
+        segundos = time.perf_counter() - t0
+
+        extracciones = estadisticas['extraidos'] + estadisticas['descartados']
+        print(f"{tamano:>8} {segundos:>11.3f} {estadisticas['insertados']:>11} {estadisticas['extraidos']:>10} "
+              f"{estadisticas['descartados']:>12} {100 * estadisticas['descartados'] / extracciones:>9.1f}%")
@@ -0,0 +1,48 @@
+import argparse
+import time
+
+from aestrella3 import astar
+from generador import colocar_puntos, generar_aleatorio
+from mapa import Mapa
+
+
+def recorrer(buscar_tramo, puntos):
+    """ Bucle de tramos de aestrella3.py: une los caminos 1→2, 2→3, ... con la función dada."""
+    puntos_ordenados = sorted(puntos.items())
+    camino_total = []
+    for i in range(len(puntos_ordenados) - 1):
+        camino = buscar_tramo(puntos_ordenados[i][1], puntos_ordenados[i + 1][1])
+        if not camino:
+            return None
+        camino_total.extend(camino[:-1])
+    camino_total.append(puntos_ordenados[-1][1])
+    return camino_total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rutas de 6 puntos: astar() frente a Mapa compilado.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--puntos", type=int, default=6)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tamaño':>8} {'astar (s)':>10} {'compilar (s)':>13} {'Mapa (s)':>9} {'aceleración':>12}")
+    for tamano in args.tamanos:
+        matriz = generar_aleatorio(tamano, tamano, semilla=args.semilla)
+        puntos = colocar_puntos(matriz, args.puntos, semilla=args.semilla)
+
+        t0 = time.perf_counter()
+        referencia = recorrer(lambda a, b: astar(matriz, a, b), puntos)
+        t_astar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        mapa = Mapa.desde_matriz(matriz, puntos)
+        t_compilar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        camino = recorrer(mapa.astar, puntos)
+        t_mapa = time.perf_counter() - t0
+
+        if camino != referencia:
+            raise AssertionError(f"Las rutas difieren en la matriz de {tamano}x{tamano}")
+        print(f"{tamano:>8} {t_astar:>10.3f} {t_compilar:>13.3f} {t_mapa:>9.3f} {t_astar / t_mapa:>11.1f}x")
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+from generador import consultas_fijas, generar_codigos
+from mapa import Mapa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A* ponderado y ARA*: tiempo, coste frente al óptimo y cota.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[300, 600])
+    parser.add_argument("--tipos", nargs="+", default=['aleatorio', 'salas'])
+    parser.add_argument("--peligro", type=float, default=0.1)
+    parser.add_argument("--epsilons", type=float, nargs="+", default=[0.1, 0.5, 1.0, 2.0])
+    parser.add_argument("--plazo", type=float, default=0.2, help="segundos que ARA* tiene para mejorar")
+    parser.add_argument("--consultas", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mapa':>10} {'tamaño':>7} {'búsqueda':>18} {'ms/consulta':>12} {'expandidos':>11} "
+          f"{'coste/óptimo':>13} {'cota máx.':>10}")
+    for tamano in args.tamanos:
+        for tipo in args.tipos:
+            mapa = Mapa(generar_codigos(tipo, tamano, tamano, args.peligro, args.semilla), {})
+            pares = [par for par in consultas_fijas(mapa.codigos, args.consultas, args.semilla)
+                     if mapa.astar(*par, 'bidireccional') is not None]
+
+            def fila(nombre, buscar):
+                segundos, expandidos, razon, cota = 0.0, 0, 0.0, 0.0
+                for (inicio, final), optimo in zip(pares, optimos):
+                    estadisticas = {}
+                    t0 = time.perf_counter()
+                    coste, cota_consulta = buscar(inicio, final, estadisticas)
+                    segundos += time.perf_counter() - t0
+                    expandidos += estadisticas.get('expandidos', 0)
+                    razon = max(razon, coste / optimo if optimo else 1.0)
+                    cota = None if cota_consulta is None else max(cota, cota_consulta)
+                print(f"{tipo:>10} {tamano:>7} {nombre:>18} {1000 * segundos / len(pares):>12.2f} {expandidos:>11} "
+                      f"{razon:>13.4f} {'-' if cota is None else f'{cota:.3f}':>10}")
+
+            # El coste óptimo de referencia es el de la búsqueda bidireccional
+            optimos = [mapa.coste(mapa.astar(inicio, final, 'bidireccional')) for inicio, final in pares]
+            fila('astar', lambda i, f, e: (mapa.coste(mapa.astar(i, f, 'astar', e)), None))
+            fila('bidireccional', lambda i, f, e: (mapa.coste(mapa.astar(i, f, 'bidireccional', e)), 1.0))
+            for epsilon in args.epsilons:
+                fila(f"epsilon={epsilon}",
+                     lambda i, f, e: (mapa.coste(mapa.astar(i, f, estadisticas=e, epsilon=epsilon)), e['cota']))
+
+            # ARA*: primera solución y la mejor conseguida dentro del plazo
+            def primera(inicio, final, estadisticas):
+                _, coste, cota = next(mapa.astar_anytime(inicio, final, epsilon=max(args.epsilons)))
+                return coste, cota
+
+            def con_plazo(inicio, final, estadisticas):
+                *_, (_, coste, cota) = mapa.astar_anytime(inicio, final, args.plazo, max(args.epsilons))
+                return coste, cota
+
+            fila("ARA* primera", primera)
+            fila(f"ARA* {args.plazo} s", con_plazo)
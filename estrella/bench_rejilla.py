@@ -0,0 +1,42 @@
+import argparse
+import time
+import tracemalloc
+
+from aestrella3 import astar
+from generador import generar_aleatorio
+from rejilla import astar_rejilla
+
+
+def medir(funcion, matriz, inicio, final):
+    """ Devuelve (camino, segundos, pico de memoria en bytes) de una búsqueda."""
+    t0 = time.perf_counter()
+    camino = funcion(matriz, inicio, final)
+    segundos = time.perf_counter() - t0
+
+    # La memoria se mide en una segunda ejecución para no contaminar el tiempo con tracemalloc
+    tracemalloc.start()
+    funcion(matriz, inicio, final)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return camino, segundos, pico
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara astar() con el motor de buffers planos.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--densidad", type=float, default=0.25)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tamaño':>8} {'motor':>8} {'tiempo (s)':>11} {'pico (MB)':>10}")
+    for tamano in args.tamanos:
+        matriz = generar_aleatorio(tamano, tamano, args.densidad, semilla=args.semilla)
+        inicio, final = (0, 0), (tamano - 1, tamano - 1)
+
+        referencia, t_dict, m_dict = medir(astar, matriz, inicio, final)
+        camino, t_plano, m_plano = medir(astar_rejilla, matriz, inicio, final)
+        if camino != referencia:
+            raise AssertionError(f"Los caminos difieren en la matriz de {tamano}x{tamano}")
+
+        print(f"{tamano:>8} {'dict':>8} {t_dict:>11.3f} {m_dict / 2**20:>10.1f}")
+        print(f"{tamano:>8} {'plano':>8} {t_plano:>11.3f} {m_plano / 2**20:>10.1f}")
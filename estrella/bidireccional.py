@@ -0,0 +1,117 @@
+import heapq
+import math
+
+from rejilla import INFINITO, vecindad
+
+
+def buscar_bidireccional(celdas, tabla, filas, columnas, inicio, final, espacios, coste_minimo,
+                         estadisticas=None):
+    """ A* bidireccional: una búsqueda desde inicio y otra hacia atrás desde final.
+
+    La heurística es la distancia euclídea por coste_minimo (el menor multiplicador del
+    mapa), que es consistente en los dos sentidos. Se para cuando la cima de cualquiera
+    de las dos listas abiertas no mejora el mejor camino conocido mu, así que el coste es
+    óptimo. Siempre se expande el lado con la lista abierta más pequeña.
+    """
+    ida, vuelta = espacios
+    g_ida, padres_ida, visita_ida = ida.g_coste, ida.padres, ida.visita
+    g_vuelta, padres_vuelta, visita_vuelta = vuelta.g_coste, vuelta.padres, vuelta.visita
+    abierto_ida = ida.nuevo_sello()
+    abierto_vuelta = vuelta.nuevo_sello()
+    cerrado_ida, cerrado_vuelta = abierto_ida + 1, abierto_vuelta + 1
+
+    si, sj = inicio
+    fi, fj = final
+    origen, destino = si * columnas + sj, fi * columnas + fj
+    sqrt = math.sqrt
+    heappush, heappop = heapq.heappush, heapq.heappop
+    movimientos = vecindad(columnas)
+
+    h_inicial = coste_minimo * sqrt((si - fi)**2 + (sj - fj)**2)
+    g_ida[origen], padres_ida[origen], visita_ida[origen] = 0, -1, abierto_ida
+    g_vuelta[destino], padres_vuelta[destino], visita_vuelta[destino] = 0, -1, abierto_vuelta
+    lista_ida = [(h_inicial, origen)]
+    lista_vuelta = [(h_inicial, destino)]
+
+    mu, encuentro = (0, origen) if origen == destino else (INFINITO, -1)
+    expandidos_ida = expandidos_vuelta = insertados = 0
+
+    while lista_ida and lista_vuelta:
+        if lista_ida[0][0] >= mu or lista_vuelta[0][0] >= mu:
+            break
+
+        if len(lista_ida) <= len(lista_vuelta):
+            # Hacia delante: entrar en el vecino cuesta su propio riesgo
+            _, actual = heappop(lista_ida)
+            if visita_ida[actual] == cerrado_ida:
+                continue
+            visita_ida[actual] = cerrado_ida
+            expandidos_ida += 1
+            i, j = divmod(actual, columnas)
+            g_actual = g_ida[actual]
+
+            for di, dj, desplazamiento, paso in movimientos:
+                vi, vj = i + di, j + dj
+                if 0 <= vi < filas and 0 <= vj < columnas:
+                    vecino = actual + desplazamiento
+                    riesgo = tabla[celdas[vecino]]
+                    estado = visita_ida[vecino]
+                    if estado == cerrado_ida or riesgo < 0:
+                        continue
+
+                    g_nuevo = g_actual + paso * riesgo
+                    if estado != abierto_ida or g_nuevo < g_ida[vecino]:
+                        g_ida[vecino], padres_ida[vecino], visita_ida[vecino] = g_nuevo, actual, abierto_ida
+                        heappush(lista_ida, (g_nuevo + coste_minimo * sqrt((vi - fi)**2 + (vj - fj)**2), vecino))
+                        insertados += 1
+                        if visita_vuelta[vecino] in (abierto_vuelta, cerrado_vuelta) and g_nuevo + g_vuelta[vecino] < mu:
+                            mu, encuentro = g_nuevo + g_vuelta[vecino], vecino
+        else:
+            # Hacia atrás: llegar desde el vecino cuesta el riesgo de la celda actual
+            _, actual = heappop(lista_vuelta)
+            if visita_vuelta[actual] == cerrado_vuelta:
+                continue
+            visita_vuelta[actual] = cerrado_vuelta
+            expandidos_vuelta += 1
+            i, j = divmod(actual, columnas)
+            g_actual = g_vuelta[actual]
+            riesgo = tabla[celdas[actual]]
+
+            for di, dj, desplazamiento, paso in movimientos:
+                vi, vj = i + di, j + dj
+                if 0 <= vi < filas and 0 <= vj < columnas:
+                    vecino = actual + desplazamiento
+                    estado = visita_vuelta[vecino]
+                    if estado == cerrado_vuelta or tabla[celdas[vecino]] < 0:
+                        continue
+
+                    g_nuevo = g_actual + paso * riesgo
+                    if estado != abierto_vuelta or g_nuevo < g_vuelta[vecino]:
+                        g_vuelta[vecino], padres_vuelta[vecino], visita_vuelta[vecino] = g_nuevo, actual, abierto_vuelta
+                        heappush(lista_vuelta, (g_nuevo + coste_minimo * sqrt((vi - si)**2 + (vj - sj)**2), vecino))
+                        insertados += 1
+                        if visita_ida[vecino] in (abierto_ida, cerrado_ida) and g_ida[vecino] + g_nuevo < mu:
+                            mu, encuentro = g_ida[vecino] + g_nuevo, vecino
+
+    if estadisticas is not None:
+        estadisticas['expandidos'] = expandidos_ida + expandidos_vuelta
+        estadisticas['expandidos_ida'] = expandidos_ida
+        estadisticas['expandidos_vuelta'] = expandidos_vuelta
+        estadisticas['insertados'] = insertados
+        estadisticas['coste'] = mu
+
+    if encuentro < 0:
+        return None
+
+    # Mitad de ida hasta el encuentro y mitad de vuelta desde él hasta el final
+    camino = []
+    nodo = encuentro
+    while nodo != -1:
+        camino.append(divmod(nodo, columnas))
+        nodo = padres_ida[nodo]
+    camino.reverse()
+    nodo = padres_vuelta[encuentro]
+    while nodo != -1:
+        camino.append(divmod(nodo, columnas))
+        nodo = padres_vuelta[nodo]
+    return camino
@@ -0,0 +1,106 @@
+import os
+import struct
+import sys
+
+import numpy as np
+
+from mapa import COSTES, OBSTACULO, Mapa
+
+# Cabecera: magia, versión, filas, columnas, número de puntos, número de costes y
+# desplazamiento de las celdas. Detrás van los puntos, la tabla de costes y, alineadas
+# a 64 bytes, las celdas como int8 por filas.
+MAGIA = b'ESTB'
+VERSION = 1
+CABECERA = struct.Struct('<4sHxxIIHHQ')
+PUNTO = struct.Struct('<iII')  # número, fila, columna
+COSTE = struct.Struct('<bd')   # código, multiplicador
+ALINEACION = 64
+
+
+def es_binario(nombre_fichero):
+    with open(nombre_fichero, 'rb') as fichero:
+        return fichero.read(len(MAGIA)) == MAGIA
+
+
+def guardar_binario(mapa, nombre_fichero):
+    """ Escribe el mapa en formato binario para proyectarlo después con cargar_binario."""
+    tam_tablas = len(mapa.puntos) * PUNTO.size + len(mapa.costes) * COSTE.size
+    desplazamiento = -(-(CABECERA.size + tam_tablas) // ALINEACION) * ALINEACION
+
+    with open(nombre_fichero, 'wb') as fichero:
+        fichero.write(CABECERA.pack(MAGIA, VERSION, mapa.filas, mapa.columnas,
+                                    len(mapa.puntos), len(mapa.costes), desplazamiento))
+        for numero, (i, j) in sorted(mapa.puntos.items()):
+            fichero.write(PUNTO.pack(numero, i, j))
+        for codigo, coste in sorted(mapa.costes.items()):
+            fichero.write(COSTE.pack(codigo, coste))
+        fichero.write(bytes(desplazamiento - fichero.tell()))
+        mapa.codigos.tofile(fichero)
+
+
+def leer_cabecera(nombre_fichero):
+    """ Devuelve (filas, columnas, puntos, costes, desplazamiento) de un mapa binario."""
+    with open(nombre_fichero, 'rb') as fichero:
+        datos = fichero.read(CABECERA.size)
+        if len(datos) < CABECERA.size or datos[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"{nombre_fichero} no es un mapa binario")
+        _, version, filas, columnas, n_puntos, n_costes, desplazamiento = CABECERA.unpack(datos)
+        if version != VERSION:
+            raise ValueError(f"Versión de mapa binario no soportada: {version}")
+
+        puntos = {}
+        for _ in range(n_puntos):
+            numero, i, j = PUNTO.unpack(fichero.read(PUNTO.size))
+            puntos[numero] = (i, j)
+        costes = {}
+        for _ in range(n_costes):
+            codigo, coste = COSTE.unpack(fichero.read(COSTE.size))
+            costes[codigo] = coste
+
+        tamano = os.fstat(fichero.fileno()).st_size
+    if tamano != desplazamiento + filas * columnas:
+        raise ValueError(f"{nombre_fichero} está truncado o tiene un tamaño inesperado")
+    return filas, columnas, puntos, costes, desplazamiento
+
+
+def proyectar_codigos(nombre_fichero):
+    """ Proyecta en memoria, de solo lectura, el array de celdas de un mapa binario."""
+    filas, columnas, _, _, desplazamiento = leer_cabecera(nombre_fichero)
+    return np.memmap(nombre_fichero, dtype=np.int8, mode='r', offset=desplazamiento, shape=(filas, columnas))
+
+
+def cargar_binario(nombre_fichero, costes=None):
+    """ Mapa cuyas celdas se leen del fichero bajo demanda; los procesos que lo abren comparten las páginas.
+
+    Con costes se sustituye la tabla de costes guardada; ValueError si no da coste a algún
+    código de celda del fichero.
+    """
+    filas, columnas, puntos, costes_fichero, desplazamiento = leer_cabecera(nombre_fichero)
+    codigos = np.memmap(nombre_fichero, dtype=np.int8, mode='r', offset=desplazamiento, shape=(filas, columnas))
+    mapa = Mapa(codigos, puntos, costes_fichero if costes is None else costes,
+                fichero=os.path.abspath(nombre_fichero), validar=False)
+    if costes is not None:
+        # Otra tabla de costes puede no cubrir todas las celdas: sin coste serían obstáculos.
+        # Comprobarlo lee el fichero entero una vez
+        faltan = sorted(c for c in mapa.codigos_presentes() if c != OBSTACULO and c not in mapa.costes)
+        if faltan:
+            raise ValueError(f"Los códigos de celda {faltan} de {nombre_fichero} no tienen coste "
+                             "en la tabla de costes")
+    return mapa
+
+
+def convertir_texto(nombre_texto, nombre_binario=None, costes=None):
+    """ Convierte un mapa con el formato de matriz.txt al formato binario y devuelve su ruta."""
+    from cargador import cargar_codigos
+
+    if nombre_binario is None:
+        nombre_binario = os.path.splitext(nombre_texto)[0] + '.bin'
+    codigos, puntos = cargar_codigos(nombre_texto)
+    guardar_binario(Mapa(codigos, puntos, COSTES if costes is None else costes), nombre_binario)
+    return nombre_binario
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Uso: python binario.py mapa.txt [mapa.bin]")
+    print(convertir_texto(*sys.argv[1:]))
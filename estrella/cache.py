@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+# Marca de consulta sin resultado guardado; None es un resultado válido (tramo sin camino)
+AUSENTE = object()
+
+
+class CacheRutas:
+    """ Caché LRU de caminos delante de Mapa.astar.
+
+    La clave es (huella del mapa, inicio, final, modelo de coste), donde el modelo es el
+    modo de búsqueda, los hitos que se usan (sus celdas) y la tabla de costes. También se guardan los tramos
+    sin camino. Cuando un mapa cambia (modificar_celda) sus caminos antiguos se descartan
+    la siguiente vez que se consulta. Si el modelo es simétrico y la búsqueda exacta, el
+    tramo b → a se sirve invirtiendo el camino guardado de a → b.
+    """
+
+    def __init__(self, capacidad=1024):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.capacidad = capacidad
+        self._caminos = OrderedDict()
+        # Última huella vista de cada mapa, para invalidar sus caminos cuando cambia
+        self._huellas = WeakKeyDictionary()
+        self.aciertos = 0
+        self.invertidos = 0  # Aciertos servidos invirtiendo el tramo contrario
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._caminos)
+
+    def _huella(self, mapa):
+        huella = mapa.huella()
+        anterior = self._huellas.get(mapa)
+        if anterior is not None and anterior != huella:
+            self.invalidar(anterior)
+        self._huellas[mapa] = huella
+        return huella
+
+    @staticmethod
+    def _modelo(mapa, modo, hitos):
+        # Los hitos se identifican por sus celdas: dos juegos distintos no comparten entradas
+        clave_hitos = None if hitos is None else tuple(hitos.indices.tolist())
+        return modo, clave_hitos, tuple(sorted(mapa.costes.items()))
+
+    @staticmethod
+    def _reversible(mapa, modo, hitos):
+        # Con coste uniforme cualquier camino óptimo lo es también al revés; la heurística
+        # euclídea de astar/jps solo garantiza el óptimo si ese coste es >= 1
+        if not mapa.simetrico:
+            return False
+        return hitos is not None or modo == 'bidireccional' or mapa.coste_minimo >= 1
+
+    def buscar(self, mapa, inicio, final, modo='auto', hitos=None):
+        """ Camino guardado de inicio a final (una copia), None si no hay camino o AUSENTE."""
+        huella = self._huella(mapa)
+        modelo = self._modelo(mapa, modo, hitos)
+        inicio, final = tuple(inicio), tuple(final)
+
+        camino = self._caminos.get((huella, inicio, final, modelo), AUSENTE)
+        if camino is not AUSENTE:
+            self._caminos.move_to_end((huella, inicio, final, modelo))
+            self.aciertos += 1
+            return None if camino is None else list(camino)
+
+        if self._reversible(mapa, modo, hitos):
+            camino = self._caminos.get((huella, final, inicio, modelo), AUSENTE)
+            if camino is not AUSENTE:
+                self._caminos.move_to_end((huella, final, inicio, modelo))
+                self.aciertos += 1
+                self.invertidos += 1
+                return None if camino is None else list(reversed(camino))
+
+        self.fallos += 1
+        return AUSENTE
+
+    def guardar(self, mapa, inicio, final, camino, modo='auto', hitos=None):
+        clave = (self._huella(mapa), tuple(inicio), tuple(final), self._modelo(mapa, modo, hitos))
+        self._caminos[clave] = None if camino is None else tuple(camino)
+        self._caminos.move_to_end(clave)
+        while len(self._caminos) > self.capacidad:
+            self._caminos.popitem(last=False)
+            self.desalojos += 1
+
+    def camino(self, mapa, inicio, final, modo='auto', hitos=None):
+        """ Como mapa.astar(inicio, final, modo, hitos=hitos), pero sin repetir tramos ya resueltos."""
+        camino = self.buscar(mapa, inicio, final, modo, hitos)
+        if camino is AUSENTE:
+            camino = mapa.astar(inicio, final, modo, hitos=hitos)
+            self.guardar(mapa, inicio, final, camino, modo, hitos)
+        return camino
+
+    def invalidar(self, huella=None):
+        """ Descarta los caminos de un mapa (por su huella) o, sin huella, todos."""
+        if huella is None:
+            self._caminos.clear()
+            return
+        for clave in [clave for clave in self._caminos if clave[0] == huella]:
+            del self._caminos[clave]
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._caminos),
+            'aciertos': self.aciertos,
+            'invertidos': self.invertidos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
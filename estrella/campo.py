@@ -0,0 +1,139 @@
+import numpy as np
+
+from rejilla import vecindad
+
+# Número de celdas abiertas a partir del cual compensa relajar el frente con numpy
+FRENTE_VECTORIZADO = 256
+
+
+def calcular_campo(codigos, tabla, celda, hacia=True):
+    """ Coste mínimo de cada celda hasta celda (desde ella si hacia=False), como array filas x columnas.
+
+    Mismo modelo que astar: el paso (1 o raíz de 2) por el riesgo de la celda a la que se
+    entra; los obstáculos y las celdas inalcanzables quedan a infinito. Es un Dijkstra por
+    cubos de anchura igual al paso más barato del mapa: ninguna celda de un cubo puede
+    mejorar a otra del mismo cubo, así que todas se cierran y relajan a la vez con
+    operaciones vectorizadas cuando el frente es ancho.
+    """
+    filas, columnas = codigos.shape
+    pesos = np.asarray(tabla)[codigos].ravel()
+    transitables = pesos >= 0
+    origen = celda[0] * columnas + celda[1]
+    if not transitables[origen]:
+        raise ValueError(f"La celda {tuple(celda)} es un obstáculo")
+    anchura = pesos[transitables].min()
+    if anchura <= 0:
+        raise ValueError("El campo de costes necesita que todas las celdas transitables cuesten más de 0")
+
+    distancia = np.full(filas * columnas, np.inf)
+    cerrado = ~transitables
+    distancia[origen] = 0
+    movimientos = vecindad(columnas)
+
+    # Con pocas celdas abiertas (pasillos, laberintos) las operaciones de numpy cuestan
+    # más que relajar celda a celda, así que esos cubos se procesan en Python
+    abiertos = [origen]
+    while len(abiertos):
+        if len(abiertos) < FRENTE_VECTORIZADO:
+            abiertos = _relajar_celdas(abiertos, distancia, cerrado, pesos, anchura,
+                                       filas, columnas, movimientos, hacia)
+        else:
+            abiertos = _relajar_frente(np.asarray(abiertos), distancia, cerrado, pesos, anchura,
+                                       filas, columnas, movimientos, hacia)
+
+    return distancia.reshape(filas, columnas)
+
+
+def _relajar_frente(abiertos, distancia, cerrado, pesos, anchura, filas, columnas, movimientos, hacia):
+    """ Cierra el cubo de menor coste y relaja sus vecinas con operaciones vectorizadas."""
+    d = distancia[abiertos]
+    en_cubo = d < d.min() + anchura
+    frente, abiertos = abiertos[en_cubo], abiertos[~en_cubo]
+    cerrado[frente] = True
+    fi, fj = np.divmod(frente, columnas)
+
+    nuevos = [abiertos]
+    for di, dj, desplazamiento, paso in movimientos:
+        dentro = (fi + di >= 0) & (fi + di < filas) & (fj + dj >= 0) & (fj + dj < columnas)
+        desde = frente[dentro]
+        vecinos = desde + desplazamiento
+        libres = ~cerrado[vecinos]
+        desde, vecinos = desde[libres], vecinos[libres]
+
+        # Hacia la celda se entra en desde viniendo del vecino; desde ella, en el vecino
+        nueva = distancia[desde] + paso * pesos[desde if hacia else vecinos]
+        mejoran = nueva < distancia[vecinos]
+        np.minimum.at(distancia, vecinos[mejoran], nueva[mejoran])
+        nuevos.append(vecinos[mejoran])
+    return np.unique(np.concatenate(nuevos))
+
+
+def _relajar_celdas(abiertos, distancia, cerrado, pesos, anchura, filas, columnas, movimientos, hacia):
+    """ Lo mismo que _relajar_frente, celda a celda; devuelve la lista de abiertas."""
+    if not isinstance(abiertos, list):
+        abiertos = abiertos.tolist()
+    d, c, w = memoryview(distancia), memoryview(cerrado), memoryview(pesos)
+    limite = min(d[k] for k in abiertos) + anchura
+    frente = [k for k in abiertos if d[k] < limite]
+    pendientes = {k for k in abiertos if d[k] >= limite}
+    for k in frente:
+        c[k] = True
+
+    for actual in frente:
+        i, j = divmod(actual, columnas)
+        d_actual, w_actual = d[actual], w[actual]
+        for di, dj, desplazamiento, paso in movimientos:
+            if 0 <= i + di < filas and 0 <= j + dj < columnas:
+                vecino = actual + desplazamiento
+                if c[vecino]:
+                    continue
+                nueva = d_actual + paso * (w_actual if hacia else w[vecino])
+                if nueva < d[vecino]:
+                    d[vecino] = nueva
+                    pendientes.add(vecino)
+    return list(pendientes)
+
+
+class CampoFlujo:
+    """ Coste hasta un objetivo desde todas las celdas, para guiar a muchos agentes a la vez.
+
+    Cada agente baja por el campo: en cada paso va a la vecina que minimiza el coste de
+    entrar en ella más su coste hasta el objetivo, lo que da un camino óptimo sin buscar.
+    """
+
+    def __init__(self, codigos, tabla, objetivo):
+        self.objetivo = tuple(objetivo)
+        self.costes = calcular_campo(codigos, tabla, objetivo)
+        self.filas, self.columnas = codigos.shape
+        # Vistas planas para leer celda a celda sin crear escalares de numpy
+        self._costes = memoryview(self.costes.reshape(-1))
+        self._pesos = memoryview(np.asarray(tabla)[codigos].ravel())
+        self._movimientos = vecindad(self.columnas)
+
+    def siguiente(self, celda):
+        """ Celda a la que avanzar desde celda, o None si el objetivo no es alcanzable."""
+        i, j = celda
+        actual = i * self.columnas + j
+        if (i, j) == self.objetivo or self._costes[actual] == np.inf:
+            return None
+        costes, pesos = self._costes, self._pesos
+        mejor, siguiente = np.inf, None
+        for di, dj, desplazamiento, paso in self._movimientos:
+            vi, vj = i + di, j + dj
+            if 0 <= vi < self.filas and 0 <= vj < self.columnas:
+                vecino = actual + desplazamiento
+                if pesos[vecino] >= 0:
+                    total = paso * pesos[vecino] + costes[vecino]
+                    if total < mejor:
+                        mejor, siguiente = total, (vi, vj)
+        return siguiente
+
+    def camino(self, inicio):
+        """ Camino de inicio al objetivo bajando por el campo, o None si no lo hay."""
+        inicio = tuple(inicio)
+        if self.costes[inicio] == np.inf:
+            return None
+        camino = [inicio]
+        while camino[-1] != self.objetivo:
+            camino.append(self.siguiente(camino[-1]))
+        return camino
@@ -0,0 +1,126 @@
+import mmap
+import os
+
+import numpy as np
+
+from mapa import CODIGOS
+
+_INVALIDO = -128
+
+# Tabla byte -> código de celda; cualquier byte fuera del alfabeto queda como inválido
+_TABLA = np.full(256, _INVALIDO, dtype=np.int8)
+for _caracter, _codigo in CODIGOS.items():
+    _TABLA[ord(_caracter)] = _codigo
+
+# Bytes que str.split() trata como separadores
+_ESPACIO = np.zeros(256, dtype=bool)
+_ESPACIO[list(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')] = True
+
+_SALTO = ord('\n')
+
+
+def cargar_codigos(nombre_fichero, tam_bloque=1 << 24):
+    """ Lee un fichero con el formato de matriz.txt directamente a un array int8 de códigos.
+
+    El fichero se recorre a través de un mapa de memoria en bloques de unas tam_bloque
+    bytes cortados en fin de línea, y cada bloque se decodifica con operaciones
+    vectorizadas. Devuelve (codigos, puntos) con los puntos 1..6 como en
+    leer_matriz_fichero.
+    """
+    with open(nombre_fichero, 'rb') as fichero:
+        tamano = os.fstat(fichero.fileno()).st_size
+        if tamano == 0:
+            return np.zeros((0, 0), dtype=np.int8), {}
+
+        with mmap.mmap(fichero.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return _decodificar(datos, tamano, tam_bloque)
+
+
+def _decodificar(datos, tamano, tam_bloque):
+    bloques = []
+    puntos = {}
+    columnas = None
+    fila = 0
+    linea = 0
+    vacia = None  # Primera línea vacía: solo se admiten al final del fichero
+
+    inicio = 0
+    while inicio < tamano:
+        fin = datos.find(b'\n', min(inicio + tam_bloque, tamano) - 1)
+        fin = tamano if fin == -1 else fin + 1
+
+        # Cada bloque se copia del mapa de memoria para no dejar vistas abiertas sobre él
+        codigos, por_linea = _decodificar_bloque(np.frombuffer(datos[inicio:fin], dtype=np.uint8))
+        vacias = np.flatnonzero(por_linea == 0)
+        if vacia is None and len(vacias):
+            vacia = linea + vacias[0]
+
+        llenas = np.flatnonzero(por_linea)
+        if len(llenas):
+            if columnas is None:
+                columnas = int(por_linea[llenas[0]])
+            if vacia is not None and vacia < linea + llenas[-1]:
+                raise ValueError(f"Línea vacía en mitad del mapa (línea {vacia})")
+            distintas = llenas[por_linea[llenas] != columnas]
+            if len(distintas):
+                k = distintas[0]
+                raise ValueError(f"La fila {linea + k} tiene {por_linea[k]} columnas y se esperaban {columnas}")
+
+            bloque = codigos.reshape(len(llenas), columnas)
+            for (i, j), valor in _puntos_bloque(bloque):
+                puntos[valor] = (fila + i, j)
+            bloques.append(bloque)
+
+        fila += len(llenas)
+        linea += len(por_linea)
+        inicio = fin
+
+    if not bloques:
+        return np.zeros((0, 0), dtype=np.int8), {}
+    return np.concatenate(bloques), puntos
+
+
+def _decodificar_bloque(bloque):
+    """ Decodifica un bloque de líneas completas; devuelve los códigos y cuántos hay por línea."""
+    es_token = ~_ESPACIO[bloque]
+    posiciones = np.flatnonzero(es_token)
+    codigos = _TABLA[bloque[posiciones]]
+
+    # Un token de más de un carácter o un carácter fuera del alfabeto no es reconocido
+    errores = []
+    pegados = np.flatnonzero(es_token[1:] & es_token[:-1])
+    if len(pegados):
+        errores.append(_inicio_token(es_token, pegados[0]))
+    invalidos = np.flatnonzero(codigos == _INVALIDO)
+    if len(invalidos):
+        errores.append(posiciones[invalidos[0]])
+    if errores:
+        raise ValueError(f"Caracter no reconocido: {_texto_token(bloque, es_token, min(errores))}")
+
+    saltos = np.flatnonzero(bloque == _SALTO)
+    n_lineas = len(saltos) + (0 if len(bloque) and bloque[-1] == _SALTO else 1)
+    por_linea = np.bincount(np.searchsorted(saltos, posiciones), minlength=n_lineas)
+    return codigos, por_linea
+
+
+def _inicio_token(es_token, posicion):
+    while posicion > 0 and es_token[posicion - 1]:
+        posicion -= 1
+    return posicion
+
+
+def _texto_token(bloque, es_token, posicion):
+    fin = posicion
+    while fin < len(bloque) and es_token[fin]:
+        fin += 1
+    return bytes(bloque[posicion:fin]).decode('utf-8', errors='replace')
+
+
+def _puntos_bloque(bloque):
+    """ Posición de la última aparición de cada punto 1..6 dentro del bloque."""
+    plano = bloque.ravel()
+    indices = np.flatnonzero((plano >= 1) & (plano <= 6))
+    ultimos = {}
+    for indice in indices:
+        ultimos[int(plano[indice])] = indice
+    return [(divmod(int(indice), bloque.shape[1]), valor) for valor, indice in sorted(ultimos.items())]
@@ -0,0 +1,163 @@
+import struct
+import zlib
+
+import numpy as np
+
+from mapa import OBSTACULO, PELIGRO
+
+# Cada código de celda tiene una prioridad de dibujo; al reducir la imagen cada píxel toma
+# el color de la celda de más prioridad de su bloque, para que caminos y puntos no desaparezcan
+PRIO_LIBRE, PRIO_PELIGRO, PRIO_OBSTACULO, PRIO_CAMINO, PRIO_PUNTO, PRIO_FINAL = range(6)
+PRIORIDAD = np.zeros(256, dtype=np.uint8)
+PRIORIDAD[PELIGRO] = PRIO_PELIGRO
+PRIORIDAD[OBSTACULO & 0xFF] = PRIO_OBSTACULO
+PRIORIDAD[1:6] = PRIO_PUNTO
+PRIORIDAD[6] = PRIO_FINAL
+
+# Mismos colores que mostrar_matriz en aestrella3.py, por prioridad
+COLORES = np.array([
+    (255, 255, 255),  # Blanco para caminos libres
+    (255, 255, 0),    # Amarillo para celdas peligrosas
+    (0, 0, 0),        # Negro para obstáculos
+    (0, 0, 255),      # Azul para el camino
+    (0, 255, 0),      # Verde para puntos
+    (255, 0, 0),      # Rojo para el final
+], dtype=np.uint8)
+
+
+def codigos_matriz(matriz):
+    """ Códigos de celda de una matriz como la de leer_matriz_fichero (0.5 es una celda 'P')."""
+    valores = np.asarray(matriz, dtype=float)
+    return np.where(valores == 0.5, PELIGRO, valores).astype(np.int8)
+
+
+def _prioridades(codigos, camino, excluir, fila0=0, prioridades=PRIORIDAD):
+    """ Prioridad de cada celda de una banda de filas que empieza en fila0, con el camino encima."""
+    prioridad = prioridades[codigos.view(np.uint8)]
+    if camino is not None and len(camino):
+        filas, columnas = camino[:, 0] - fila0, camino[:, 1]
+        # El camino no tapa las celdas de excluir o, si no se dan, los puntos
+        if excluir is None:
+            pintar = prioridad[filas, columnas] < PRIO_CAMINO
+        else:
+            pintar = ~excluir[filas + fila0, columnas]
+        prioridad[filas[pintar], columnas[pintar]] = PRIO_CAMINO
+    return prioridad
+
+
+def _preparar(codigos, camino, excluir):
+    camino = None if camino is None or not len(camino) else np.array(camino, dtype=np.int64).reshape(-1, 2)
+    if camino is not None:
+        camino = camino[np.argsort(camino[:, 0], kind='stable')]
+    if excluir is not None:
+        celdas = np.array(list(excluir), dtype=np.int64).reshape(-1, 2)
+        excluir = np.zeros(codigos.shape, dtype=bool)
+        excluir[celdas[:, 0], celdas[:, 1]] = True
+    return camino, excluir
+
+
+def imagen(codigos, camino=None, excluir=None, prioridades=PRIORIDAD):
+    """ Imagen RGB (uint8) del mapa con el camino en azul, sin recorrer las celdas una a una.
+
+    excluir son las celdas sobre las que no se pinta el camino; por defecto, los puntos 1..6.
+    prioridades da el color de cada código (indexada por el código como uint8), para mapas
+    que usan los códigos de otra manera.
+    """
+    camino, excluir = _preparar(codigos, camino, excluir)
+    return COLORES[_prioridades(codigos, camino, excluir, prioridades=prioridades)]
+
+
+def _reducir(prioridad, escala):
+    """ Cada bloque escala x escala pasa a un píxel con la mayor prioridad del bloque."""
+    if escala == 1:
+        return prioridad
+    filas, columnas = prioridad.shape
+    relleno = np.zeros((-(-filas // escala) * escala, -(-columnas // escala) * escala), dtype=np.uint8)
+    relleno[:filas, :columnas] = prioridad
+    return relleno.reshape(relleno.shape[0] // escala, escala, relleno.shape[1] // escala, escala).max(axis=(1, 3))
+
+
+class EscritorPNG:
+    """ Escribe un PNG RGB de 8 bits por bandas de filas, sin tenerlo entero en memoria."""
+
+    def __init__(self, nombre_fichero, ancho, alto, nivel=6):
+        self.ancho, self.alto = ancho, alto
+        self.filas_escritas = 0
+        self._fichero = open(nombre_fichero, 'wb')
+        self._compresor = zlib.compressobj(nivel)
+        self._fichero.write(b'\x89PNG\r\n\x1a\n')
+        self._fragmento(b'IHDR', struct.pack('>IIBBBBB', ancho, alto, 8, 2, 0, 0, 0))
+
+    def _fragmento(self, tipo, datos):
+        self._fichero.write(struct.pack('>I', len(datos)) + tipo + datos)
+        self._fichero.write(struct.pack('>I', zlib.crc32(tipo + datos) & 0xFFFFFFFF))
+
+    def escribir(self, rgb):
+        """ Añade una banda de filas (alto x ancho x 3, uint8)."""
+        # Cada fila va precedida de su tipo de filtro (0: ninguno)
+        filas = np.zeros((len(rgb), 1 + self.ancho * 3), dtype=np.uint8)
+        filas[:, 1:] = rgb.reshape(len(rgb), -1)
+        datos = self._compresor.compress(filas.tobytes())
+        if datos:
+            self._fragmento(b'IDAT', datos)
+        self.filas_escritas += len(rgb)
+
+    def cerrar(self):
+        if self.filas_escritas != self.alto:
+            raise ValueError(f"Se han escrito {self.filas_escritas} filas de {self.alto}")
+        self._fragmento(b'IDAT', self._compresor.flush())
+        self._fragmento(b'IEND', b'')
+        self._fichero.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *excepcion):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self._fichero.close()
+
+
+def guardar_png(nombre_fichero, codigos, camino=None, excluir=None, escala=1, filas_por_banda=None):
+    """ Escribe el mapa con su camino como PNG, reducido escala veces, sin usar matplotlib.
+
+    El mapa se recorre en bandas de filas (un mapa proyectado en memoria no se carga
+    entero) y cada banda se comprime según se genera.
+    """
+    filas, columnas = codigos.shape
+    camino, excluir = _preparar(codigos, camino, excluir)
+    # Bandas de unos 4 millones de celdas, en múltiplos de la escala
+    filas_por_banda = filas_por_banda or (1 << 22) // max(columnas, 1)
+    filas_por_banda = max(escala, filas_por_banda // escala * escala)
+
+    with EscritorPNG(nombre_fichero, -(-columnas // escala), -(-filas // escala)) as png:
+        for fila0 in range(0, filas, filas_por_banda):
+            fila1 = min(fila0 + filas_por_banda, filas)
+            tramo = None
+            if camino is not None:
+                desde, hasta = np.searchsorted(camino[:, 0], [fila0, fila1])
+                tramo = camino[desde:hasta]
+            prioridad = _prioridades(codigos[fila0:fila1], tramo, excluir, fila0)
+            png.escribir(COLORES[_reducir(prioridad, escala)])
+    return nombre_fichero
+
+
+def guardar_teselas(prefijo, codigos, camino=None, excluir=None, tamano=2048, escala=1):
+    """ Divide el mapa en teselas de tamano x tamano píxeles y las guarda como prefijo_fila_columna.png."""
+    filas, columnas = codigos.shape
+    celdas = tamano * escala
+    nombres = []
+    for ti, fila0 in enumerate(range(0, filas, celdas)):
+        for tj, columna0 in enumerate(range(0, columnas, celdas)):
+            bloque = codigos[fila0:fila0 + celdas, columna0:columna0 + celdas]
+            tramo = None
+            if camino is not None:
+                tramo = [(i - fila0, j - columna0) for i, j in camino
+                         if fila0 <= i < fila0 + celdas and columna0 <= j < columna0 + celdas]
+            tramo_excluir = None
+            if excluir is not None:
+                tramo_excluir = [(i - fila0, j - columna0) for i, j in excluir
+                                 if fila0 <= i < fila0 + celdas and columna0 <= j < columna0 + celdas]
+            nombres.append(guardar_png(f"{prefijo}_{ti}_{tj}.png", bloque, tramo, tramo_excluir, escala))
+    return nombres
@@ -0,0 +1,188 @@
+import heapq
+import math
+from array import array
+
+from rejilla import INFINITO, vecindad
+
+RAIZ_2 = math.sqrt(2)
+
+
+class DStarLite:
+    """ Planificador incremental (D* Lite) entre inicio y final sobre un Mapa que cambia.
+
+    Busca hacia atrás desde final: g[v] es el coste de v hasta final. Cuando cambian
+    celdas solo se reparan los costes afectados, en lugar de repetir la búsqueda. La
+    heurística es la distancia octil por el menor coste de la tabla, consistente aunque
+    las modificaciones añadan celdas más baratas, así que el coste es siempre el óptimo
+    (el mismo que Mapa.astar(modo='bidireccional') o que astar en mapas sin celdas 'P').
+    """
+
+    def __init__(self, mapa, inicio, final):
+        self.mapa = mapa
+        self.filas, self.columnas = mapa.filas, mapa.columnas
+        self.inicio, self.final = tuple(inicio), tuple(final)
+        positivos = [coste for coste in mapa.costes.values() if coste > 0]
+        if len(positivos) != len(mapa.costes):
+            raise ValueError("D* Lite necesita que todas las celdas transitables cuesten más de 0")
+        self.coste_minimo = min(positivos)
+
+        n = self.filas * self.columnas
+        self.g = array('d', [INFINITO]) * n
+        self.rhs = array('d', [INFINITO]) * n
+        self._movimientos = vecindad(self.columnas)
+        self._km = 0.0
+        self._abiertos = {}  # celda plana -> clave con la que está en la lista abierta
+        self._lista_abierta = []
+        self._celdas = memoryview(mapa.codigos.reshape(-1))
+
+        destino = self._indice(self.final)
+        if self._transitable(destino):
+            self.rhs[destino] = 0
+            self._insertar(destino, self._clave(destino))
+        self.expandidos = 0  # Nodos expandidos en la última replanificación
+
+    def _indice(self, celda):
+        return celda[0] * self.columnas + celda[1]
+
+    def _transitable(self, indice):
+        return self.mapa.tabla[self._celdas[indice]] >= 0
+
+    def _h(self, indice):
+        i, j = divmod(indice, self.columnas)
+        di, dj = abs(i - self.inicio[0]), abs(j - self.inicio[1])
+        return self.coste_minimo * (max(di, dj) + (RAIZ_2 - 1) * min(di, dj))
+
+    def _clave(self, indice):
+        minimo = min(self.g[indice], self.rhs[indice])
+        return minimo + self._h(indice) + self._km, minimo
+
+    def _insertar(self, indice, clave):
+        self._abiertos[indice] = clave
+        heapq.heappush(self._lista_abierta, (clave, indice))
+
+    def _vecinos(self, indice):
+        i, j = divmod(indice, self.columnas)
+        for di, dj, desplazamiento, paso in self._movimientos:
+            if 0 <= i + di < self.filas and 0 <= j + dj < self.columnas:
+                yield indice + desplazamiento, paso
+
+    def _rhs(self, indice):
+        """ Mejor coste de indice a final pasando por un vecino: el paso por el riesgo del vecino."""
+        tabla, celdas, g = self.mapa.tabla, self._celdas, self.g
+        if tabla[celdas[indice]] < 0:
+            return INFINITO
+        if indice == self._indice(self.final):
+            return 0.0
+        mejor = INFINITO
+        for vecino, paso in self._vecinos(indice):
+            riesgo = tabla[celdas[vecino]]
+            if riesgo >= 0 and g[vecino] + paso * riesgo < mejor:
+                mejor = g[vecino] + paso * riesgo
+        return mejor
+
+    def _reordenar(self, indice):
+        """ Mete indice en la lista abierta si es inconsistente (g != rhs) y si no lo saca."""
+        # Las entradas antiguas del montículo se descartan al llegar a la cima
+        if self.g[indice] != self.rhs[indice]:
+            self._insertar(indice, self._clave(indice))
+        else:
+            self._abiertos.pop(indice, None)
+
+    def _cima(self):
+        """ Clave mínima de la lista abierta, descartando entradas que ya no son válidas."""
+        lista = self._lista_abierta
+        while lista and self._abiertos.get(lista[0][1]) != lista[0][0]:
+            heapq.heappop(lista)
+        return lista[0][0] if lista else (INFINITO, INFINITO)
+
+    def _calcular(self):
+        origen, destino = self._indice(self.inicio), self._indice(self.final)
+        g, rhs = self.g, self.rhs
+        tabla, celdas = self.mapa.tabla, self._celdas
+        filas, columnas, movimientos = self.filas, self.columnas, self._movimientos
+        lista, abiertos = self._lista_abierta, self._abiertos
+        expandidos = 0
+
+        while self._cima() < self._clave(origen) or rhs[origen] != g[origen]:
+            if not lista:
+                break
+            clave_vieja, actual = heapq.heappop(lista)
+            clave_nueva = self._clave(actual)
+            if clave_vieja < clave_nueva:
+                self._insertar(actual, clave_nueva)
+                continue
+            del abiertos[actual]
+
+            expandidos += 1
+            i, j = divmod(actual, columnas)
+            riesgo = tabla[celdas[actual]]
+            g_viejo = g[actual]
+            if g_viejo > rhs[actual]:
+                # Ha mejorado: los vecinos solo pueden mejorar pasando por él
+                g[actual] = g_actual = rhs[actual]
+                for di, dj, desplazamiento, paso in movimientos:
+                    if 0 <= i + di < filas and 0 <= j + dj < columnas:
+                        vecino = actual + desplazamiento
+                        if vecino != destino and tabla[celdas[vecino]] >= 0 and g_actual + paso * riesgo < rhs[vecino]:
+                            rhs[vecino] = g_actual + paso * riesgo
+                            self._reordenar(vecino)
+            else:
+                # Ha empeorado: se recalculan los vecinos cuyo mejor sucesor era él
+                g[actual] = INFINITO
+                for di, dj, desplazamiento, paso in movimientos:
+                    if 0 <= i + di < filas and 0 <= j + dj < columnas:
+                        vecino = actual + desplazamiento
+                        if vecino != destino and rhs[vecino] == g_viejo + paso * riesgo:
+                            rhs[vecino] = self._rhs(vecino)
+                            self._reordenar(vecino)
+                rhs[actual] = self._rhs(actual)
+                self._reordenar(actual)
+        self.expandidos = expandidos
+
+    def actualizar_celda(self, i, j, valor):
+        """ Cambia la celda (i, j) del mapa ('O', 'X', 'P', ... o un código) y marca lo que hay que reparar.
+
+        La reparación se hace en la siguiente llamada a camino(), así que se pueden
+        acumular varias modificaciones.
+        """
+        self.mapa.modificar_celda(i, j, valor)
+        # Un mapa proyectado pasa a tener su propia copia al modificarse
+        self._celdas = memoryview(self.mapa.codigos.reshape(-1))
+        indice = self._indice((i, j))
+        for celda in [indice] + [vecino for vecino, _ in self._vecinos(indice)]:
+            self.rhs[celda] = self._rhs(celda)
+            self._reordenar(celda)
+
+    update_cell = actualizar_celda
+
+    def avanzar(self, celda):
+        """ Mueve el inicio a celda (el agente ha avanzado) sin invalidar la lista abierta."""
+        anterior = self._indice(self.inicio)
+        self.inicio = tuple(celda)
+        self._km += self._h(anterior)
+
+    def coste(self):
+        """ Coste óptimo actual de inicio a final (infinito si no hay camino)."""
+        self._calcular()
+        return self.g[self._indice(self.inicio)]
+
+    def camino(self):
+        """ Camino óptimo actual de inicio a final, o None."""
+        self._calcular()
+        actual, destino = self._indice(self.inicio), self._indice(self.final)
+        if self.g[actual] == INFINITO:
+            return None
+
+        tabla, celdas, g = self.mapa.tabla, self._celdas, self.g
+        camino = [self.inicio]
+        while actual != destino:
+            mejor, siguiente = INFINITO, -1
+            for vecino, paso in self._vecinos(actual):
+                riesgo = tabla[celdas[vecino]]
+                if riesgo >= 0 and g[vecino] + paso * riesgo < mejor:
+                    mejor, siguiente = g[vecino] + paso * riesgo, vecino
+            if siguiente < 0:
+                return None
+            actual = siguiente
+            camino.append(divmod(actual, self.columnas))
+        return camino
@@ -0,0 +1,214 @@
+import math
+import random
+
+import numpy as np
+
+from mapa import OBSTACULO, PELIGRO
+
+# Filas que se generan de una vez en los mapas grandes (10000 x 10000 son 100 millones de celdas)
+FILAS_POR_BANDA = 1024
+
+
+def generar_aleatorio(filas, columnas, densidad=0.25, peligro=0.02, semilla=None):
+    """ Genera una matriz como la de leer_matriz_fichero con obstáculos (-1) y celdas peligrosas (0.5) al azar."""
+    azar = random.Random(semilla)
+    matriz = []
+    for _ in range(filas):
+        fila = []
+        for _ in range(columnas):
+            r = azar.random()
+            if r < densidad:
+                fila.append(-1)
+            elif r < densidad + peligro:
+                fila.append(0.5)
+            else:
+                fila.append(0)
+        matriz.append(fila)
+
+    # Las esquinas quedan libres para usarlas como inicio y final
+    matriz[0][0] = 0
+    matriz[filas - 1][columnas - 1] = 0
+    return matriz
+
+
+def colocar_puntos(matriz, n, semilla=None):
+    """ Coloca los puntos 1..n en celdas libres al azar y devuelve el diccionario de puntos."""
+    azar = random.Random(semilla)
+    filas, columnas = len(matriz), len(matriz[0])
+    puntos = {}
+    while len(puntos) < n:
+        i, j = azar.randrange(filas), azar.randrange(columnas)
+        if matriz[i][j] == 0:
+            matriz[i][j] = len(puntos) + 1
+            puntos[len(puntos) + 1] = (i, j)
+    return puntos
+
+
+def generar_laberinto(filas, columnas, semilla=None):
+    """ Laberinto perfecto (backtracking recursivo) con muros de una celda de grosor.
+
+    Las salas están en coordenadas impares; (0, 0) y la última esquina se conectan con
+    la sala más cercana para poder usarlas como inicio y final.
+    """
+    azar = random.Random(semilla)
+    matriz = [[-1] * columnas for _ in range(filas)]
+    pila = [(1, 1)]
+    matriz[1][1] = 0
+    while pila:
+        i, j = pila[-1]
+        vecinas = [(i + di, j + dj, di // 2, dj // 2) for di, dj in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 < i + di < filas - 1 and 0 < j + dj < columnas - 1 and matriz[i + di][j + dj] == -1]
+        if not vecinas:
+            pila.pop()
+            continue
+        vi, vj, mi, mj = azar.choice(vecinas)
+        matriz[i + mi][j + mj] = 0
+        matriz[vi][vj] = 0
+        pila.append((vi, vj))
+
+    # Pasillo desde cada esquina hasta la sala más cercana
+    ultima_i, ultima_j = filas - 3 + filas % 2, columnas - 3 + columnas % 2
+    for i, j, sala_i, sala_j in ((0, 0, 1, 1), (filas - 1, columnas - 1, ultima_i, ultima_j)):
+        while (i, j) != (sala_i, sala_j):
+            matriz[i][j] = 0
+            i += (sala_i > i) - (sala_i < i)
+            j += (sala_j > j) - (sala_j < j)
+    return matriz
+
+
+# Generadores de códigos de celda (int8, como Mapa.codigos) para mapas de cualquier tamaño.
+# Con la misma semilla dan siempre el mismo mapa; las dos esquinas quedan libres.
+
+def codigos_aleatorios(filas, columnas, densidad=0.25, semilla=None):
+    """ Obstáculos repartidos al azar con probabilidad densidad en cada celda."""
+    azar = np.random.default_rng(semilla)
+    codigos = np.zeros((filas, columnas), dtype=np.int8)
+    for fila0 in range(0, filas, FILAS_POR_BANDA):
+        banda = codigos[fila0:fila0 + FILAS_POR_BANDA]
+        banda[azar.random(banda.shape, dtype=np.float32) < densidad] = OBSTACULO
+    codigos[0, 0] = codigos[-1, -1] = 0
+    return codigos
+
+
+def codigos_laberinto(filas, columnas, semilla=None):
+    """ Laberinto perfecto de árbol binario: cada sala se abre al norte o al oeste.
+
+    Como generar_laberinto, las salas están en coordenadas impares y los muros tienen una
+    celda de grosor, pero se construye sin recorrer las salas una a una.
+    """
+    azar = np.random.default_rng(semilla)
+    salas_i, salas_j = (filas - 1) // 2, (columnas - 1) // 2
+    codigos = np.full((filas, columnas), OBSTACULO, dtype=np.int8)
+    codigos[1:2 * salas_i:2, 1:2 * salas_j:2] = 0
+
+    norte = azar.random((salas_i, salas_j), dtype=np.float32) < 0.5
+    norte[0, :] = False  # La primera fila solo puede abrirse al oeste
+    norte[:, 0] = True   # y la primera columna, al norte
+    a, b = np.nonzero(norte)
+    codigos[2 * a[a > 0], 2 * b[a > 0] + 1] = 0
+    a, b = np.nonzero(~norte)
+    codigos[2 * a[b > 0] + 1, 2 * b[b > 0]] = 0
+
+    # (0, 0) toca en diagonal la primera sala; la otra esquina se une a la última con un pasillo
+    codigos[0, 0] = 0
+    codigos[2 * salas_i - 1, 2 * salas_j - 1:] = 0
+    codigos[2 * salas_i - 1:, -1] = 0
+    return codigos
+
+
+def codigos_salas(filas, columnas, tamano_sala=24, densidad=0.05, semilla=None):
+    """ Salas de tamano_sala celdas separadas por muros, con una puerta de dos celdas a cada sala vecina.
+
+    Dentro de las salas hay además obstáculos sueltos con probabilidad densidad.
+    """
+    codigos = codigos_aleatorios(filas, columnas, densidad, semilla)
+    azar = np.random.default_rng(None if semilla is None else semilla + 1)
+    lado = tamano_sala + 1
+    codigos[lado - 1::lado, :] = OBSTACULO
+    codigos[:, lado - 1::lado] = OBSTACULO
+
+    # Una puerta por tramo de muro entre dos salas, en una posición al azar del tramo
+    for eje in (0, 1):
+        muros = np.arange(lado - 1, codigos.shape[eje], lado)
+        tramos = np.arange(0, codigos.shape[1 - eje], lado)
+        if not len(muros):
+            continue
+        hueco = np.minimum(tamano_sala, codigos.shape[1 - eje] - tramos)
+        puerta = tramos + (azar.random((len(muros), len(tramos))) * np.maximum(hueco - 1, 1)).astype(np.int64)
+        for ancho in (0, 1):
+            otra = np.minimum(puerta + ancho, tramos + hueco - 1)
+            filas_puerta = np.broadcast_to(muros[:, None], otra.shape)
+            if eje == 0:
+                codigos[filas_puerta, otra] = 0
+            else:
+                codigos[otra, filas_puerta] = 0
+    codigos[0, 0] = codigos[-1, -1] = 0
+    return codigos
+
+
+def anadir_peligro(codigos, fraccion=0.1, tamano_region=16, semilla=None):
+    """ Convierte en 'P' regiones de unas tamano_region celdas de lado de las celdas libres.
+
+    Las regiones salen de dos rejillas de bloques desplazadas medio bloque, así que tienen
+    formas irregulares; cubren aproximadamente fraccion de las celdas libres.
+    """
+    azar = np.random.default_rng(None if semilla is None else semilla + 2)
+    filas, columnas = codigos.shape
+    lado = max(1, tamano_region)
+    medio = lado // 2
+    # Probabilidad por bloque para que la unión de las dos rejillas cubra fraccion
+    p = 1 - math.sqrt(1 - fraccion)
+    bloques = [azar.random((filas // lado + 2, columnas // lado + 2), dtype=np.float32) < p for _ in range(2)]
+    for fila0 in range(0, filas, FILAS_POR_BANDA):
+        fila1 = min(fila0 + FILAS_POR_BANDA, filas)
+        i = np.arange(fila0, fila1)[:, None]
+        j = np.arange(columnas)[None, :]
+        region = bloques[0][i // lado, j // lado] | bloques[1][(i + medio) // lado, (j + medio) // lado]
+        banda = codigos[fila0:fila1]
+        banda[region & (banda == 0)] = PELIGRO
+    return codigos
+
+
+GENERADORES = {
+    'aleatorio': codigos_aleatorios,
+    'laberinto': codigos_laberinto,
+    'salas': codigos_salas,
+}
+
+
+def generar_codigos(tipo, filas, columnas, peligro=0.0, semilla=None):
+    """ Mapa de uno de los tipos de GENERADORES, con regiones 'P' en la fracción peligro de las celdas libres."""
+    codigos = GENERADORES[tipo](filas, columnas, semilla=semilla)
+    if peligro:
+        anadir_peligro(codigos, peligro, semilla=semilla)
+    return codigos
+
+
+def consultas_fijas(codigos, n, semilla=None, alcance=None):
+    """ n pares (inicio, final) de celdas transitables, siempre los mismos para la misma semilla.
+
+    Con alcance el final está a lo sumo a alcance filas y columnas del inicio, para que las
+    consultas sigan siendo asequibles en mapas muy grandes.
+    """
+    if n and not (codigos != OBSTACULO).any():
+        raise ValueError("El mapa no tiene celdas transitables para las consultas")
+    azar = random.Random(semilla)
+    filas, columnas = codigos.shape
+
+    # Siempre termina: hay celdas libres y la ventana del final contiene el inicio
+    def libre(i0=0, i1=filas, j0=0, j1=columnas):
+        while True:
+            i, j = azar.randrange(i0, i1), azar.randrange(j0, j1)
+            if codigos[i, j] != OBSTACULO:
+                return i, j
+
+    pares = []
+    for _ in range(n):
+        inicio = libre()
+        if alcance is None:
+            final = libre()
+        else:
+            final = libre(max(0, inicio[0] - alcance), min(filas, inicio[0] + alcance + 1),
+                          max(0, inicio[1] - alcance), min(columnas, inicio[1] + alcance + 1))
+        pares.append((inicio, final))
+    return pares
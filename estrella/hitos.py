@@ -0,0 +1,140 @@
+import hashlib
+import math
+import random
+
+import numpy as np
+
+from campo import calcular_campo
+from mapa import OBSTACULO
+
+
+def fichero_hitos(nombre_mapa):
+    """ Ruta donde se guardan los hitos de un mapa: junto a él, con la extensión .hitos.npz."""
+    return nombre_mapa + '.hitos.npz'
+
+
+def huella_mapa(mapa):
+    """ Resumen de lo que determina las distancias: las celdas del mapa y su tabla de costes."""
+    resumen = hashlib.blake2b(mapa.huella().encode(), digest_size=16)
+    resumen.update(repr(sorted(mapa.costes.items())).encode())
+    return resumen.hexdigest()
+
+
+class Hitos:
+    """ Distancias exactas desde y hasta unos pocos hitos del mapa (heurística ALT).
+
+    Por la desigualdad triangular, para cualquier hito L el coste de v a t es al menos
+    d(L, t) - d(L, v) y d(v, L) - d(t, L). Las distancias se guardan en float32; para que
+    la cota siga siendo admisible se le resta el margen del redondeo. huella es la del
+    mapa con el que se calcularon (huella_mapa): con otro mapa la cota puede no ser admisible.
+    """
+
+    def __init__(self, indices, desde, hasta, huella=None):
+        self.huella = huella
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.desde = np.asarray(desde, dtype=np.float32)  # (hitos, celdas): d(L, v)
+        self.hasta = np.asarray(hasta, dtype=np.float32)  # (hitos, celdas): d(v, L)
+        finitas = np.concatenate([self.desde[np.isfinite(self.desde)], self.hasta[np.isfinite(self.hasta)]])
+        self.margen = float(finitas.max()) * 2.0**-22 if len(finitas) else 0.0
+
+    @classmethod
+    def calcular(cls, mapa, n_hitos=8, semilla=0):
+        """ Elige los hitos por el punto más lejano y calcula un campo de costes de ida y otro de vuelta por hito."""
+        libres = np.flatnonzero(mapa.codigos.ravel() != OBSTACULO)
+        if not len(libres):
+            raise ValueError("El mapa no tiene celdas libres para colocar hitos")
+
+        def distancias(indice, inverso):
+            return calcular_campo(mapa.codigos, mapa.tabla, divmod(indice, mapa.columnas), inverso).ravel()
+
+        # El primer hito es la celda más lejana a una celda libre cualquiera; los siguientes,
+        # las más lejanas al conjunto de hitos ya elegidos
+        semilla_inicial = int(random.Random(semilla).choice(libres))
+        lejania = distancias(semilla_inicial, False)
+        indices, desde, hasta = [], [], []
+        for _ in range(min(n_hitos, len(libres))):
+            alcanzables = np.where(np.isfinite(lejania), lejania, -1)
+            hito = int(np.argmax(alcanzables))
+            if hito in indices:
+                break
+            indices.append(hito)
+            desde.append(distancias(hito, False))
+            hasta.append(distancias(hito, True))
+            lejania = desde[-1] if len(indices) == 1 else np.minimum(lejania, desde[-1])
+
+        return cls(indices, np.array(desde), np.array(hasta), huella_mapa(mapa))
+
+    def guardar(self, nombre_fichero):
+        np.savez(nombre_fichero, indices=self.indices, desde=self.desde, hasta=self.hasta,
+                 huella=np.array('' if self.huella is None else self.huella))
+
+    @classmethod
+    def cargar(cls, nombre_fichero, mapa):
+        """ Hitos guardados para mapa; ValueError si se calcularon con otras celdas u otros costes."""
+        with np.load(nombre_fichero) as datos:
+            huella = str(datos['huella']) if 'huella' in datos else None
+            if huella != huella_mapa(mapa):
+                raise ValueError(f"Los hitos de {nombre_fichero} no son de este mapa "
+                                 "(ha cambiado o no se guardó su huella)")
+            return cls(datos['indices'], datos['desde'], datos['hasta'], huella)
+
+    @classmethod
+    def cargar_o_calcular(cls, mapa, nombre_fichero, n_hitos=8, semilla=0):
+        """ Hitos de nombre_fichero si son de mapa; si no existen o no coinciden, se calculan y se guardan."""
+        try:
+            return cls.cargar(nombre_fichero, mapa)
+        except (OSError, ValueError):
+            hitos = cls.calcular(mapa, n_hitos, semilla)
+            hitos.guardar(nombre_fichero)
+            return hitos
+
+    @property
+    def bytes(self):
+        return self.desde.nbytes + self.hasta.nbytes
+
+    def heuristica(self, final, columnas, respaldo=0.0):
+        """ Función celda plana -> cota inferior del coste hasta final.
+
+        respaldo multiplica la distancia euclídea (p. ej. el coste mínimo del mapa); se usa
+        el máximo de ambas cotas.
+        """
+        fi, fj = final
+        t = fi * columnas + fj
+        margen = self.margen
+        sqrt = math.sqrt
+
+        # Solo se usan las cotas con extremos finitos; memoryview devuelve floats de Python
+        cotas = []
+        for k in range(len(self.indices)):
+            d_hito_t, d_t_hito = float(self.desde[k, t]), float(self.hasta[k, t])
+            if math.isfinite(d_hito_t):
+                cotas.append((memoryview(self.desde[k]), d_hito_t, 1.0))
+            if math.isfinite(d_t_hito):
+                cotas.append((memoryview(self.hasta[k]), d_t_hito, -1.0))
+
+        def h(indice):
+            i, j = divmod(indice, columnas)
+            mejor = respaldo * sqrt((i - fi)**2 + (j - fj)**2)
+            for distancias, referencia, signo in cotas:
+                cota = signo * (referencia - distancias[indice]) - margen
+                if cota > mejor:
+                    mejor = cota
+            return mejor
+
+        return h
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from mapa import Mapa
+
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Uso: python hitos.py mapa.txt [número de hitos]")
+    mapa = Mapa.desde_fichero(sys.argv[1])
+    t0 = time.perf_counter()
+    hitos = Hitos.calcular(mapa, int(sys.argv[2]) if len(sys.argv) == 3 else 8)
+    hitos.guardar(fichero_hitos(sys.argv[1]))
+    print(f"{len(hitos.indices)} hitos en {time.perf_counter() - t0:.2f} s, {hitos.bytes / 2**20:.1f} MB "
+          f"-> {fichero_hitos(sys.argv[1])}")
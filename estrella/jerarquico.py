@@ -0,0 +1,358 @@
+import heapq
+import math
+
+import numpy as np
+
+from rejilla import INFINITO, buscar, dijkstra, vecindad
+
+# Tramos de frontera libre más cortos que esto se cruzan por su centro; los demás, por sus extremos
+TRAMO_LARGO = 6
+
+
+class Jerarquia:
+    """ Planificador jerárquico (HPA*) sobre un Mapa dividido en bloques de tamano x tamano.
+
+    Entre bloques vecinos se eligen unas pocas celdas de paso por cada tramo libre de su
+    frontera (más los cruces en diagonal que no tengan alternativa recta, para no perder
+    conectividad). Dentro de cada bloque se precalcula el coste entre sus celdas de paso,
+    teniendo en cuenta el riesgo de las celdas. Una consulta busca primero en ese grafo
+    abstracto y luego refina solo los tramos elegidos. El camino es casi óptimo, no
+    óptimo. Al modificar celdas solo se recalculan los bloques afectados.
+    """
+
+    def __init__(self, mapa, tamano=32):
+        if tamano < 2:
+            raise ValueError("Los bloques deben tener al menos 2 x 2 celdas")
+        self.mapa = mapa
+        self.tamano = tamano
+        self.filas, self.columnas = mapa.filas, mapa.columnas
+        self.bloques_filas = -(-self.filas // tamano)
+        self.bloques_columnas = -(-self.columnas // tamano)
+        self.reconstruir()
+
+    # --- Construcción del grafo abstracto ---
+
+    def reconstruir(self):
+        """ Recalcula todas las fronteras y todos los bloques."""
+        self._celdas = memoryview(self.mapa.codigos.reshape(-1))
+        self._version = self.mapa.version
+        self._sucios = set()
+        self._fronteras = {}  # frontera -> lista de pares (a, b) de celdas planas a ambos lados
+        self._dentro = {}     # bloque -> {celda: {celda: coste}} entre celdas de paso del bloque
+        for frontera in self._todas_las_fronteras():
+            self._fronteras[frontera] = self._calcular_frontera(frontera)
+        self._enlazar()
+        for bloque in self._nodos:
+            self._dentro[bloque] = self._calcular_bloque(bloque)
+        self.bloques_recalculados = len(self._nodos)
+
+    def _todas_las_fronteras(self):
+        for bi in range(self.bloques_filas):
+            for bj in range(self.bloques_columnas):
+                yield from self._fronteras_de((bi, bj))
+
+    def _fronteras_de(self, bloque):
+        """ Fronteras que tocan el bloque: (tipo, bloque de arriba a la izquierda) sin repetir."""
+        bi, bj = bloque
+        candidatas = [('h', bi, bj), ('h', bi - 1, bj), ('v', bi, bj), ('v', bi, bj - 1),
+                      ('d', bi, bj), ('d', bi - 1, bj - 1), ('a', bi, bj), ('a', bi - 1, bj + 1)]
+        for tipo, ci, cj in candidatas:
+            if tipo == 'a':
+                # La antidiagonal va del bloque (ci, cj) al (ci + 1, cj - 1)
+                valida = 0 <= ci < self.bloques_filas - 1 and 1 <= cj < self.bloques_columnas
+            else:
+                valida = (0 <= ci < self.bloques_filas - (tipo != 'v') and
+                          0 <= cj < self.bloques_columnas - (tipo != 'h'))
+            if valida:
+                yield tipo, ci, cj
+
+    def _libre(self, i, j):
+        return self.mapa.tabla[self._celdas[i * self.columnas + j]] >= 0
+
+    def _calcular_frontera(self, frontera):
+        """ Pares de celdas (a, b) por los que se cruza la frontera."""
+        tipo, bi, bj = frontera
+        t, columnas = self.tamano, self.columnas
+        libre = self._libre
+        pares = []
+
+        if tipo in ('d', 'a'):
+            # Esquina: solo si ninguna de las dos celdas rectas permite rodearla
+            i = (bi + 1) * t - 1
+            j = (bj + 1) * t - 1 if tipo == 'd' else bj * t
+            dj = 1 if tipo == 'd' else -1
+            if libre(i, j) and libre(i + 1, j + dj) and not libre(i + 1, j) and not libre(i, j + dj):
+                pares.append((i * columnas + j, (i + 1) * columnas + j + dj))
+            return pares
+
+        # Recorrido a lo largo de la frontera: celda a del bloque (bi, bj) y b del vecino
+        if tipo == 'h':
+            i = (bi + 1) * t - 1
+            posiciones = range(bj * t, min((bj + 1) * t, self.columnas))
+            celda_a = lambda k: (i, k)
+            celda_b = lambda k: (i + 1, k)
+        else:
+            j = (bj + 1) * t - 1
+            posiciones = range(bi * t, min((bi + 1) * t, self.filas))
+            celda_a = lambda k: (k, j)
+            celda_b = lambda k: (k, j + 1)
+
+        def plano(celda):
+            return celda[0] * columnas + celda[1]
+
+        rectas = [libre(*celda_a(k)) and libre(*celda_b(k)) for k in posiciones]
+        tramo = []
+        for k, recta in zip(list(posiciones) + [None], rectas + [False]):
+            if recta:
+                tramo.append(k)
+                continue
+            if tramo:
+                elegidas = [tramo[len(tramo) // 2]] if len(tramo) < TRAMO_LARGO else [tramo[0], tramo[-1]]
+                pares.extend((plano(celda_a(e)), plano(celda_b(e))) for e in elegidas)
+                tramo = []
+
+        # Cruces en diagonal dentro de la frontera cuyas dos celdas no tienen cruce recto
+        primera, ultima = posiciones[0], posiciones[-1]
+        for k, recta in zip(posiciones, rectas):
+            if recta or not libre(*celda_a(k)):
+                continue
+            for d in (-1, 1):
+                if primera <= k + d <= ultima and not rectas[k + d - primera] and libre(*celda_b(k + d)):
+                    pares.append((plano(celda_a(k)), plano(celda_b(k + d))))
+        return pares
+
+    def _bloque(self, indice):
+        i, j = divmod(indice, self.columnas)
+        return i // self.tamano, j // self.tamano
+
+    def _enlazar(self, bloques=None):
+        """ Celdas de paso de cada bloque y aristas entre bloques a partir de las fronteras.
+
+        Con bloques, solo se rehacen las celdas de paso de esos bloques y las aristas de las
+        fronteras que los tocan; el resto del grafo abstracto se conserva.
+        """
+        if bloques is None:
+            self._nodos = {(bi, bj): set() for bi in range(self.bloques_filas) for bj in range(self.bloques_columnas)}
+            self._entre = {}
+            fronteras = self._fronteras
+        else:
+            # Se quitan las celdas de paso de los bloques y sus aristas en ambos sentidos
+            for bloque in bloques:
+                for celda in self._nodos[bloque]:
+                    for otra in self._entre.pop(celda, {}):
+                        aristas = self._entre.get(otra)
+                        if aristas is not None:
+                            aristas.pop(celda, None)
+                            if not aristas:
+                                del self._entre[otra]
+                self._nodos[bloque] = set()
+            fronteras = {frontera for bloque in bloques for frontera in self._fronteras_de(bloque)}
+
+        tabla, celdas, columnas = self.mapa.tabla, self._celdas, self.columnas
+        for frontera in fronteras:
+            for a, b in self._fronteras[frontera]:
+                self._nodos[self._bloque(a)].add(a)
+                self._nodos[self._bloque(b)].add(b)
+                (ai, aj), (bi, bj) = divmod(a, columnas), divmod(b, columnas)
+                paso = math.sqrt((ai - bi)**2 + (aj - bj)**2)
+                # Entrar en una celda cuesta su propio riesgo, así que cada sentido tiene su coste
+                self._entre.setdefault(a, {})[b] = paso * tabla[celdas[b]]
+                self._entre.setdefault(b, {})[a] = paso * tabla[celdas[a]]
+
+    def _recorte(self, bloque):
+        """ Celdas del bloque como buffer plano propio, con sus dimensiones y su esquina."""
+        bi, bj = bloque
+        i0, j0 = bi * self.tamano, bj * self.tamano
+        codigos = np.ascontiguousarray(self.mapa.codigos[i0:i0 + self.tamano, j0:j0 + self.tamano])
+        filas, columnas = codigos.shape
+        return memoryview(codigos.reshape(-1)), filas, columnas, i0, j0
+
+    def _distancias_locales(self, bloque, origen, objetivos, inverso=False):
+        """ Coste dentro del bloque de origen a cada objetivo (hasta origen si inverso)."""
+        celdas, filas, columnas, i0, j0 = self._recorte(bloque)
+
+        def local(indice):
+            i, j = divmod(indice, self.columnas)
+            return (i - i0) * columnas + j - j0
+
+        objetivos = list(objetivos)
+        d = dijkstra(celdas, self.mapa.tabla, filas, columnas, local(origen), inverso,
+                     [local(objetivo) for objetivo in objetivos])
+        return {objetivo: d[local(objetivo)] for objetivo in objetivos
+                if objetivo != origen and d[local(objetivo)] < INFINITO}
+
+    def _calcular_bloque(self, bloque):
+        """ Coste dentro del bloque entre cada par de sus celdas de paso.
+
+        Se relajan a la vez los caminos desde todas las celdas de paso, con operaciones
+        vectorizadas sobre el bloque entero en las 8 direcciones, hasta que nada mejora
+        (Bellman-Ford); con decenas de celdas de paso es mucho más rápido que un
+        Dijkstra por celda.
+        """
+        nodos = sorted(self._nodos[bloque])
+        if not nodos:
+            return {}
+        bi, bj = bloque
+        i0, j0 = bi * self.tamano, bj * self.tamano
+        pesos = np.asarray(self.mapa.tabla)[self.mapa.codigos[i0:i0 + self.tamano, j0:j0 + self.tamano]]
+        pesos[pesos < 0] = np.inf
+        filas, columnas = pesos.shape
+
+        locales = [divmod(nodo, self.columnas) for nodo in nodos]
+        locales = [(i - i0, j - j0) for i, j in locales]
+        distancia = np.full((len(nodos), filas, columnas), np.inf)
+        for k, (i, j) in enumerate(locales):
+            distancia[k, i, j] = 0
+
+        # Para cada dirección, vista de las celdas de salida y de llegada dentro del bloque
+        pasos = []
+        for di, dj, _, paso in vecindad(columnas):
+            salida = (slice(max(-di, 0), filas - max(di, 0)), slice(max(-dj, 0), columnas - max(dj, 0)))
+            llegada = (slice(max(di, 0), filas - max(-di, 0)), slice(max(dj, 0), columnas - max(-dj, 0)))
+            pasos.append((salida, llegada, paso * pesos[llegada]))
+
+        anterior = None
+        while anterior is None or not np.array_equal(anterior, distancia):
+            anterior = distancia.copy()
+            for salida, llegada, coste in pasos:
+                destino = distancia[(slice(None),) + llegada]
+                np.minimum(destino, distancia[(slice(None),) + salida] + coste, out=destino)
+
+        return {nodo: {otro: float(distancia[k, i, j]) for otro, (i, j) in zip(nodos, locales)
+                       if otro != nodo and distancia[k, i, j] < INFINITO}
+                for k, nodo in enumerate(nodos)}
+
+    # --- Modificaciones ---
+
+    def modificar_celda(self, i, j, valor):
+        """ Cambia una celda del mapa y marca para recalcular solo los bloques que la rodean."""
+        self.mapa.modificar_celda(i, j, valor)
+        self._celdas = memoryview(self.mapa.codigos.reshape(-1))
+        self._version = self.mapa.version
+        t = self.tamano
+        for vi in range(max(i - 1, 0), min(i + 2, self.filas)):
+            for vj in range(max(j - 1, 0), min(j + 2, self.columnas)):
+                self._sucios.add((vi // t, vj // t))
+
+    def _reparar(self):
+        """ Recalcula las fronteras de los bloques modificados y los bloques cuyas celdas de paso cambian."""
+        if self._version != self.mapa.version:
+            # El mapa se ha modificado sin pasar por aquí: no se sabe qué bloques cambiaron
+            self.reconstruir()
+            return
+        if not self._sucios:
+            return
+
+        recalcular = set(self._sucios)
+        for bloque in self._sucios:
+            for frontera in self._fronteras_de(bloque):
+                pares = self._calcular_frontera(frontera)
+                if pares != self._fronteras[frontera]:
+                    self._fronteras[frontera] = pares
+                    tipo, bi, bj = frontera
+                    vecino = {'h': (bi + 1, bj), 'v': (bi, bj + 1), 'd': (bi + 1, bj + 1), 'a': (bi + 1, bj - 1)}[tipo]
+                    recalcular.update(((bi, bj), vecino))
+        # Los bloques sin cambios conservan sus celdas de paso: solo se enlazan los afectados
+        self._enlazar(recalcular)
+        for bloque in recalcular:
+            self._dentro[bloque] = self._calcular_bloque(bloque)
+        self._sucios = set()
+        self.bloques_recalculados = len(recalcular)
+
+    # --- Consultas ---
+
+    def camino(self, inicio, final, estadisticas=None):
+        """ Camino de inicio a final (lista de celdas) o None."""
+        self._reparar()
+        columnas = self.columnas
+        origen, destino = inicio[0] * columnas + inicio[1], final[0] * columnas + final[1]
+        if not self._libre(*inicio) or not self._libre(*final):
+            return None
+
+        # Inicio y final se conectan temporalmente con las celdas de paso de su bloque
+        bloque_origen, bloque_destino = self._bloque(origen), self._bloque(destino)
+        objetivos = self._nodos[bloque_origen] | ({destino} if bloque_destino == bloque_origen else set())
+        salidas = self._distancias_locales(bloque_origen, origen, objetivos)
+        llegadas = self._distancias_locales(bloque_destino, destino, self._nodos[bloque_destino], inverso=True)
+
+        abstracto = self._buscar_abstracto(origen, destino, salidas, llegadas, estadisticas)
+        if abstracto is None:
+            return None
+
+        # Refinado: las aristas entre bloques son un paso; las de dentro, una búsqueda en el bloque
+        camino = [tuple(inicio)]
+        for a, b in zip(abstracto, abstracto[1:]):
+            if self._bloque(a) != self._bloque(b):
+                camino.append(divmod(b, columnas))
+            else:
+                camino.extend(self._refinar(a, b)[1:])
+        if estadisticas is not None:
+            estadisticas['tramos'] = len(abstracto) - 1
+        return camino
+
+    def _buscar_abstracto(self, origen, destino, salidas, llegadas, estadisticas):
+        """ A* sobre las celdas de paso con heurística euclídea por el coste mínimo (admisible)."""
+        columnas = self.columnas
+        fi, fj = divmod(destino, columnas)
+        coste_minimo = self.mapa.coste_minimo
+
+        def h(nodo):
+            i, j = divmod(nodo, columnas)
+            return coste_minimo * math.sqrt((i - fi)**2 + (j - fj)**2)
+
+        def vecinos(nodo):
+            yield from self._entre.get(nodo, {}).items()
+            if nodo == origen:
+                yield from salidas.items()
+                return
+            yield from self._dentro[self._bloque(nodo)].get(nodo, {}).items()
+            if nodo in llegadas:
+                yield destino, llegadas[nodo]
+
+        g = {origen: 0.0}
+        padres = {origen: None}
+        cerrados = set()
+        lista_abierta = [(h(origen), origen)]
+        expandidos = 0
+        while lista_abierta:
+            _, actual = heapq.heappop(lista_abierta)
+            if actual in cerrados:
+                continue
+            if actual == destino:
+                break
+            cerrados.add(actual)
+            expandidos += 1
+            for vecino, coste in vecinos(actual):
+                g_nuevo = g[actual] + coste
+                if vecino not in cerrados and g_nuevo < g.get(vecino, INFINITO):
+                    g[vecino] = g_nuevo
+                    padres[vecino] = actual
+                    heapq.heappush(lista_abierta, (g_nuevo + h(vecino), vecino))
+
+        if estadisticas is not None:
+            estadisticas['expandidos'] = expandidos
+            estadisticas['coste'] = g.get(destino, INFINITO)
+        if destino not in g:
+            return None
+        abstracto = []
+        nodo = destino
+        while nodo is not None:
+            abstracto.append(nodo)
+            nodo = padres[nodo]
+        abstracto.reverse()
+        return abstracto
+
+    def _refinar(self, a, b):
+        """ Camino óptimo de a a b sin salir de su bloque."""
+        bloque = self._bloque(a)
+        celdas, filas, columnas, i0, j0 = self._recorte(bloque)
+        (ai, aj), (bi, bj) = divmod(a, self.columnas), divmod(b, self.columnas)
+        coste_minimo = self.mapa.coste_minimo
+
+        def h(indice):
+            i, j = divmod(indice, columnas)
+            return coste_minimo * math.sqrt((i + i0 - bi)**2 + (j + j0 - bj)**2)
+
+        camino = buscar(celdas, self.mapa.tabla, filas, columnas, (ai - i0, aj - j0), (bi - i0, bj - j0),
+                        heuristica=h)
+        return [(i + i0, j + j0) for i, j in camino]
@@ -0,0 +1,213 @@
+import heapq
+import math
+
+import numpy as np
+
+from rejilla import EspacioBusqueda
+
+RAIZ_2 = math.sqrt(2)
+
+
+class RejillaJPS:
+    """ Rejilla con un borde de obstáculos para saltar sin comprobar límites.
+
+    bloqueado marca obstáculos y borde; especial marca las celdas con alguna vecina (o ella
+    misma) de coste distinto de 1. Ahí la simetría de la rejilla no se cumple, así que los
+    saltos se detienen y el nodo se expande con sus 8 vecinos, como en A*.
+    """
+
+    def __init__(self, codigos, tabla):
+        filas, columnas = codigos.shape
+        self.filas, self.columnas = filas, columnas
+        self.ancho = columnas + 2
+
+        pesos = np.asarray(tabla)[codigos]
+        obstaculo = pesos < 0
+        no_unitario = ~obstaculo & (pesos != 1)
+
+        bloqueado = np.ones((filas + 2, columnas + 2), dtype=np.uint8)
+        bloqueado[1:-1, 1:-1] = obstaculo
+        especial = np.zeros((filas + 2, columnas + 2), dtype=np.uint8)
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                especial[1 + di:filas + 1 + di, 1 + dj:columnas + 1 + dj] |= no_unitario
+
+        self.bloqueado = bytearray(bloqueado.tobytes())
+        self.especial = bytearray(especial.tobytes())
+        self.espacio = EspacioBusqueda(len(self.bloqueado))
+
+    def actualizar(self, codigos, tabla, i, j):
+        """ Refleja el cambio de la celda (i, j): su bloqueo y la marca especial de sus 8 vecinas."""
+        filas, columnas = self.filas, self.columnas
+        self.bloqueado[self.indice((i, j))] = tabla[codigos[i, j]] < 0
+
+        def no_unitario(a, b):
+            peso = tabla[codigos[a, b]]
+            return peso >= 0 and peso != 1
+
+        for a in range(max(i - 1, 0), min(i + 2, filas)):
+            for b in range(max(j - 1, 0), min(j + 2, columnas)):
+                self.especial[self.indice((a, b))] = any(
+                    no_unitario(c, d)
+                    for c in range(max(a - 1, 0), min(a + 2, filas))
+                    for d in range(max(b - 1, 0), min(b + 2, columnas)))
+
+    def indice(self, nodo):
+        return (nodo[0] + 1) * self.ancho + nodo[1] + 1
+
+    def celda(self, indice):
+        i, j = divmod(indice, self.ancho)
+        return i - 1, j - 1
+
+
+def buscar_jps(rejilla, celdas, tabla, inicio, final, estadisticas=None):
+    """ Jump Point Search con coste euclídeo en 8 direcciones.
+
+    Solo es exacta si todos los costes de la tabla son >= 1 (heurística consistente); las
+    celdas de coste distinto de 1 se tratan como regiones de A* normal. Devuelve el camino
+    completo, celda a celda, o None.
+    """
+    ancho, columnas = rejilla.ancho, rejilla.columnas
+    bloqueado, especial = rejilla.bloqueado, rejilla.especial
+    espacio = rejilla.espacio
+    g_coste, padres, visita = espacio.g_coste, espacio.padres, espacio.visita
+    abierto = espacio.nuevo_sello()
+    cerrado = abierto + 1
+
+    fi, fj = final
+    origen, destino = rejilla.indice(inicio), rejilla.indice(final)
+    sqrt = math.sqrt
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    def peso(indice):
+        i, j = divmod(indice, ancho)
+        return tabla[celdas[(i - 1) * columnas + j - 1]]
+
+    def forzado_recto(v, d, perpendicular):
+        return ((bloqueado[v + perpendicular] and not bloqueado[v + perpendicular + d]) or
+                (bloqueado[v - perpendicular] and not bloqueado[v - perpendicular + d]))
+
+    def saltar_recto(v, d, perpendicular):
+        while True:
+            v += d
+            if bloqueado[v]:
+                return -1
+            if v == destino or especial[v] or forzado_recto(v, d, perpendicular):
+                return v
+
+    def saltar(v, di, dj):
+        """ Devuelve (punto de salto, pasos) en la dirección (di, dj), o (-1, 0)."""
+        vertical, horizontal = di * ancho, dj
+        if di == 0:
+            salto = saltar_recto(v, horizontal, ancho)
+            return salto, (salto - v) // horizontal if salto >= 0 else 0
+        if dj == 0:
+            salto = saltar_recto(v, vertical, 1)
+            return salto, (salto - v) // vertical if salto >= 0 else 0
+
+        d = vertical + horizontal
+        pasos = 0
+        while True:
+            v += d
+            pasos += 1
+            if bloqueado[v]:
+                return -1, 0
+            if v == destino or especial[v]:
+                return v, pasos
+            if ((bloqueado[v - vertical] and not bloqueado[v - vertical + horizontal]) or
+                    (bloqueado[v - horizontal] and not bloqueado[v - horizontal + vertical])):
+                return v, pasos
+            if saltar_recto(v, vertical, 1) >= 0 or saltar_recto(v, horizontal, ancho) >= 0:
+                return v, pasos
+
+    todas = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    expandidos = insertados = 0
+
+    g_coste[origen] = 0
+    padres[origen] = -1
+    visita[origen] = abierto
+    lista_abierta = [(sqrt((inicio[0] - fi)**2 + (inicio[1] - fj)**2), origen)]
+
+    while lista_abierta:
+        _, actual = heappop(lista_abierta)
+        if visita[actual] == cerrado:
+            continue
+        if actual == destino:
+            break
+
+        visita[actual] = cerrado
+        expandidos += 1
+        g_actual = g_coste[actual]
+        i, j = divmod(actual, ancho)
+
+        # Direcciones a explorar: todas en el origen y junto a celdas de coste distinto,
+        # las naturales y forzadas según la dirección de llegada en el resto
+        padre = padres[actual]
+        if padre < 0 or especial[actual]:
+            direcciones = todas
+        else:
+            pi, pj = divmod(padre, ancho)
+            di, dj = (i > pi) - (i < pi), (j > pj) - (j < pj)
+            if di == 0:
+                direcciones = [(0, dj)]
+                if bloqueado[actual - ancho]:
+                    direcciones.append((-1, dj))
+                if bloqueado[actual + ancho]:
+                    direcciones.append((1, dj))
+            elif dj == 0:
+                direcciones = [(di, 0)]
+                if bloqueado[actual - 1]:
+                    direcciones.append((di, -1))
+                if bloqueado[actual + 1]:
+                    direcciones.append((di, 1))
+            else:
+                direcciones = [(di, 0), (0, dj), (di, dj)]
+                if bloqueado[actual - di * ancho]:
+                    direcciones.append((-di, dj))
+                if bloqueado[actual - dj]:
+                    direcciones.append((di, -dj))
+
+        for di, dj in direcciones:
+            salto, pasos = saltar(actual, di, dj)
+            if salto < 0 or visita[salto] == cerrado:
+                continue
+
+            # Las celdas intermedias del salto cuestan 1; la última, su propio peso
+            paso = RAIZ_2 if di and dj else 1.0
+            g_nuevo = g_actual
+            for _ in range(pasos - 1):
+                g_nuevo += paso
+            g_nuevo += paso * peso(salto)
+
+            if visita[salto] != abierto or g_nuevo < g_coste[salto]:
+                g_coste[salto] = g_nuevo
+                padres[salto] = actual
+                visita[salto] = abierto
+                si, sj = divmod(salto, ancho)
+                heappush(lista_abierta, (g_nuevo + sqrt((si - 1 - fi)**2 + (sj - 1 - fj)**2), salto))
+                insertados += 1
+    else:
+        actual = -1
+
+    if estadisticas is not None:
+        estadisticas['expandidos'] = expandidos
+        estadisticas['insertados'] = insertados
+    if actual != destino:
+        return None
+    return _desplegar(rejilla, padres, destino)
+
+
+def _desplegar(rejilla, padres, nodo):
+    """ Reconstruye el camino celda a celda entre puntos de salto consecutivos."""
+    saltos = []
+    while nodo != -1:
+        saltos.append(rejilla.celda(nodo))
+        nodo = padres[nodo]
+    saltos.reverse()
+
+    camino = [saltos[0]]
+    for (ai, aj), (bi, bj) in zip(saltos, saltos[1:]):
+        di, dj = (bi > ai) - (bi < ai), (bj > aj) - (bj < aj)
+        for k in range(1, max(abs(bi - ai), abs(bj - aj)) + 1):
+            camino.append((ai + k * di, aj + k * dj))
+    return camino
@@ -0,0 +1,38 @@
+import heapq
+
+
+class ListaAbierta:
+    """ Lista abierta de A*: montículo binario con borrado perezoso.
+
+    Cada mejora de g inserta una entrada nueva (f, h, nodo) en lugar de modificar la
+    antigua; las entradas de nodos ya cerrados se descartan al extraerlas, así que ningún
+    nodo se expande dos veces. A igual f sale antes el nodo con menor h (el más cercano al
+    final) y, después, la menor celda.
+    """
+
+    def __init__(self):
+        self.monticulo = []
+        self.insertados = 0
+        self.extraidos = 0
+        self.descartados = 0  # Entradas obsoletas: antes cada una era una reexpansión
+
+    def __len__(self):
+        return len(self.monticulo)
+
+    def insertar(self, nodo, f, h):
+        heapq.heappush(self.monticulo, (f, h, nodo))
+        self.insertados += 1
+
+    def extraer(self, lista_cerrada):
+        """ Devuelve el nodo abierto de menor f o None si solo quedaban entradas obsoletas."""
+        while self.monticulo:
+            _, _, nodo = heapq.heappop(self.monticulo)
+            if nodo in lista_cerrada:
+                self.descartados += 1
+                continue
+            self.extraidos += 1
+            return nodo
+        return None
+
+    def contadores(self):
+        return {'insertados': self.insertados, 'extraidos': self.extraidos, 'descartados': self.descartados}
@@ -0,0 +1,286 @@
+import hashlib
+import math
+
+import numpy as np
+
+from bidireccional import buscar_bidireccional
+from jps import RejillaJPS, buscar_jps
+from ponderado import buscar_anytime, buscar_ponderado
+from rejilla import EspacioBusqueda, buscar, dijkstra, pico_memoria
+
+# Códigos de celda: coinciden con los valores de leer_matriz_fichero salvo 'P' (0.5), que no es entero
+OBSTACULO = -1
+LIBRE = 0
+PELIGRO = 7
+
+CODIGOS = {
+    'O': LIBRE,      # Camino libre
+    'X': OBSTACULO,  # Obstáculo
+    'P': PELIGRO,    # Celda peligrosa
+    '1': 1,  # Punto 1
+    '2': 2,  # Punto 2
+    '3': 3,  # Punto 3
+    '4': 4,  # Punto 4
+    '5': 5,  # Punto 5
+    '6': 6,  # Punto 6
+}
+
+# Multiplicador del paso al entrar en cada celda, igual que el riesgo de astar en aestrella3.py
+COSTES = {LIBRE: 1, PELIGRO: 0.5, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6}
+
+
+class Mapa:
+    """ Mapa compilado una sola vez: celdas, obstáculos, coste por celda y puntos de paso."""
+
+    def __init__(self, codigos, puntos, costes=None, fichero=None, validar=True):
+        self.codigos = np.ascontiguousarray(codigos, dtype=np.int8)
+        self.filas, self.columnas = self.codigos.shape
+        self.puntos = dict(puntos)
+        self.costes = dict(COSTES if costes is None else costes)
+        # Fichero binario proyectado en memoria del que salen los códigos, si lo hay
+        self.fichero = fichero
+        # Cambia con cada modificar_celda, para quien guarde resultados calculados sobre el mapa
+        self.version = 0
+        self.compilar(validar)
+
+    @classmethod
+    def desde_matriz(cls, matriz, puntos, costes=None):
+        valores = np.asarray(matriz, dtype=float)
+        codigos = np.where(valores == 0.5, PELIGRO, valores).astype(np.int8)
+        return cls(codigos, puntos, costes)
+
+    @classmethod
+    def desde_fichero(cls, nombre_fichero, costes=None):
+        from binario import cargar_binario, es_binario
+        from cargador import cargar_codigos
+
+        if es_binario(nombre_fichero):
+            return cargar_binario(nombre_fichero, costes)
+        codigos, puntos = cargar_codigos(nombre_fichero)
+        return cls(codigos, puntos, costes)
+
+    def compilar(self, validar=True):
+        """ Prepara la tabla código -> riesgo y la vista plana de las celdas que lee el motor."""
+        # El obstáculo (-1) se lee en tabla[-1], la última posición
+        self.tabla = [-1.0] * 128
+        for codigo, coste in self.costes.items():
+            self.tabla[codigo] = float(coste)
+
+        self._conteo = None
+        self._huella = None
+        if validar:
+            for codigo in self.codigos_presentes():
+                if codigo != OBSTACULO and codigo not in self.costes:
+                    raise ValueError(f"El código de celda {codigo} no tiene coste en la tabla de costes")
+
+        # Las celdas no se copian: con un mapa proyectado en memoria todos los procesos comparten el fichero
+        self._celdas = memoryview(self.codigos.reshape(-1))
+        self._obstaculos = None
+        self._espacio = None
+        self._jps = None
+        self._espacios_bidireccional = None
+
+    def codigos_presentes(self):
+        """ Códigos de celda que aparecen en el mapa (el recuento se hace una vez)."""
+        if self._conteo is None:
+            self._conteo = np.bincount(self.codigos.ravel().view(np.uint8), minlength=256)
+        return set(np.flatnonzero(self._conteo).astype(np.uint8).view(np.int8).tolist())
+
+    def huella(self):
+        """ Resumen de las celdas del mapa: dos mapas con las mismas celdas tienen la misma huella."""
+        if self._huella is None:
+            resumen = hashlib.blake2b(digest_size=16)
+            resumen.update(np.array(self.codigos.shape, dtype=np.int64).tobytes())
+            resumen.update(memoryview(self.codigos.reshape(-1)).cast('B'))
+            self._huella = resumen.hexdigest()
+        return self._huella
+
+    @property
+    def simetrico(self):
+        """ Todas las celdas transitables cuestan lo mismo: el coste de un camino no depende del sentido."""
+        return len({self.costes[codigo] for codigo in self.codigos_presentes() if codigo != OBSTACULO}) <= 1
+
+    def modificar_celda(self, i, j, valor):
+        """ Cambia la celda (i, j) por un carácter del mapa ('O', 'X', 'P', '1'..'6') o un código.
+
+        Actualiza los puntos, el recuento de códigos y las estructuras ya calculadas sin
+        recorrer el mapa, e incrementa version. Un mapa proyectado de solo lectura pasa a
+        tener una copia propia de sus celdas.
+        """
+        if isinstance(valor, str):
+            if valor not in CODIGOS:
+                raise ValueError(f"Carácter de celda no reconocido: {valor}")
+            codigo = CODIGOS[valor]
+        else:
+            codigo = int(valor)
+        if codigo != OBSTACULO and codigo not in self.costes:
+            raise ValueError(f"El código de celda {codigo} no tiene coste en la tabla de costes")
+
+        anterior = int(self.codigos[i, j])
+        if anterior == codigo:
+            return
+        if not self.codigos.flags.writeable:
+            self.codigos = np.array(self.codigos)
+            self.fichero = None
+            self._celdas = memoryview(self.codigos.reshape(-1))
+        self.codigos[i, j] = codigo
+
+        if 1 <= anterior <= 6 and self.puntos.get(anterior) == (i, j):
+            del self.puntos[anterior]
+        if 1 <= codigo <= 6:
+            self.puntos[codigo] = (i, j)
+
+        if self._conteo is not None:
+            self._conteo[anterior & 0xFF] -= 1
+            self._conteo[codigo & 0xFF] += 1
+        if self._obstaculos is not None:
+            self._obstaculos[i, j] = codigo == OBSTACULO
+        if self._jps is not None:
+            self._jps.actualizar(self.codigos, self.tabla, i, j)
+        self._huella = None
+        self.version += 1
+
+    @property
+    def coste_minimo(self):
+        """ Menor multiplicador de coste entre las celdas transitables del mapa."""
+        costes = [self.costes[codigo] for codigo in self.codigos_presentes() if codigo != OBSTACULO]
+        return min(costes, default=1)
+
+    @property
+    def admite_jps(self):
+        """ JPS solo es exacta sin celdas más baratas que 1, como las 'P' de la tabla por defecto."""
+        return all(self.costes[codigo] >= 1 for codigo in self.codigos_presentes() if codigo != OBSTACULO)
+
+    @property
+    def obstaculos(self):
+        """ Mapa de bits de obstáculos (filas x columnas), calculado la primera vez que se pide."""
+        if self._obstaculos is None:
+            self._obstaculos = self.codigos == OBSTACULO
+        return self._obstaculos
+
+    @property
+    def riesgos(self):
+        """ Multiplicador de coste de cada celda (-1 en los obstáculos)."""
+        return np.asarray(self.tabla)[self.codigos]
+
+    def __getstate__(self):
+        # Un mapa proyectado viaja como la ruta del fichero; el resto, con sus códigos
+        if self.fichero is not None:
+            return {'fichero': self.fichero, 'puntos': self.puntos, 'costes': self.costes}
+        return {'codigos': self.codigos, 'puntos': self.puntos, 'costes': self.costes}
+
+    def __setstate__(self, estado):
+        if 'fichero' in estado:
+            from binario import proyectar_codigos
+
+            estado['codigos'] = proyectar_codigos(estado['fichero'])
+        self.__init__(estado['codigos'], estado['puntos'], estado['costes'],
+                      estado.get('fichero'), validar=False)
+
+    def astar(self, inicio, final, modo='auto', estadisticas=None, hitos=None, observador=None, memoria=False,
+              epsilon=None):
+        """ Camino de inicio a final sin recorrer el mapa en cada consulta.
+
+        modo='astar' da el mismo camino que astar(matriz, inicio, final). modo='jps' usa Jump
+        Point Search, con el mismo coste pero muchos menos nodos expandidos en zonas de coste
+        uniforme; solo es válido si el mapa no tiene celdas 'P'. modo='auto' elige JPS
+        cuando el mapa lo admite y A* en caso contrario. modo='bidireccional' busca desde los
+        dos extremos con una heurística admisible y siempre devuelve un camino de coste óptimo.
+        Con hitos (ver hitos.py) A* usa la heurística ALT, admisible también con celdas 'P';
+        tienen que ser de este mapa tal como está (ValueError si se modificó después).
+
+        observador sigue el crecimiento de la frontera (ver rejilla.buscar) y solo lo admite
+        A*; con modo='auto' fuerza modo='astar'. Con memoria=True se anota además en
+        estadisticas el pico de memoria de la búsqueda, medido con tracemalloc (lento).
+
+        Con epsilon se usa A* ponderado (ver ponderado.py): el coste es como mucho (1 + epsilon)
+        veces el óptimo, también con celdas 'P', y la cota conseguida se anota en
+        estadisticas['cota']. Solo con modo='auto' o 'astar', sin hitos ni observador.
+        """
+        if memoria:
+            if estadisticas is None:
+                raise ValueError("memoria=True necesita un diccionario en estadisticas")
+            with pico_memoria(estadisticas):
+                return self.astar(inicio, final, modo, estadisticas, hitos, observador, epsilon=epsilon)
+
+        if epsilon is not None:
+            if modo not in ('auto', 'astar') or hitos is not None or observador is not None:
+                raise ValueError("epsilon solo se usa con modo='astar', sin hitos ni observador")
+            return buscar_ponderado(self._celdas, self.tabla, self.filas, self.columnas, inicio, final,
+                                    epsilon, self.coste_minimo, estadisticas)
+
+        if observador is not None:
+            if modo not in ('auto', 'astar'):
+                raise ValueError("El observador solo se usa con modo='astar'")
+            modo = 'astar'
+
+        if hitos is not None:
+            from hitos import huella_mapa
+
+            if modo not in ('auto', 'astar'):
+                raise ValueError("Los hitos solo se usan con modo='astar'")
+            # Con hitos de otro mapa (o de este antes de modificarlo) la cota puede no ser admisible
+            if len(hitos.indices) and hitos.huella != huella_mapa(self):
+                raise ValueError("Los hitos no son de este mapa: se calcularon con otras celdas u otros costes")
+            if self._espacio is None:
+                self._espacio = EspacioBusqueda(self.filas * self.columnas)
+            heuristica = hitos.heuristica(final, self.columnas, self.coste_minimo)
+            return buscar(self._celdas, self.tabla, self.filas, self.columnas, inicio, final,
+                          self._espacio, estadisticas, heuristica, observador)
+
+        if modo == 'auto':
+            modo = 'jps' if self.admite_jps else 'astar'
+
+        if modo == 'jps':
+            if not self.admite_jps:
+                raise ValueError("JPS no es exacta en mapas con celdas de coste menor que 1")
+            if self._jps is None:
+                self._jps = RejillaJPS(self.codigos, self.tabla)
+            return buscar_jps(self._jps, self._celdas, self.tabla, inicio, final, estadisticas)
+
+        if modo == 'bidireccional':
+            if self._espacios_bidireccional is None:
+                n = self.filas * self.columnas
+                self._espacios_bidireccional = (EspacioBusqueda(n), EspacioBusqueda(n))
+            return buscar_bidireccional(self._celdas, self.tabla, self.filas, self.columnas, inicio, final,
+                                        self._espacios_bidireccional, self.coste_minimo, estadisticas)
+
+        if modo != 'astar':
+            raise ValueError(f"Modo de búsqueda desconocido: {modo}")
+        if self._espacio is None:
+            self._espacio = EspacioBusqueda(self.filas * self.columnas)
+        return buscar(self._celdas, self.tabla, self.filas, self.columnas, inicio, final,
+                      self._espacio, estadisticas, observador=observador)
+
+    def astar_anytime(self, inicio, final, plazo=None, epsilon=2.0, reduccion=0.5):
+        """ Generador de (camino, coste, cota) cada vez mejores hasta el óptimo o hasta plazo segundos (ARA*).
+
+        cota acota el coste frente al óptimo: coste <= cota * óptimo. Ver ponderado.buscar_anytime.
+        """
+        return buscar_anytime(self._celdas, self.tabla, self.filas, self.columnas, inicio, final,
+                              self.coste_minimo, plazo, epsilon, reduccion)
+
+    def distancias(self, origen, inverso=False, objetivos=None):
+        """ Coste mínimo desde la celda origen a todas las demás (hasta ella si inverso), como array filas x columnas.
+
+        Con objetivos (lista de celdas) la búsqueda para al cerrarlos todos y solo sus
+        distancias son definitivas.
+        """
+        if objetivos is not None:
+            objetivos = [i * self.columnas + j for i, j in objetivos]
+        d = dijkstra(self._celdas, self.tabla, self.filas, self.columnas,
+                     origen[0] * self.columnas + origen[1], inverso, objetivos)
+        return np.frombuffer(d, dtype=np.float64).reshape(self.filas, self.columnas)
+
+    def campo(self, objetivo):
+        """ Campo de costes hasta objetivo desde todas las celdas (ver campo.py); cada agente saca de él su camino."""
+        from campo import CampoFlujo
+
+        return CampoFlujo(self.codigos, self.tabla, objetivo)
+
+    def coste(self, camino):
+        """ Coste de un camino con el mismo modelo que astar: distancia del paso por el riesgo de la celda."""
+        total = 0
+        for (ai, aj), (bi, bj) in zip(camino, camino[1:]):
+            total += math.sqrt((bi - ai)**2 + (bj - aj)**2) * self.tabla[self.codigos[bi, bj]]
+        return total
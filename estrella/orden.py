@@ -0,0 +1,153 @@
+import numpy as np
+
+# Hasta este número de puntos a ordenar se usa la programación dinámica exacta (Held-Karp)
+LIMITE_EXACTO = 12
+
+
+def matriz_costes(mapa, puntos):
+    """ Coste óptimo de cada tramo puntos[a] → puntos[b] (infinito si no hay camino).
+
+    Se lanza un solo Dijkstra por punto, que para en cuanto ha cerrado todos los demás,
+    en lugar de una búsqueda por cada par.
+    """
+    n = len(puntos)
+    costes = np.zeros((n, n))
+    for a, origen in enumerate(puntos):
+        distancias = mapa.distancias(origen, objetivos=puntos)
+        costes[a] = [distancias[i, j] for i, j in puntos]
+        costes[a, a] = 0
+    return costes
+
+
+def coste_orden(costes, orden):
+    return float(sum(costes[a, b] for a, b in zip(orden, orden[1:])))
+
+
+def ordenar_indices(costes, fijar_inicio=True, fijar_final=False, limite_exacto=LIMITE_EXACTO):
+    """ Orden de visita (índices de la matriz de costes) de menor coste total y su coste.
+
+    Con fijar_inicio el primer punto se visita el primero; con fijar_final el último se
+    visita el último. Los costes pueden ser asimétricos. Hasta limite_exacto puntos libres
+    el orden es óptimo; con más, vecino más próximo mejorado con 2-opt. Si algún tramo
+    necesario no tiene camino, el orden sigue teniendo todos los puntos y el coste es infinito.
+    """
+    n = len(costes)
+    inicio = 0 if fijar_inicio and n else None
+    final = n - 1 if fijar_final and n > 1 else None
+    libres = [k for k in range(n) if k != inicio and k != final]
+
+    if len(libres) <= limite_exacto:
+        centro = _held_karp(costes, libres, inicio, final)
+    else:
+        centro = _dos_opt(costes, _vecino_mas_proximo(costes, libres, inicio), inicio, final)
+
+    orden = ([inicio] if inicio is not None else []) + centro + ([final] if final is not None else [])
+    return orden, coste_orden(costes, orden)
+
+
+def ordenar_puntos(mapa, puntos, fijar_inicio=True, fijar_final=False, limite_exacto=LIMITE_EXACTO):
+    """ Reordena los puntos de paso para recorrerlos con el menor coste total.
+
+    puntos es una lista de celdas o un diccionario {número: celda} como el de
+    leer_matriz_fichero. Devuelve (puntos ordenados, coste total); el resultado se puede
+    pasar tal cual a planificar_ruta.
+    """
+    if isinstance(puntos, dict):
+        puntos = [celda for _, celda in sorted(puntos.items())]
+    puntos = [tuple(celda) for celda in puntos]
+    orden, coste = ordenar_indices(matriz_costes(mapa, puntos), fijar_inicio, fijar_final, limite_exacto)
+    return [puntos[k] for k in orden], coste
+
+
+def _held_karp(costes, libres, inicio, final):
+    """ Programación dinámica sobre subconjuntos: mejor[S][v] es el menor coste de visitar S acabando en v."""
+    n = len(libres)
+    if n == 0:
+        return []
+    sub = costes[np.ix_(libres, libres)]
+    entrada = costes[inicio, libres] if inicio is not None else np.zeros(n)
+    salida = costes[libres, final] if final is not None else np.zeros(n)
+
+    mejor = np.full((1 << n, n), np.inf)
+    previo = np.full((1 << n, n), -1, dtype=np.int64)
+    for v in range(n):
+        mejor[1 << v, v] = entrada[v]
+
+    for conjunto in range(1, 1 << n):
+        for v in range(n):
+            bit = 1 << v
+            if not conjunto & bit or conjunto == bit:
+                continue
+            # Llegar a v desde el mejor último punto u del resto del conjunto
+            candidatos = mejor[conjunto ^ bit] + sub[:, v]
+            u = int(np.argmin(candidatos))
+            if candidatos[u] < np.inf:  # Si v no se alcanza desde el resto, no tiene predecesor
+                mejor[conjunto, v] = candidatos[u]
+                previo[conjunto, v] = u
+
+    completo = (1 << n) - 1
+    totales = mejor[completo] + salida
+    v = int(np.argmin(totales))
+    if totales[v] == np.inf:
+        # Algún punto no se alcanza: cualquier orden cuesta infinito, se devuelven todos tal cual
+        return list(libres)
+    centro = []
+    conjunto = completo
+    while v != -1:
+        centro.append(libres[v])
+        conjunto, v = conjunto ^ (1 << v), int(previo[conjunto, v])
+    centro.reverse()
+    return centro
+
+
+def _vecino_mas_proximo(costes, libres, inicio):
+    """ Recorrido voraz: siempre al punto libre más barato desde el actual."""
+    restantes = set(libres)
+    actual = inicio if inicio is not None else min(restantes)
+    centro = []
+    if inicio is None:
+        restantes.discard(actual)
+        centro.append(actual)
+    while restantes:
+        actual = min(restantes, key=lambda k: (costes[actual, k], k))
+        restantes.discard(actual)
+        centro.append(actual)
+    return centro
+
+
+def _dos_opt(costes, centro, inicio, final):
+    """ Invierte tramos del recorrido mientras baje el coste total.
+
+    Con costes asimétricos invertir un tramo cambia también el sentido de sus aristas
+    internas; su coste en cada sentido sale de sumas acumuladas, así que evaluar cada
+    inversión es O(1).
+    """
+    orden = ([inicio] if inicio is not None else []) + centro + ([final] if final is not None else [])
+    primero = 1 if inicio is not None else 0
+    ultimo = len(orden) - (2 if final is not None else 1)
+
+    mejora = True
+    while mejora:
+        mejora = False
+        aristas = np.array(orden)
+        ida = np.concatenate([[0.0], np.cumsum(costes[aristas[:-1], aristas[1:]])])
+        vuelta = np.concatenate([[0.0], np.cumsum(costes[aristas[1:], aristas[:-1]])])
+        for a in range(primero, ultimo):
+            for b in range(a + 1, ultimo + 1):
+                # Invertir orden[a..b]
+                antes = ida[b] - ida[a]
+                despues = vuelta[b] - vuelta[a]
+                if a > 0:
+                    antes += costes[orden[a - 1], orden[a]]
+                    despues += costes[orden[a - 1], orden[b]]
+                if b < len(orden) - 1:
+                    antes += costes[orden[b], orden[b + 1]]
+                    despues += costes[orden[a], orden[b + 1]]
+                if despues < antes - 1e-12:
+                    orden[a:b + 1] = orden[a:b + 1][::-1]
+                    mejora = True
+                    break
+            if mejora:
+                break
+
+    return orden[primero:ultimo + 1]
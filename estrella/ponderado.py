@@ -0,0 +1,220 @@
+import heapq
+import math
+import time
+from array import array
+
+from rejilla import INFINITO, reconstruir_camino, vecindad
+
+RAIZ_2 = math.sqrt(2)
+
+# Expansiones entre dos consultas del reloj cuando hay un plazo
+EXPANSIONES_POR_CONSULTA = 1024
+
+
+class BusquedaPonderada:
+    """ A* ponderado con cota de suboptimalidad que puede seguir mejorando su solución (ARA*).
+
+    La heurística es la distancia octil por coste_minimo (el menor multiplicador del mapa):
+    admisible y consistente también con celdas 'P'. Con ella, expandir por g + peso * h sin
+    reabrir nodos cerrados da un camino de coste como mucho peso veces el óptimo. Las
+    mejoras que llegan a nodos ya cerrados se guardan en inconsistentes y se reabren en la
+    siguiente llamada a mejorar(), que reutiliza todo lo ya calculado.
+    """
+
+    def __init__(self, celdas, tabla, filas, columnas, inicio, final, coste_minimo):
+        self.celdas, self.tabla = celdas, tabla
+        self.filas, self.columnas = filas, columnas
+        self.coste_minimo = coste_minimo
+        self.final = final
+        self.origen = inicio[0] * columnas + inicio[1]
+        self.destino = final[0] * columnas + final[1]
+
+        n = filas * columnas
+        self.g = array('d', [INFINITO]) * n
+        self.padres = array('i', [-1]) * n
+        self.cerrado = array('I', bytes(4 * n))  # Número de la iteración en la que se cerró
+        self.iteracion = 0
+        self.inconsistentes = set()
+        self.peso = None
+        self.expandidos = self.insertados = 0
+
+        self.g[self.origen] = 0
+        self._lista_abierta = []
+        if tabla[celdas[self.origen]] >= 0:
+            h = self._h(self.origen)
+            self._lista_abierta.append((h, h, self.origen, 0.0))
+
+    def _h(self, indice):
+        i, j = divmod(indice, self.columnas)
+        di, dj = abs(i - self.final[0]), abs(j - self.final[1])
+        return self.coste_minimo * (max(di, dj) + (RAIZ_2 - 1) * min(di, dj))
+
+    def mejorar(self, peso, plazo=None):
+        """ Expande por g + peso * h hasta que nada en la lista abierta pueda mejorar el camino.
+
+        peso no puede ser mayor que el de la llamada anterior. plazo es un instante de
+        time.perf_counter(); si llega antes, se devuelve False y el camino anterior sigue
+        siendo el válido.
+        """
+        if self.peso is not None and peso > self.peso:
+            raise ValueError("El peso solo puede bajar entre mejoras")
+        celdas, tabla, g, padres, cerrado = self.celdas, self.tabla, self.g, self.padres, self.cerrado
+        filas, columnas = self.filas, self.columnas
+        fi, fj = self.final
+        minimo = self.coste_minimo
+        destino = self.destino
+        heappush, heappop = heapq.heappush, heapq.heappop
+        movimientos = vecindad(columnas)
+
+        # Nueva iteración: la lista abierta y los inconsistentes se reordenan con el nuevo peso
+        self.iteracion += 1
+        iteracion = self.iteracion
+        self.peso = peso
+        lista_abierta = [(g[k] + peso * h, h, k, g[k]) for _, h, k, g_entrada in self._lista_abierta
+                         if g_entrada == g[k]]
+        lista_abierta += [(g[k] + peso * self._h(k), self._h(k), k, g[k]) for k in self.inconsistentes]
+        heapq.heapify(lista_abierta)
+        self._lista_abierta = lista_abierta
+        self.inconsistentes = set()
+        inconsistentes = self.inconsistentes
+
+        expandidos = insertados = 0
+        while lista_abierta:
+            f, _, actual, g_entrada = lista_abierta[0]
+            if g_entrada != g[actual] or cerrado[actual] == iteracion:
+                heappop(lista_abierta)  # Entrada obsoleta
+                continue
+            if f >= g[destino]:
+                break
+            if plazo is not None and expandidos % EXPANSIONES_POR_CONSULTA == 0 and time.perf_counter() > plazo:
+                self.expandidos += expandidos
+                self.insertados += insertados
+                return False
+
+            heappop(lista_abierta)
+            cerrado[actual] = iteracion
+            expandidos += 1
+            i, j = divmod(actual, columnas)
+            g_actual = g[actual]
+
+            for di, dj, desplazamiento, paso in movimientos:
+                vi, vj = i + di, j + dj
+                if 0 <= vi < filas and 0 <= vj < columnas:
+                    vecino = actual + desplazamiento
+                    riesgo = tabla[celdas[vecino]]
+                    if riesgo < 0:
+                        continue
+                    g_nuevo = g_actual + paso * riesgo
+                    if g_nuevo < g[vecino]:
+                        g[vecino] = g_nuevo
+                        padres[vecino] = actual
+                        if cerrado[vecino] == iteracion:
+                            inconsistentes.add(vecino)
+                        else:
+                            dvi, dvj = abs(vi - fi), abs(vj - fj)
+                            h = minimo * (max(dvi, dvj) + (RAIZ_2 - 1) * min(dvi, dvj))
+                            heappush(lista_abierta, (g_nuevo + peso * h, h, vecino, g_nuevo))
+                            insertados += 1
+
+        self.expandidos += expandidos
+        self.insertados += insertados
+        return True
+
+    def cota(self, coste=None):
+        """ Cota del coste del camino actual (o de otro de coste menor) respecto al óptimo.
+
+        Es el menor entre el peso y el coste dividido por la menor g + h de los nodos
+        abiertos o inconsistentes, que es una cota inferior del coste óptimo. Infinito si
+        aún no hay camino.
+        """
+        if coste is None:
+            coste = self.coste()
+        if coste == INFINITO:
+            return INFINITO
+        g = self.g
+        frontera = [k for _, _, k, g_entrada in self._lista_abierta
+                    if g_entrada == g[k] and self.cerrado[k] != self.iteracion]
+        inferior = min((g[k] + self._h(k) for k in frontera + list(self.inconsistentes)), default=coste)
+        if inferior >= coste:
+            return 1.0
+        return min(self.peso, coste / inferior)
+
+    def coste(self):
+        """ Coste del camino que siguen los padres hasta final.
+
+        Puede ser menor que g(final): los padres se actualizan cuando mejora un nodo ya
+        cerrado, aunque sus descendientes no se hayan vuelto a expandir.
+        """
+        if self.g[self.destino] == INFINITO:
+            return INFINITO
+        columnas, padres, tabla, celdas = self.columnas, self.padres, self.tabla, self.celdas
+        total, nodo = 0.0, self.destino
+        while nodo != self.origen:
+            padre = padres[nodo]
+            diagonal = nodo // columnas != padre // columnas and nodo % columnas != padre % columnas
+            total += (RAIZ_2 if diagonal else 1.0) * tabla[celdas[nodo]]
+            nodo = padre
+        return total
+
+    def camino(self):
+        if self.g[self.destino] == INFINITO:
+            return None
+        return reconstruir_camino(self.padres, self.columnas, self.destino)
+
+
+def buscar_ponderado(celdas, tabla, filas, columnas, inicio, final, epsilon, coste_minimo, estadisticas=None):
+    """ A* ponderado: camino de coste como mucho (1 + epsilon) veces el óptimo, o None.
+
+    En estadisticas se anotan los nodos expandidos, las inserciones, el coste y la cota
+    garantizada, que puede ser menor que 1 + epsilon.
+    """
+    if epsilon < 0:
+        raise ValueError("epsilon no puede ser negativo")
+    busqueda = BusquedaPonderada(celdas, tabla, filas, columnas, inicio, final, coste_minimo)
+    busqueda.mejorar(1 + epsilon)
+    if estadisticas is not None:
+        estadisticas['expandidos'] = busqueda.expandidos
+        estadisticas['insertados'] = busqueda.insertados
+        estadisticas['coste'] = busqueda.coste()
+        estadisticas['cota'] = busqueda.cota()
+    return busqueda.camino()
+
+
+def buscar_anytime(celdas, tabla, filas, columnas, inicio, final, coste_minimo, plazo=None, epsilon=2.0,
+                   reduccion=0.5):
+    """ ARA*: generador de (camino, coste, cota) cada vez más baratos hasta el óptimo o hasta el plazo.
+
+    La primera solución sale de A* ponderado con 1 + epsilon; después epsilon se multiplica
+    por reduccion (y nunca queda por encima de la cota ya conseguida) y se mejora el camino
+    reutilizando la búsqueda anterior. plazo, en segundos desde que se pide la primera
+    solución, corta la mejora en curso: la última solución entregada es la válida. La
+    primera solución se calcula siempre entera, aunque pase el plazo.
+    """
+    if epsilon < 0 or not 0 <= reduccion < 1:
+        raise ValueError("Hace falta epsilon >= 0 y 0 <= reduccion < 1")
+    limite = None if plazo is None else time.perf_counter() + plazo
+    busqueda = BusquedaPonderada(celdas, tabla, filas, columnas, inicio, final, coste_minimo)
+    busqueda.mejorar(1 + epsilon)
+    if busqueda.coste() == INFINITO:
+        return
+    camino, coste = busqueda.camino(), busqueda.coste()
+    cota = busqueda.cota(coste)
+    yield camino, coste, cota
+
+    while cota > 1 and epsilon > 0:
+        # Por debajo de una milésima se termina con la búsqueda exacta
+        epsilon = min(epsilon * reduccion, cota - 1)
+        if epsilon < 1e-3:
+            epsilon = 0.0
+        if not busqueda.mejorar(1 + epsilon, limite):
+            return
+        # El camino de los padres puede salir más caro que el anterior: se conserva el mejor
+        # y se entrega si ha mejorado él o, al menos, su cota
+        nuevo = busqueda.coste()
+        mejora = nuevo < coste
+        if mejora:
+            camino, coste = busqueda.camino(), nuevo
+        nueva_cota = busqueda.cota(coste)
+        if mejora or nueva_cota < cota:
+            cota = nueva_cota
+            yield camino, coste, cota
@@ -0,0 +1,247 @@
+import heapq
+import math
+import tracemalloc
+from array import array
+from contextlib import contextmanager
+from time import perf_counter
+
+INFINITO = float('inf')
+
+# Direcciones de movimiento: vertical, horizontal y diagonal (mismo orden que astar)
+DIRECCIONES = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+def aplanar_matriz(matriz):
+    """ Convierte la matriz de listas en celdas planas (códigos int8) y una tabla código -> riesgo.
+
+    Las celdas se indexan por fila*columnas+columna. Cada valor distinto de la matriz
+    recibe un código; el obstáculo (-1) conserva el código -1, que se lee en tabla[-1].
+    """
+    filas, columnas = len(matriz), len(matriz[0])
+
+    # Mismo criterio que astar: -1 es obstáculo, 0 cuesta 1 y el resto multiplica el paso
+    codigos = {-1: -1}
+    tabla = [-1.0] * 128
+    for valor in sorted({valor for fila in matriz for valor in fila} - {-1}):
+        codigos[valor] = len(codigos) - 1
+        tabla[codigos[valor]] = 1.0 if valor == 0 else float(valor)
+
+    celdas = array('b', [codigos[valor] for fila in matriz for valor in fila])
+    return celdas, tabla, filas, columnas
+
+
+def vecindad(columnas):
+    """ Desplazamientos de las 8 direcciones: (di, dj, desplazamiento plano, distancia del paso)."""
+    return [(di, dj, di * columnas + dj, math.sqrt(di**2 + dj**2)) for di, dj in DIRECCIONES]
+
+
+class EspacioBusqueda:
+    """ Buffers de trabajo reutilizables entre búsquedas sobre rejillas del mismo tamaño.
+
+    Cada búsqueda usa un sello nuevo: una celda solo tiene g_coste y padre válidos si su
+    visita coincide con el sello (abierta) o con sello + 1 (cerrada), así que no hace falta
+    reinicializar los buffers entre consultas.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.g_coste = array('d', bytes(8 * n))
+        self.padres = array('i', bytes(4 * n))
+        self.visita = array('I', bytes(4 * n))
+        self.sello = 0
+
+    def nuevo_sello(self):
+        self.sello += 2
+        if self.sello >= 2**32 - 2:
+            # Desbordamiento del contador: se limpian las visitas y se empieza de nuevo
+            self.visita = array('I', bytes(4 * self.n))
+            self.sello = 2
+        return self.sello
+
+
+def buscar(celdas, tabla, filas, columnas, inicio, final, espacio=None, estadisticas=None, heuristica=None,
+           observador=None):
+    """ A* sobre buffers planos: celdas, g_coste, padres y cerrados se indexan por fila*columnas+columna.
+
+    La lista abierta sigue la política de ListaAbierta: entradas (f, h, celda) y descarte
+    de las entradas obsoletas al extraerlas. Si se pasa un diccionario en estadisticas se
+    rellenan los nodos expandidos, las inserciones, las extracciones y las descartadas, el
+    tamaño máximo de la lista abierta, las reexpansiones (mejoras que llegan a celdas ya
+    cerradas y que la lista cerrada ignora) y el tiempo de cada fase en segundos.
+    heuristica, si se da, sustituye a la distancia euclídea: recibe la celda plana y
+    devuelve la estimación del coste hasta final. observador, si se da, se llama tras cada
+    expansión con (celda plana, g, tamaño de la lista abierta).
+    """
+    # Sin estadisticas ni observador el bucle solo paga un par de comprobaciones de booleanos
+    medir = estadisticas is not None
+    if medir:
+        t_inicio = perf_counter()
+    if espacio is None:
+        espacio = EspacioBusqueda(filas * columnas)
+    g_coste, padres, visita = espacio.g_coste, espacio.padres, espacio.visita
+    abierto = espacio.nuevo_sello()
+    cerrado = abierto + 1
+
+    fi, fj = final
+    origen = inicio[0] * columnas + inicio[1]
+    destino = fi * columnas + fj
+    sqrt = math.sqrt
+    heappush, heappop = heapq.heappush, heapq.heappop
+    movimientos = vecindad(columnas)
+
+    # Tras f y h, el índice plano conserva el desempate de astar, que compara las tuplas (i, j)
+    g_coste[origen] = 0
+    padres[origen] = -1
+    visita[origen] = abierto
+    if heuristica is None:
+        h_inicial = sqrt((inicio[0] - fi)**2 + (inicio[1] - fj)**2)
+    else:
+        h_inicial = heuristica(origen)
+    lista_abierta = [(h_inicial, h_inicial, origen)]
+    expandidos = descartados = reexpansiones = 0
+    insertados = maximo_abierta = 1
+    if medir:
+        t_busqueda = perf_counter()
+
+    while lista_abierta:
+        if medir and len(lista_abierta) > maximo_abierta:
+            maximo_abierta = len(lista_abierta)
+        _, _, actual = heappop(lista_abierta)
+        if visita[actual] == cerrado:
+            descartados += 1
+            continue
+
+        if actual == destino:
+            break
+
+        visita[actual] = cerrado
+        expandidos += 1
+        i, j = divmod(actual, columnas)
+        g_actual = g_coste[actual]
+
+        for di, dj, desplazamiento, paso in movimientos:
+            vi, vj = i + di, j + dj
+            if 0 <= vi < filas and 0 <= vj < columnas:
+                vecino = actual + desplazamiento
+                riesgo = tabla[celdas[vecino]]
+                if riesgo < 0:
+                    continue
+                estado = visita[vecino]
+                if estado == cerrado:
+                    # Con una heurística inconsistente (celdas 'P') un nodo cerrado puede mejorar
+                    if medir and g_actual + paso * riesgo < g_coste[vecino]:
+                        reexpansiones += 1
+                    continue
+
+                g_nuevo = g_actual + paso * riesgo
+                if estado != abierto or g_nuevo < g_coste[vecino]:
+                    g_coste[vecino] = g_nuevo
+                    padres[vecino] = actual
+                    visita[vecino] = abierto
+                    h = sqrt((vi - fi)**2 + (vj - fj)**2) if heuristica is None else heuristica(vecino)
+                    heappush(lista_abierta, (g_nuevo + h, h, vecino))
+                    insertados += 1
+
+        if observador is not None:
+            observador(actual, g_actual, len(lista_abierta))
+    else:
+        actual = -1
+
+    if medir:
+        t_reconstruccion = perf_counter()
+    camino = None if actual != destino else reconstruir_camino(padres, columnas, actual, estadisticas)
+    if medir:
+        estadisticas['expandidos'] = expandidos
+        estadisticas['insertados'] = insertados
+        estadisticas['extraidos'] = expandidos + (actual == destino)
+        estadisticas['descartados'] = descartados
+        estadisticas['maximo_abierta'] = maximo_abierta
+        estadisticas['reexpansiones'] = reexpansiones
+        estadisticas['t_preparacion'] = t_busqueda - t_inicio
+        estadisticas['t_busqueda'] = t_reconstruccion - t_busqueda
+        if camino is None:
+            estadisticas['t_reconstruccion'] = 0.0
+            estadisticas['longitud'] = 0
+    return camino
+
+
+def reconstruir_camino(padres, columnas, nodo, estadisticas=None):
+    """ Camino hasta nodo siguiendo padres; con estadisticas anota su tiempo y su longitud."""
+    if estadisticas is not None:
+        t_inicio = perf_counter()
+    camino = []
+    while nodo != -1:
+        camino.append(divmod(nodo, columnas))
+        nodo = padres[nodo]
+    camino.reverse()
+    if estadisticas is not None:
+        estadisticas['t_reconstruccion'] = perf_counter() - t_inicio
+        estadisticas['longitud'] = len(camino)
+    return camino
+
+
+@contextmanager
+def pico_memoria(estadisticas):
+    """ Anota en estadisticas['pico_memoria'] los bytes de más que ha llegado a reservar el bloque (con tracemalloc)."""
+    activo = tracemalloc.is_tracing()
+    if not activo:
+        tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    try:
+        yield estadisticas
+    finally:
+        estadisticas['pico_memoria'] = tracemalloc.get_traced_memory()[1] - base
+        if not activo:
+            tracemalloc.stop()
+
+
+def astar_rejilla(matriz, inicio, final):
+    """ Misma interfaz y mismos caminos que astar(matriz, inicio, final), con estado en buffers planos."""
+    celdas, tabla, filas, columnas = aplanar_matriz(matriz)
+    return buscar(celdas, tabla, filas, columnas, inicio, final)
+
+
+def dijkstra(celdas, tabla, filas, columnas, origen, inverso=False, objetivos=None):
+    """ Coste mínimo desde la celda plana origen a todas las demás (infinito si no se alcanzan).
+
+    Con inverso=True calcula el coste de cada celda hasta origen, recorriendo las aristas al
+    revés: llegar a una celda desde su vecina cuesta el riesgo de la celda de destino. Con
+    objetivos (celdas planas) se para en cuanto todas están cerradas; solo sus distancias
+    son entonces definitivas.
+    """
+    n = filas * columnas
+    distancia = array('d', [INFINITO]) * n
+    cerrado = bytearray(n)
+    heappush, heappop = heapq.heappush, heapq.heappop
+    movimientos = vecindad(columnas)
+
+    pendientes = None if objetivos is None else set(objetivos)
+    distancia[origen] = 0
+    lista_abierta = [(0.0, origen)]
+    while lista_abierta:
+        d, actual = heappop(lista_abierta)
+        if cerrado[actual]:
+            continue
+        cerrado[actual] = 1
+        if pendientes is not None:
+            pendientes.discard(actual)
+            if not pendientes:
+                break
+        i, j = divmod(actual, columnas)
+        riesgo_actual = tabla[celdas[actual]]
+
+        for di, dj, desplazamiento, paso in movimientos:
+            vi, vj = i + di, j + dj
+            if 0 <= vi < filas and 0 <= vj < columnas:
+                vecino = actual + desplazamiento
+                riesgo = tabla[celdas[vecino]]
+                if cerrado[vecino] or riesgo < 0:
+                    continue
+
+                d_nueva = d + paso * (riesgo_actual if inverso else riesgo)
+                if d_nueva < distancia[vecino]:
+                    distancia[vecino] = d_nueva
+                    heappush(lista_abierta, (d_nueva, vecino))
+
+    return distancia
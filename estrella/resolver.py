@@ -0,0 +1,110 @@
+# Resuelve la ruta entre los puntos de un mapa desde la línea de comandos, sin pantalla:
+#
+#     python resolver.py matriz3.txt
+#     python resolver.py matriz3.txt --puntos 1 4 6 --formato json
+#     python resolver.py mapa.bin --celdas 0,0 99,99 --formato png --salida ruta.png
+#
+# Las imágenes PNG se escriben sin matplotlib (ver dibujo.py); solo --mostrar lo importa.
+import argparse
+import json
+import sys
+
+FORMATOS = ('texto', 'json', 'csv', 'png')
+
+
+def leer_celda(texto):
+    try:
+        i, j = (int(valor) for valor in texto.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Celda no válida: {texto} (se espera fila,columna)")
+    return i, j
+
+
+def argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Camino de menor coste entre los puntos de un mapa.")
+    parser.add_argument("mapa", help="fichero de texto como matriz.txt o binario de binario.py")
+    puntos = parser.add_mutually_exclusive_group()
+    puntos.add_argument("--puntos", type=int, nargs="+", metavar="N",
+                        help="números de los puntos del mapa a recorrer (por defecto, todos en orden)")
+    puntos.add_argument("--celdas", type=leer_celda, nargs="+", metavar="I,J", help="celdas a recorrer")
+    parser.add_argument("--ordenar", action="store_true",
+                        help="recorrer los puntos en el orden más barato, empezando por el primero")
+    parser.add_argument("--modo", default="auto", choices=("auto", "astar", "jps", "bidireccional"))
+    parser.add_argument("--formato", default="texto", choices=FORMATOS)
+    parser.add_argument("--salida", help="fichero de salida (por defecto, la salida estándar; ruta.png para png)")
+    parser.add_argument("--escala", type=int, default=1, help="en png, celdas por píxel en cada dirección")
+    parser.add_argument("--mostrar", action="store_true", help="abrir una ventana con el mapa y el camino")
+    return parser.parse_args(argv)
+
+
+def elegir_puntos(mapa, args):
+    if args.celdas:
+        return args.celdas
+    numeros = args.puntos or sorted(mapa.puntos)
+    desconocidos = [n for n in numeros if n not in mapa.puntos]
+    if desconocidos:
+        raise SystemExit(f"El mapa no tiene los puntos {desconocidos}; tiene {sorted(mapa.puntos)}")
+    return [mapa.puntos[n] for n in numeros]
+
+
+def escribir(texto, salida):
+    if salida:
+        with open(salida, 'w') as fichero:
+            fichero.write(texto)
+    else:
+        sys.stdout.write(texto)
+
+
+def main(argv=None):
+    args = argumentos(argv)
+
+    from mapa import Mapa
+    from ruta import unir_tramos
+
+    mapa = Mapa.desde_fichero(args.mapa)
+    puntos = elegir_puntos(mapa, args)
+    if args.ordenar:
+        from orden import ordenar_puntos
+
+        puntos, _ = ordenar_puntos(mapa, puntos)
+
+    caminos = [mapa.astar(inicio, final, args.modo) for inicio, final in zip(puntos, puntos[1:])]
+    if len(puntos) == 1:
+        camino, sin_camino = list(puntos), []
+    else:
+        camino, sin_camino = unir_tramos(caminos)
+    coste = mapa.coste(camino) if camino else None
+
+    if args.formato == 'texto':
+        if camino:
+            escribir(''.join(f"{paso}\n" for paso in camino), args.salida)
+        for k in sin_camino:
+            print(f"No se encontró un camino de {puntos[k]} a {puntos[k + 1]}", file=sys.stderr)
+    elif args.formato == 'json':
+        escribir(json.dumps({'puntos': [list(p) for p in puntos],
+                             'camino': [list(p) for p in camino] if camino else None,
+                             'coste': coste, 'tramos_sin_camino': sin_camino}) + '\n', args.salida)
+    elif args.formato == 'csv':
+        escribir('fila,columna\n' + ''.join(f"{i},{j}\n" for i, j in camino or []), args.salida)
+    else:
+        from dibujo import guardar_png
+
+        guardar_png(args.salida or 'ruta.png', mapa.codigos, camino, escala=args.escala)
+
+    if args.mostrar:
+        import matplotlib.pyplot as plt
+
+        from dibujo import imagen
+
+        plt.figure(figsize=(5, 5))
+        plt.imshow(imagen(mapa.codigos, camino))
+        plt.xticks([])
+        plt.yticks([])
+        plt.title("Mapa con el camino encontrado")
+        plt.show()
+
+    return 0 if camino else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import AUSENTE
+
+# Mapa residente en cada proceso del pool; se envía una sola vez al arrancar el proceso
+_mapa_proceso = None
+
+
+def _iniciar_proceso(mapa):
+    global _mapa_proceso
+    _mapa_proceso = mapa
+
+
+def _resolver_tramos(tramos):
+    return [_mapa_proceso.astar(inicio, final) for inicio, final in tramos]
+
+
+def planificar_ruta(mapa, puntos, procesos=None, tamano_lote=None, cache=None):
+    """ Resuelve en paralelo los tramos entre puntos consecutivos y los une en orden.
+
+    puntos es una lista de celdas o un diccionario {número: celda} como el de
+    leer_matriz_fichero (se recorre en orden de número). Devuelve (camino_total,
+    tramos_sin_camino); los tramos sin camino son los índices k del tramo k → k+1 y
+    no detienen el resto de la ruta, pero dejan camino_total a None. Con una CacheRutas
+    (cache.py) solo se calculan los tramos que no estén ya en ella. Para visitar los
+    puntos en el orden más barato en vez de por número, pásalos antes por
+    orden.ordenar_puntos.
+    """
+    if isinstance(puntos, dict):
+        puntos = [celda for _, celda in sorted(puntos.items())]
+    tramos = list(zip(puntos, puntos[1:]))
+    if not tramos:
+        return list(puntos), []
+
+    if cache is None:
+        return unir_tramos(_resolver(mapa, tramos, procesos, tamano_lote))
+
+    caminos = [cache.buscar(mapa, inicio, final) for inicio, final in tramos]
+    pendientes = [k for k, camino in enumerate(caminos) if camino is AUSENTE]
+    # Un tramo repetido en la ruta se calcula una sola vez
+    unicos = list(dict.fromkeys(tramos[k] for k in pendientes))
+    resueltos = dict(zip(unicos, _resolver(mapa, unicos, procesos, tamano_lote)))
+    for tramo, camino in resueltos.items():
+        cache.guardar(mapa, tramo[0], tramo[1], camino)
+    for k in pendientes:
+        caminos[k] = resueltos[tramos[k]]
+    return unir_tramos(caminos)
+
+
+def _resolver(mapa, tramos, procesos, tamano_lote):
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tramos) <= 1:
+        return [mapa.astar(inicio, final) for inicio, final in tramos]
+
+    # Lotes de tramos para repartir el coste de comunicación entre procesos
+    tamano_lote = tamano_lote or max(1, len(tramos) // (procesos * 4))
+    lotes = [tramos[k:k + tamano_lote] for k in range(0, len(tramos), tamano_lote)]
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_proceso, initargs=(mapa,)) as pool:
+        return [camino for lote in pool.map(_resolver_tramos, lotes) for camino in lote]
+
+
+def unir_tramos(caminos):
+    """ Une los caminos de cada tramo sin duplicar los puntos intermedios."""
+    sin_camino = [k for k, camino in enumerate(caminos) if not camino]
+    if sin_camino:
+        return None, sin_camino
+
+    camino_total = []
+    for camino in caminos:
+        camino_total.extend(camino[:-1])  # Evitar duplicar el nodo final
+    camino_total.append(caminos[-1][-1])
+    return camino_total, []
@@ -0,0 +1,100 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import CacheRutas
+from mapa import Mapa
+
+# Mapas residentes en cada proceso del pool (nombre -> Mapa) y su caché de tramos
+_mapas_proceso = None
+_cache_proceso = None
+
+
+def _iniciar_proceso(mapas, capacidad_cache):
+    global _mapas_proceso, _cache_proceso
+    # Los nombres de fichero se cargan en el proceso; los Mapa proyectados llegan como su ruta
+    _mapas_proceso = {nombre: Mapa.desde_fichero(mapa) if isinstance(mapa, str) else mapa
+                      for nombre, mapa in mapas.items()}
+    _cache_proceso = CacheRutas(capacidad_cache) if capacidad_cache else None
+
+
+def _resolver_lote(lote):
+    resultados = []
+    for indice, nombre, inicio, final, modo in lote:
+        mapa = _mapas_proceso[nombre]
+        if _cache_proceso is not None:
+            camino = _cache_proceso.camino(mapa, inicio, final, modo)
+        else:
+            camino = mapa.astar(inicio, final, modo)
+        resultados.append((indice, camino))
+    return resultados
+
+
+class Servicio:
+    """ Pool de procesos con los mapas ya compilados para resolver muchas consultas.
+
+    mapas es un diccionario {nombre: Mapa o ruta de fichero}; cada proceso los carga una
+    sola vez al arrancar. Una consulta es (nombre, inicio, final) o (nombre, inicio, final,
+    modo), con los modos de Mapa.astar. Con cache > 0 cada proceso guarda sus últimos
+    tramos en una CacheRutas de esa capacidad.
+    """
+
+    def __init__(self, mapas, procesos=None, cache=0):
+        self.nombres = set(mapas)
+        self._pool = ProcessPoolExecutor(procesos or os.cpu_count() or 1, initializer=_iniciar_proceso,
+                                         initargs=(dict(mapas), cache))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excepcion):
+        # shutdown() espera a los lotes en curso: se hace en un hilo para no parar el bucle de eventos
+        await asyncio.get_running_loop().run_in_executor(None, self.cerrar)
+
+    def cerrar(self):
+        self._pool.shutdown()
+
+    def _lotes(self, consultas, tamano_lote):
+        lote = []
+        for indice, consulta in enumerate(consultas):
+            nombre, inicio, final, *modo = consulta
+            if nombre not in self.nombres:
+                raise KeyError(f"Mapa desconocido: {nombre}")
+            lote.append((indice, nombre, tuple(inicio), tuple(final), modo[0] if modo else 'auto'))
+            if len(lote) == tamano_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    async def resolver_muchos(self, consultas, tamano_lote=32):
+        """ Generador asíncrono de (índice de la consulta, camino o None) según van terminando.
+
+        Las búsquedas se hacen en el pool, fuera del bucle de eventos, en lotes de
+        tamano_lote consultas para repartir el coste de comunicación; el orden de llegada
+        no es el de las consultas.
+        """
+        lotes = list(self._lotes(consultas, tamano_lote))  # Valida todas antes de enviar ninguna
+        bucle = asyncio.get_running_loop()
+        pendientes = [bucle.run_in_executor(self._pool, _resolver_lote, lote) for lote in lotes]
+        for terminado in asyncio.as_completed(pendientes):
+            for resultado in await terminado:
+                yield resultado
+
+    solve_many = resolver_muchos
+
+    def resolver(self, consultas, tamano_lote=32):
+        """ Versión bloqueante: lista de caminos en el orden de las consultas."""
+        consultas = list(consultas)
+        caminos = [None] * len(consultas)
+        lotes = list(self._lotes(consultas, tamano_lote))
+        for resultados in self._pool.map(_resolver_lote, lotes):
+            for indice, camino in resultados:
+                caminos[indice] = camino
+        return caminos
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from hitos import Hitos
+from mapa import OBSTACULO, Mapa
+
+
+def mapa_con_muro():
+    codigos = np.zeros((20, 20), dtype=np.int8)
+    codigos[:19, 10] = OBSTACULO  # Muro con un solo hueco abajo
+    return Mapa(codigos, {})
+
+
+def test_hitos_del_mapa_dan_el_coste_optimo():
+    mapa = mapa_con_muro()
+    hitos = Hitos.calcular(mapa, 4)
+    camino = mapa.astar((0, 0), (0, 19), hitos=hitos)
+    assert mapa.coste(camino) == pytest.approx(mapa.coste(mapa.astar((0, 0), (0, 19), 'bidireccional')))
+
+
+def test_hitos_de_antes_de_modificar_el_mapa():
+    mapa = mapa_con_muro()
+    hitos = Hitos.calcular(mapa, 4)
+    mapa.modificar_celda(0, 10, 'O')  # Abre el muro arriba
+    with pytest.raises(ValueError):
+        mapa.astar((0, 0), (0, 19), hitos=hitos)
+    hitos = Hitos.calcular(mapa, 4)
+    assert mapa.coste(mapa.astar((0, 0), (0, 19), hitos=hitos)) == pytest.approx(19.0)
+
+
+def test_hitos_con_otros_costes():
+    mapa = mapa_con_muro()
+    hitos = Hitos.calcular(mapa, 4)
+    otro = Mapa(mapa.codigos, {}, costes={**mapa.costes, 0: 2})
+    with pytest.raises(ValueError):
+        otro.astar((0, 0), (0, 19), hitos=hitos)
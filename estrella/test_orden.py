@@ -0,0 +1,32 @@
+import math
+
+import numpy as np
+
+from mapa import OBSTACULO, Mapa
+from orden import ordenar_indices, ordenar_puntos
+
+
+def test_punto_aislado_en_la_matriz():
+    costes = np.array([[0, 1, math.inf], [1, 0, math.inf], [math.inf, math.inf, 0]])
+    for limite_exacto in (12, 0):  # Held-Karp y vecino más próximo con 2-opt
+        orden, coste = ordenar_indices(costes, limite_exacto=limite_exacto)
+        assert sorted(orden) == [0, 1, 2]
+        assert orden[0] == 0
+        assert coste == math.inf
+
+
+def test_punto_inalcanzable_en_el_mapa():
+    codigos = np.zeros((7, 7), dtype=np.int8)
+    codigos[3:6, 3:6] = OBSTACULO
+    codigos[4, 4] = 0  # (4,4) libre pero rodeada de obstáculos
+    puntos = [(0, 0), (4, 4), (0, 6)]
+    for limite_exacto in (12, 0):
+        orden, coste = ordenar_puntos(Mapa(codigos, {}), puntos, limite_exacto=limite_exacto)
+        assert sorted(orden) == sorted(puntos)
+        assert orden[0] == (0, 0)
+        assert coste == math.inf
+
+
+def test_orden_optimo_sin_inalcanzables():
+    costes = np.array([[0, 5, 1], [5, 0, 1], [1, 1, 0]], dtype=float)
+    assert ordenar_indices(costes) == ([0, 2, 1], 2.0)